@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Portfolio Website server
+Usage: python bench.py transfer [--requests N] [--path /images/mamtau.png]
+       python bench.py load [--modes stdlib asyncio prefork] [--concurrency 32] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import math
+import os
+import platform
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT = Path(__file__).resolve().parent
+SERVER_SCRIPT = ROOT / 'server.py'
+
+# Server command lines for each serving mode the load test can drive
+LOAD_MODES = {
+    'stdlib': ['--engine', 'stdlib'],
+    'asyncio': ['--engine', 'asyncio'],
+    'prefork': ['--workers', '2'],
+}
+PAGE_ASSETS = ['/', '/script.js', '/styles.css', '/portfolio-config.js']
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg'}
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def children_cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def start_server_process(port, extra_args=(), timeout=10.0):
+    """Launch server.py on `port` and wait until it accepts connections"""
+    proc = subprocess.Popen(
+        [sys.executable, str(SERVER_SCRIPT), str(port), '--no-browser', *extra_args],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f'server.py exited early with status {proc.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f'server.py did not start listening on port {port}')
+
+
+def stop_server_process(proc, timeout=15.0):
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def fetch(port, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f'GET {path} returned {response.status}')
+        return len(body)
+    finally:
+        conn.close()
+
+
+def measure_server_cpu(extra_args, work):
+    """Run `work(port)` against a fresh server; return (result, server CPU seconds)"""
+    port = free_port()
+    cpu_before = children_cpu_seconds()
+    proc = start_server_process(port, extra_args)
+    try:
+        result = work(port)
+    finally:
+        stop_server_process(proc)
+    return result, children_cpu_seconds() - cpu_before
+
+
+def run_transfer_benchmark(mode, path, requests):
+    """Download `path` `requests` times from a server using `--transfer mode`"""
+    extra_args = ['--transfer', mode, '--no-compression']
+
+    # Startup and shutdown cost, subtracted from the loaded run
+    _, idle_cpu = measure_server_cpu(extra_args, lambda port: None)
+
+    def work(port):
+        fetch(port, path)  # warm the ETag registry and page cache
+        started = time.perf_counter()
+        total = sum(fetch(port, path) for _ in range(requests))
+        return total, time.perf_counter() - started
+
+    (total_bytes, elapsed), busy_cpu = measure_server_cpu(extra_args, work)
+    cpu = max(busy_cpu - idle_cpu, 0.0)
+    return {
+        'mode': mode,
+        'path': path,
+        'requests': requests,
+        'bytes': total_bytes,
+        'seconds': elapsed,
+        'bytes_per_sec': total_bytes / elapsed if elapsed else 0.0,
+        'cpu_ms_per_request': cpu * 1000 / (requests + 1),
+    }
+
+
+def workload_paths(images=True):
+    """URL paths a page view fetches: the page, its scripts, every theme and the images"""
+    paths = list(PAGE_ASSETS)
+    paths += [f'/themes/{quote(css.name)}' for css in sorted((ROOT / 'themes').glob('*.css'))]
+    if images:
+        paths += [f'/images/{quote(image.name)}' for image in sorted((ROOT / 'images').iterdir())
+                  if image.suffix.lower() in IMAGE_SUFFIXES]
+    return paths
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of `pid` and its child processes (Linux), or None"""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+            for task in os.listdir(f'/proc/{current}/task'):
+                with open(f'/proc/{current}/task/{task}/children') as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            if current == pid:
+                return None
+    return total
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+class LoadStats:
+    """Counters shared by the client connections of one load run"""
+
+    def __init__(self, requests=None):
+        self.remaining = requests
+        self.latencies = []
+        self.bytes = 0
+        self.errors = 0
+        self.statuses = {}
+
+    def take(self):
+        """Claim the next request; False once a request budget is used up"""
+        if self.remaining is None:
+            return True
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+async def http_get(reader, writer, path, accept_encoding):
+    """Send one GET; returns (status, bytes received, whether the connection stays open)"""
+    request = f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+    if accept_encoding:
+        request += f'Accept-Encoding: {accept_encoding}\r\n'
+    writer.write(request.encode('latin-1') + b'\r\n')
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *lines = head.decode('iso-8859-1').split('\r\n')
+    version, status = status_line.split(' ', 2)[:2]
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get('content-length')
+    if length is not None:
+        body = await reader.readexactly(int(length))
+    else:
+        body = await reader.read()  # delimited by the server closing the connection
+    connection = headers.get('connection', '').lower()
+    keep_alive = length is not None and connection != 'close' and (
+        version == 'HTTP/1.1' or connection == 'keep-alive')
+    return int(status), len(head) + len(body), keep_alive
+
+
+async def load_client(port, paths, offset, deadline, stats, accept_encoding):
+    """One client connection cycling through `paths` until the deadline or budget"""
+    reader = writer = None
+    index = offset
+    while time.perf_counter() < deadline and stats.take():
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        result = None
+        for _ in range(2):
+            reused = writer is not None
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                result = await http_get(reader, writer, path, accept_encoding)
+                break
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                # The server closed an idle keep-alive connection as the request went out;
+                # like a browser, retry once on a new connection
+                stale = isinstance(e, ConnectionError) or (
+                    isinstance(e, asyncio.IncompleteReadError) and not e.partial)
+                if not (reused and stale):
+                    break
+        if result is None:
+            stats.errors += 1
+            keep_alive = False
+        else:
+            status, size, keep_alive = result
+            stats.latencies.append(time.perf_counter() - started)
+            stats.bytes += size
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status >= 400:
+                stats.errors += 1
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def drive_load(port, pid, paths, concurrency, duration, requests, accept_encoding, warmup):
+    """Run the clients against `port` while sampling the server's memory"""
+    if warmup:
+        await asyncio.gather(*(load_client(port, paths, offset, time.perf_counter() + warmup,
+                                           LoadStats(len(paths)), accept_encoding)
+                               for offset in range(min(concurrency, len(paths)))))
+    rss = {'idle': process_tree_rss(pid), 'peak': process_tree_rss(pid)}
+
+    async def sample_memory():
+        while True:
+            current = process_tree_rss(pid)
+            if current is not None:
+                rss['peak'] = max(rss['peak'] or 0, current)
+            await asyncio.sleep(0.1)
+
+    stats = LoadStats(requests)
+    sampler = asyncio.create_task(sample_memory())
+    deadline = time.perf_counter() + (duration if requests is None else 24 * 3600)
+    started = time.perf_counter()
+    await asyncio.gather(*(load_client(port, paths, offset, deadline, stats, accept_encoding)
+                           for offset in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    sampler.cancel()
+    return stats, elapsed, rss
+
+
+def run_load_benchmark(mode, paths, concurrency, duration, requests, accept_encoding, warmup):
+    """Start the server in `mode` and drive it with `concurrency` connections"""
+    port = free_port()
+    cpu_before = children_cpu_seconds()
+    proc = start_server_process(port, LOAD_MODES[mode])
+    try:
+        stats, elapsed, rss = asyncio.run(drive_load(
+            port, proc.pid, paths, concurrency, duration, requests, accept_encoding, warmup))
+    finally:
+        stop_server_process(proc)
+    cpu = children_cpu_seconds() - cpu_before
+    latencies = sorted(stats.latencies)
+    completed = len(latencies)
+    return {
+        'mode': mode,
+        'concurrency': concurrency,
+        'requests': completed,
+        'errors': stats.errors,
+        'statuses': {str(status): count for status, count in sorted(stats.statuses.items())},
+        'seconds': elapsed,
+        'requests_per_sec': completed / elapsed if elapsed else 0.0,
+        'bytes': stats.bytes,
+        'bytes_per_sec': stats.bytes / elapsed if elapsed else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50) * 1000,
+            'p95': percentile(latencies, 0.95) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'max': (latencies[-1] if latencies else 0.0) * 1000,
+        },
+        'rss_idle_bytes': rss['idle'],
+        'rss_peak_bytes': rss['peak'],
+        'server_cpu_seconds': cpu,
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def format_rss(value):
+    return f'{value / 2 ** 20:.1f}' if value is not None else 'n/a'
+
+
+def print_load_table(results):
+    print(f"\n{'Mode':<9} {'Req/s':>9} {'MB/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'Errors':>7} {'RSS MB':>7}")
+    print('─' * 72)
+    for result in results:
+        latency = result['latency_ms']
+        print(f"{result['mode']:<9} {result['requests_per_sec']:>9.1f} "
+              f"{result['bytes_per_sec'] / 1e6:>8.1f} {latency['p50']:>8.2f} {latency['p95']:>8.2f} "
+              f"{latency['p99']:>8.2f} {result['errors']:>7} {format_rss(result['rss_peak_bytes']):>7}")
+    print()
+
+
+def print_load_comparison(results, baseline_file):
+    """Relative change of each mode against an earlier `load --json` report"""
+    baseline = json.loads(Path(baseline_file).read_text(encoding='utf-8'))
+    previous = {result['mode']: result for result in baseline.get('results', [])}
+    print(f"📈 Compared with {baseline_file} (commit {baseline.get('commit') or 'unknown'}):")
+    for result in results:
+        before = previous.get(result['mode'])
+        if before is None:
+            print(f"   {result['mode']:<9} no baseline")
+            continue
+
+        def change(now, then):
+            return f'{(now - then) / then * 100:+.1f}%' if then else 'n/a'
+
+        print(f"   {result['mode']:<9} req/s {change(result['requests_per_sec'], before['requests_per_sec'])}, "
+              f"p99 {change(result['latency_ms']['p99'], before['latency_ms']['p99'])}, "
+              f"peak RSS {change(result['rss_peak_bytes'] or 0, before['rss_peak_bytes'] or 0)}")
+    print()
+
+
+def print_transfer_table(results):
+    print(f"\n{'Mode':<10} {'Requests':>8} {'MB/s':>10} {'CPU ms/req':>11}")
+    print('─' * 42)
+    for result in results:
+        print(f"{result['mode']:<10} {result['requests']:>8} "
+              f"{result['bytes_per_sec'] / 1e6:>10.1f} {result['cpu_ms_per_request']:>11.2f}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks for the Portfolio Website server')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    transfer = subparsers.add_parser(
+        'transfer', help='compare copyfileobj, mmap and sendfile file transmission')
+    transfer.add_argument('--path', default='/images/mamtau.png', help='URL path to download')
+    transfer.add_argument('--requests', type=int, default=50, help='downloads per mode')
+    transfer.add_argument('--modes', nargs='+', default=['copy', 'mmap', 'sendfile'],
+                          choices=['copy', 'mmap', 'sendfile'])
+    transfer.add_argument('--json', metavar='FILE', help='also write the results as JSON')
+
+    load = subparsers.add_parser(
+        'load', help='drive each serving mode with concurrent clients and report latency')
+    load.add_argument('--modes', nargs='+', default=list(LOAD_MODES), choices=list(LOAD_MODES))
+    load.add_argument('--concurrency', type=int, default=32, help='concurrent client connections')
+    load.add_argument('--duration', type=float, default=10.0, help='seconds of load per mode')
+    load.add_argument('--requests', type=int,
+                      help='stop after this many requests per mode instead of --duration')
+    load.add_argument('--warmup', type=float, default=1.0,
+                      help='seconds spent fetching every path once before measuring (0 = none)')
+    load.add_argument('--no-images', dest='images', action='store_false',
+                      help='leave the large images out of the workload')
+    load.add_argument('--paths', nargs='+', metavar='PATH',
+                      help='URL paths to request instead of the bundled asset set')
+    load.add_argument('--accept-encoding', default='gzip, br',
+                      help="Accept-Encoding sent by the clients ('' = none)")
+    load.add_argument('--json', metavar='FILE', help='also write the results as JSON')
+    load.add_argument('--compare', metavar='FILE', help='show changes against an earlier --json report')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'transfer':
+        print(f'📊 Downloading {args.path} {args.requests}x per transfer mode...')
+        results = [run_transfer_benchmark(mode, args.path, args.requests) for mode in args.modes]
+        print_transfer_table(results)
+        if args.json:
+            Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+            print(f'💾 Results saved to {args.json}')
+    elif args.command == 'load':
+        paths = args.paths or workload_paths(args.images)
+        budget = f'{args.requests} requests' if args.requests else f'{args.duration:g}s'
+        print(f'📊 Load testing {len(paths)} paths with {args.concurrency} connections, '
+              f'{budget} per mode...')
+        results = []
+        for mode in args.modes:
+            print(f'   • {mode}')
+            results.append(run_load_benchmark(mode, paths, args.concurrency, args.duration,
+                                              args.requests, args.accept_encoding, args.warmup))
+        print_load_table(results)
+        if args.compare:
+            print_load_comparison(results, args.compare)
+        if args.json:
+            report = {
+                'commit': git_commit(),
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'paths': paths,
+                'results': results,
+            }
+            Path(args.json).write_text(json.dumps(report, indent=2), encoding='utf-8')
+            print(f'💾 Results saved to {args.json}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
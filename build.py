@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Build tooling for the Portfolio Website
+Usage: python build.py dist [--out dist] [--jobs N] [--force]
+       python build.py compress [--force]
+       python build.py fingerprint [--out dist]
+       python build.py images [--widths 320 640 960 1280] [--jobs N]
+       python build.py prerender [--force]
+       python build.py config
+"""
+
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from minify import critical_css, minifier_name, minify_css, minify_js
+from portfolio_config import CONFIG_FILE, compile_snapshot, load_config
+from prerender import (PRERENDER_VERSION, PRERENDERED_FILE, active_theme, prerender_inputs,
+                       prerender_page)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+ROOT = Path(__file__).resolve().parent
+BUILD_CACHE_FILE = '.build-cache.json'
+
+# Text assets served by server.py that benefit from precompression
+TEXT_ASSETS = ['index.html', PRERENDERED_FILE, 'styles.css', 'script.js', CONFIG_FILE]
+TEXT_ASSET_GLOBS = ['themes/*.css']
+
+# Fingerprinting: images first, then the files that reference them
+IMAGE_GLOB = 'images/*'
+STYLESHEETS = ['styles.css']
+STYLESHEET_GLOBS = ['themes/*.css']
+SCRIPTS = [CONFIG_FILE, 'script.js']
+HTML_ENTRY = 'index.html'
+ASSET_MANIFEST = 'asset-manifest.json'
+# The only output directory allowed inside the source tree (it is gitignored)
+DIST_DIR = 'dist'
+FINGERPRINT_LENGTH = 10
+FINGERPRINTED_PATTERN = re.compile(r'\.[0-9a-f]{%d}\.[A-Za-z0-9]+$' % FINGERPRINT_LENGTH)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class BuildCache:
+    """Content hashes from previous runs, used to skip unchanged inputs"""
+
+    def __init__(self, root=ROOT):
+        self.path = Path(root) / BUILD_CACHE_FILE
+        try:
+            self.data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.data = {}
+
+    def section(self, name):
+        return self.data.setdefault(name, {})
+
+    def save(self):
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.data, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+def text_assets(root=ROOT):
+    root = Path(root)
+    paths = [root / name for name in TEXT_ASSETS]
+    for pattern in TEXT_ASSET_GLOBS:
+        paths.extend(sorted(root.glob(pattern)))
+    return [path for path in paths if path.is_file()]
+
+
+def encoders():
+    """(suffix, compress function) for every available content coding"""
+    available = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        available.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    return available
+
+
+def precompress_assets(root=ROOT, force=False, cache=None):
+    """Write .gz (and .br when brotli is installed) siblings for text assets.
+
+    Outputs get the source's mtime so server.py can tell a stale variant
+    from a fresh one. Unchanged sources are skipped by content hash.
+    """
+    root = Path(root)
+    cache = cache or BuildCache(root)
+    hashes = cache.section('compress')
+    written = skipped = 0
+
+    for path in text_assets(root):
+        rel = path.relative_to(root).as_posix()
+        data = path.read_bytes()
+        digest = content_hash(data)
+        st = path.stat()
+        outputs = [(Path(f'{path}{suffix}'), encode) for suffix, encode in encoders()]
+
+        if (not force and hashes.get(rel) == digest
+                and all(output.exists() for output, _ in outputs)):
+            # Same content but maybe a newer mtime (checkout, touch): keep variants fresh
+            for output, _ in outputs:
+                os.utime(output, ns=(st.st_atime_ns, st.st_mtime_ns))
+            skipped += 1
+            continue
+
+        for output, encode in outputs:
+            body = encode(data)
+            if len(body) >= len(data):
+                # Not worth it; make sure no stale variant lingers
+                output.unlink(missing_ok=True)
+                continue
+            output.write_bytes(body)
+            os.utime(output, ns=(st.st_atime_ns, st.st_mtime_ns))
+            print(f'🗜️  {rel} → {output.name} ({len(data):,} → {len(body):,} bytes)')
+        hashes[rel] = digest
+        written += 1
+
+    cache.save()
+    if brotli is None:
+        print('ℹ️  brotli module not installed; wrote gzip variants only (pip install brotli)')
+    print(f'✅ Precompressed {written} asset(s), {skipped} unchanged')
+    return written
+
+
+def fingerprinted_name(rel, data):
+    """images/profile.jpg -> images/profile.<hash>.jpg"""
+    stem, dot, suffix = rel.rpartition('.')
+    digest = content_hash(data)[:FINGERPRINT_LENGTH]
+    return f'{stem}.{digest}.{suffix}' if dot else f'{rel}.{digest}'
+
+
+def rewrite_references(text, manifest):
+    """Point quoted, url()-wrapped or root-relative references at fingerprinted names"""
+    for original, fingerprinted in manifest.items():
+        pattern = r'(?<=["\'(/])' + re.escape(original) + r'(?=["\')?#])'
+        text = re.sub(pattern, fingerprinted, text)
+    return text
+
+
+def rewrite_html_references(html_text, manifest):
+    """rewrite_references() that also matches HTML-escaped names (r&amp;d-ai.png)"""
+    escaped = {html.escape(rel): html.escape(name) for rel, name in manifest.items()
+               if html.escape(rel) != rel}
+    return rewrite_references(rewrite_references(html_text, manifest), escaped)
+
+
+def write_if_changed(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def inject_asset_map(html_text, manifest):
+    """Inline the theme stylesheet mapping for script.js's assetUrl() before the first script"""
+    theme_assets = {rel: name for rel, name in manifest.items() if rel.startswith('themes/')}
+    asset_script = (f'<script>window.portfolioAssets = {json.dumps(theme_assets, sort_keys=True)};'
+                    f'</script>\n    ')
+    return html_text.replace('<script src=', asset_script + '<script src=', 1)
+
+
+def rewrite_page(html_text, manifest):
+    """index.html pointing at the names in `manifest`, with the theme mapping inlined"""
+    return inject_asset_map(rewrite_html_references(html_text, manifest), manifest)
+
+
+def output_dir(root, out_dir):
+    """Resolve --out against `root`; None (after a message) for a directory in the source tree.
+
+    Builds delete stale outputs, so inside the checkout only the gitignored
+    dist/ directory is accepted. Directories outside it are fine.
+    """
+    out = Path(out_dir)
+    if not out.is_absolute():
+        out = root / out
+    resolved, source = out.resolve(), root.resolve()
+    if resolved.is_relative_to(source) and not resolved.is_relative_to(source / DIST_DIR):
+        print(f'❌ Output directory {out} is inside the source tree; '
+              f'use {DIST_DIR}/ or a directory outside {source}')
+        return None
+    return out
+
+
+def fingerprint_assets(root=ROOT, out_dir=DIST_DIR):
+    """Copy assets to content-hashed names and rewrite references to them.
+
+    Writes both the original and the fingerprinted name of every asset so
+    dynamic references keep working, rewrites index.html, portfolio-config.js
+    and the stylesheets, and records the mapping in asset-manifest.json.
+    Theme stylesheets are loaded by script.js at runtime, so their mapping is
+    also inlined into index.html as window.portfolioAssets. Returns None when
+    `out_dir` is rejected by output_dir().
+    """
+    root = Path(root)
+    out = output_dir(root, out_dir)
+    if out is None:
+        return None
+    manifest = {}
+    written = 0
+
+    def emit(rel, data):
+        nonlocal written
+        fingerprinted = fingerprinted_name(rel, data)
+        written += write_if_changed(out / rel, data)
+        written += write_if_changed(out / fingerprinted, data)
+        manifest[rel] = fingerprinted
+
+    for path in sorted(root.glob(IMAGE_GLOB)):
+        if path.is_file() and not path.name.startswith('.'):
+            emit(path.relative_to(root).as_posix(), path.read_bytes())
+
+    stylesheets = [root / name for name in STYLESHEETS]
+    for pattern in STYLESHEET_GLOBS:
+        stylesheets.extend(sorted(root.glob(pattern)))
+    for path in stylesheets + [root / name for name in SCRIPTS]:
+        text = rewrite_references(path.read_text(encoding='utf-8'), manifest)
+        emit(path.relative_to(root).as_posix(), text.encode('utf-8'))
+
+    html_source = root / PRERENDERED_FILE
+    if not prerendered_is_fresh(root):
+        html_source = root / HTML_ENTRY
+    html_text = rewrite_page(html_source.read_text(encoding='utf-8'), manifest)
+    written += write_if_changed(out / HTML_ENTRY, html_text.encode('utf-8'))
+
+    manifest_json = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+    written += write_if_changed(out / ASSET_MANIFEST, manifest_json.encode('utf-8'))
+
+    # Drop fingerprinted files left over from previous builds
+    current = set(manifest.values())
+    for path in out.rglob('*'):
+        rel = path.relative_to(out).as_posix()
+        if path.is_file() and FINGERPRINTED_PATTERN.search(rel) and rel not in current:
+            path.unlink()
+
+    print(f'🔖 Fingerprinted {len(manifest)} asset(s) into {out} ({written} file(s) updated)')
+    print(f'📒 Manifest: {out / ASSET_MANIFEST}')
+    return manifest
+
+
+def prerendered_is_fresh(root=ROOT):
+    """Whether index.prerendered.html is at least as new as its inputs"""
+    try:
+        output_mtime = (Path(root) / PRERENDERED_FILE).stat().st_mtime_ns
+        return all(path.stat().st_mtime_ns <= output_mtime for path in prerender_inputs(root))
+    except OSError:
+        return False
+
+
+def prerender_index(root=ROOT, force=False, cache=None):
+    """Write index.prerendered.html unless the template, config and themes are unchanged"""
+    root = Path(root)
+    cache = cache or BuildCache(root)
+    state = cache.section('prerender')
+    output = root / PRERENDERED_FILE
+    digest = content_hash(PRERENDER_VERSION.encode('ascii') + b''.join(
+        path.read_bytes() for path in prerender_inputs(root)))
+
+    if not force and state.get('digest') == digest and output.exists():
+        # Same inputs but maybe newer mtimes (checkout, touch): keep the page fresh
+        os.utime(output)
+        print(f'✅ {PRERENDERED_FILE} is up to date')
+        return False
+
+    html = prerender_page(root)
+    write_if_changed(output, html.encode('utf-8'))
+    os.utime(output)
+    state['digest'] = digest
+    cache.save()
+    print(f'🧱 Prerendered {HTML_ENTRY} → {PRERENDERED_FILE} ({len(html.encode("utf-8")):,} bytes)')
+    return True
+
+
+# Deployable site bundle (python build.py dist)
+DIST_VERSION = '1'
+DEPLOY_FILES = ['CNAME']
+MAIN_STYLESHEET = 'styles.css'
+
+
+def theme_stylesheets(root, config):
+    """themes/<mode>-theme.css for every theme mode in the config that has one"""
+    modes = (config.get('theme') or {}).get('modes') or {}
+    paths = [Path(root) / 'themes' / f'{mode}-theme.css' for mode in modes]
+    return [path for path in paths if path.is_file()]
+
+
+def referenced_image_files(root, texts):
+    """Files under images/ whose path appears in any of `texts`"""
+    found = []
+    for path in sorted(Path(root).glob(IMAGE_GLOB)):
+        if not path.is_file() or path.name.startswith('.'):
+            continue
+        rel = path.relative_to(root).as_posix()
+        if any(rel in text or html.escape(rel) in text for text in texts):
+            found.append(path)
+    return found
+
+
+def write_precompressed(path, data):
+    """Write .gz/.br siblings of `path` when they are smaller; returns their paths"""
+    st = path.stat()
+    written = []
+    for suffix, encode in encoders():
+        output = Path(f'{path}{suffix}')
+        body = encode(data)
+        if len(body) >= len(data):
+            output.unlink(missing_ok=True)
+            continue
+        write_if_changed(output, body)
+        os.utime(output, ns=(st.st_atime_ns, st.st_mtime_ns))
+        written.append(output)
+    return written
+
+
+def build_dist_asset(task):
+    """Minify, fingerprint and precompress one stylesheet or script; runs in a worker process"""
+    out, rel, text = task
+    out = Path(out)
+    minified = minify_css(text) if rel.endswith('.css') else minify_js(text)
+    data = minified.encode('utf-8')
+    name = fingerprinted_name(rel, data)
+    write_if_changed(out / name, data)
+    files = [name] + [output.relative_to(out).as_posix()
+                      for output in write_precompressed(out / name, data)]
+    return rel, {'output': name, 'files': files, 'size': len(text.encode('utf-8')),
+                 'minified': len(data)}
+
+
+def inline_critical_css(html_text, stylesheet, critical):
+    """Inline the critical rules of styles.css and load all of it without blocking render.
+
+    The active theme is already handled the same way by the prerendered page.
+    """
+    tags = [f'<style data-critical>{critical}</style>',
+            f'<link rel="preload" href="{stylesheet}" as="style" '
+            f'onload="this.onload=null;this.rel=\'stylesheet\'">',
+            f'<noscript><link rel="stylesheet" href="{stylesheet}"></noscript>']
+    link = re.compile(r'<link\b[^>]*\bhref="%s"[^>]*>' % re.escape(MAIN_STYLESHEET))
+    return link.sub(lambda match: '\n    '.join(tags), html_text, count=1)
+
+
+def build_dist(root=ROOT, out_dir=DIST_DIR, jobs=None, force=False, cache=None):
+    """Build a deployable copy of the site holding only what the page references.
+
+    Images referenced by the page, config or stylesheets are copied under
+    content-hashed names; stylesheets and scripts are minified, fingerprinted
+    and precompressed in a process pool, skipping those whose content is
+    unchanged since the last build. index.html is the prerendered page (which
+    inlines the active theme) with the critical CSS of styles.css inlined too.
+    Returns None when `out_dir` is rejected by output_dir().
+    """
+    root = Path(root)
+    out = output_dir(root, out_dir)
+    if out is None:
+        return None
+    out.mkdir(parents=True, exist_ok=True)
+    cache = cache or BuildCache(root)
+    prerender_index(root, cache=cache)
+    state = cache.section('dist')
+    previous = state.get('assets', {}) if state.get('out') == str(out) else {}
+    settings = DIST_VERSION + minifier_name()
+
+    config = load_config(root / CONFIG_FILE)
+    html_source = (root / PRERENDERED_FILE).read_text(encoding='utf-8')
+    text_paths = [root / MAIN_STYLESHEET, *theme_stylesheets(root, config),
+                  *(root / name for name in SCRIPTS)]
+    sources = {path.relative_to(root).as_posix(): path.read_text(encoding='utf-8')
+               for path in text_paths}
+
+    manifest = {}
+    assets = {}
+    files = set()
+    for path in referenced_image_files(root, [html_source, *sources.values()]):
+        rel = path.relative_to(root).as_posix()
+        name = fingerprinted_name(rel, path.read_bytes())
+        target = out / name
+        if not target.exists() or target.stat().st_size != path.stat().st_size:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, target)
+        manifest[rel] = name
+        files.add(name)
+
+    tasks = []
+    for rel, text in sources.items():
+        text = rewrite_references(text, manifest)
+        sources[rel] = text
+        key = content_hash((settings + text).encode('utf-8'))
+        known = previous.get(rel)
+        if (not force and known and known['key'] == key
+                and all((out / name).exists() for name in known['files'])):
+            assets[rel] = known
+            continue
+        tasks.append((str(out), rel, text))
+
+    if tasks:
+        print(f'✂️  Minifying {len(tasks)} asset(s) ({minifier_name()})...')
+        if len(tasks) > 1 and jobs != 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(build_dist_asset, tasks))
+        else:
+            results = [build_dist_asset(task) for task in tasks]
+        for (_, rel, text), (_, entry) in zip(tasks, results):
+            entry['key'] = content_hash((settings + text).encode('utf-8'))
+            assets[rel] = entry
+            print(f"   ✅ {rel} → {entry['output']} ({entry['size']:,} → {entry['minified']:,} bytes)")
+    for rel, entry in assets.items():
+        manifest[rel] = entry['output']
+        files.update(entry['files'])
+
+    critical = critical_css(sources[MAIN_STYLESHEET], html_source)
+    html_text = inline_critical_css(html_source, manifest[MAIN_STYLESHEET], critical)
+    html_text = rewrite_page(html_text, manifest)
+    manifest_json = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+    for name, data in ((HTML_ENTRY, html_text.encode('utf-8')),
+                       (ASSET_MANIFEST, manifest_json.encode('utf-8'))):
+        write_if_changed(out / name, data)
+        files.add(name)
+        files.update(output.relative_to(out).as_posix()
+                     for output in write_precompressed(out / name, data))
+    for name in DEPLOY_FILES:
+        if (root / name).is_file():
+            write_if_changed(out / name, (root / name).read_bytes())
+            files.add(name)
+
+    # Drop outputs of earlier builds that this one no longer produces
+    if state.get('out') == str(out):
+        for name in set(state.get('files', [])) - files:
+            (out / name).unlink(missing_ok=True)
+    state.update({'out': str(out), 'assets': assets, 'files': sorted(files)})
+    cache.save()
+
+    total = sum((out / name).stat().st_size for name in files if not name.endswith(('.gz', '.br')))
+    print(f'📦 Built {out}: {len(files)} file(s), {total / 1024:,.0f} KiB '
+          f'({len(tasks)} minified, {len(sources) - len(tasks)} unchanged)')
+    print(f'🎨 Inlined {len(critical.encode("utf-8")):,} bytes of critical CSS '
+          f'(active theme: {active_theme(config)})')
+    print(f'📒 Manifest: {out / ASSET_MANIFEST}')
+    return manifest
+
+
+# Responsive image variants (python build.py images)
+IMAGE_REFERENCE_PATTERN = re.compile(r'/?images/[^/].*\.(?:png|jpe?g|gif|webp)', re.I)
+IMAGE_VARIANTS_DIR = 'images/variants'
+IMAGE_VARIANTS_MANIFEST = 'images/variants/manifest.json'
+DEFAULT_IMAGE_WIDTHS = [320, 640, 960, 1280]
+# Variants mirror the source's directory under images/variants and keep its
+# extension, so images/a.png, images/a.jpg and images/x/a.png never collide
+IMAGE_VARIANT_NAME = '{name}-{width}w.{extension}'
+# format name -> (Pillow format, MIME type, file extension, save options)
+IMAGE_FORMATS = {
+    'avif': ('AVIF', 'image/avif', 'avif', {'quality': 50}),
+    'webp': ('WEBP', 'image/webp', 'webp', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', 'image/jpeg', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', 'image/png', 'png', {'optimize': True}),
+}
+
+
+def referenced_images(root=ROOT):
+    """Image paths (images/...) referenced by portfolio-config.js, in order"""
+    seen = []
+
+    def walk(value):
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif isinstance(value, str) and IMAGE_REFERENCE_PATTERN.fullmatch(value):
+            rel = value.lstrip('/')
+            if rel not in seen:
+                seen.append(rel)
+
+    walk(load_config(Path(root) / CONFIG_FILE))
+    return seen
+
+
+def available_image_formats():
+    """Modern formats this Pillow build can encode, best first"""
+    if Image is None:
+        return []
+    Image.init()
+    return [name for name in ('avif', 'webp') if IMAGE_FORMATS[name][0] in Image.SAVE]
+
+
+def render_image_variants(task):
+    """Resize one source image to every width/format; runs in a worker process"""
+    root, rel, widths, formats = task
+    root = Path(root)
+    source = root / rel
+    out_dir = root / IMAGE_VARIANTS_DIR / Path(rel).parent.relative_to('images')
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        original_format = 'png' if opened.format == 'PNG' else 'jpeg'
+        width, height = image.size
+        targets = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+        variants = []
+        for target in targets:
+            target_height = max(1, round(height * target / width))
+            resized = image if target == width else image.resize((target, target_height),
+                                                                  Image.LANCZOS)
+            for name in list(formats) + [original_format]:
+                pil_format, mimetype, extension, options = IMAGE_FORMATS[name]
+                frame = resized
+                if pil_format == 'JPEG' and frame.mode not in ('RGB', 'L'):
+                    frame = frame.convert('RGB')
+                output = out_dir / IMAGE_VARIANT_NAME.format(name=source.name, width=target,
+                                                             extension=extension)
+                frame.save(output, pil_format, **options)
+                variants.append({
+                    'src': '/' + output.relative_to(root).as_posix(),
+                    'width': target,
+                    'height': target_height,
+                    'type': mimetype,
+                })
+    return rel, {'width': width, 'height': height, 'variants': variants}
+
+
+def srcset_for(entry):
+    """{'image/webp': '/images/variants/a.png-320w.webp 320w, ...'} for <picture>/<img srcset>"""
+    srcsets = {}
+    for variant in entry['variants']:
+        srcsets.setdefault(variant['type'], []).append(f"{variant['src']} {variant['width']}w")
+    return {mimetype: ', '.join(items) for mimetype, items in srcsets.items()}
+
+
+def build_image_variants(root=ROOT, widths=None, jobs=None, force=False, cache=None):
+    """Generate resized AVIF/WebP/original-format variants of configured images.
+
+    Work is spread over a process pool; images whose content hash and
+    settings are unchanged keep their previous variants. Writes a manifest
+    mapping each /images/... URL to its variants and srcset strings, plus
+    the source's size and mtime so the server can tell stale variants apart.
+    """
+    if Image is None:
+        print('❌ Pillow is required for image variants: pip install Pillow')
+        return None
+    root = Path(root)
+    widths = sorted(widths or DEFAULT_IMAGE_WIDTHS)
+    formats = available_image_formats()
+    out_dir = root / IMAGE_VARIANTS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = cache or BuildCache(root)
+    previous = cache.section('images')
+    settings = {'widths': widths, 'formats': formats, 'naming': IMAGE_VARIANT_NAME}
+
+    manifest = {}
+    tasks = []
+    digests = {}
+    sources = {}
+    for rel in referenced_images(root):
+        source = root / rel
+        if not source.is_file():
+            print(f'⚠️  {rel} is referenced in {CONFIG_FILE} but missing')
+            continue
+        st = source.stat()
+        sources[rel] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        digests[rel] = content_hash(source.read_bytes())
+        known = previous.get(rel)
+        if (not force and known and known['hash'] == digests[rel] and known['settings'] == settings
+                and all((root / variant['src'].lstrip('/')).exists()
+                        for variant in known['entry']['variants'])):
+            manifest['/' + rel] = dict(known['entry'], source=sources[rel])
+            continue
+        tasks.append((str(root), rel, widths, formats))
+
+    if tasks:
+        print(f'🖼️  Rendering {len(tasks)} image(s) at widths {widths} as '
+              f'{", ".join(formats) or "original format only"}...')
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for rel, entry in pool.map(render_image_variants, tasks):
+                entry['srcset'] = srcset_for(entry)
+                manifest['/' + rel] = dict(entry, source=sources[rel])
+                previous[rel] = {'hash': digests[rel], 'settings': settings, 'entry': entry}
+                print(f"   ✅ {rel} → {len(entry['variants'])} variant(s)")
+
+    manifest_json = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+    write_if_changed(root / IMAGE_VARIANTS_MANIFEST, manifest_json.encode('utf-8'))
+    cache.save()
+    print(f'✅ Image variants: {len(tasks)} rendered, {len(manifest) - len(tasks)} unchanged')
+    print(f'📒 Manifest: {root / IMAGE_VARIANTS_MANIFEST}')
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build tooling for the Portfolio Website')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    dist = subparsers.add_parser(
+        'dist', help='build a minimal, minified, precompressed copy of the site for deployment')
+    dist.add_argument('--out', default=DIST_DIR,
+                      help='output directory: dist or outside the source tree (default: dist)')
+    dist.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPUs)')
+    dist.add_argument('--force', action='store_true', help='rebuild even if unchanged')
+
+    compress = subparsers.add_parser('compress', help='write .gz/.br siblings for text assets')
+    compress.add_argument('--force', action='store_true', help='rebuild even if unchanged')
+
+    fingerprint = subparsers.add_parser(
+        'fingerprint', help='copy assets to content-hashed names and rewrite references')
+    fingerprint.add_argument('--out', default=DIST_DIR,
+                             help='output directory: dist or outside the source tree (default: dist)')
+
+    images = subparsers.add_parser(
+        'images', help='generate responsive AVIF/WebP variants of configured images')
+    images.add_argument('--widths', type=int, nargs='+', default=DEFAULT_IMAGE_WIDTHS,
+                        help='target widths in pixels')
+    images.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPUs)')
+    images.add_argument('--force', action='store_true', help='re-render unchanged images')
+
+    prerender = subparsers.add_parser(
+        'prerender', help='render index.html with the content of portfolio-config.js')
+    prerender.add_argument('--force', action='store_true', help='rebuild even if unchanged')
+
+    subparsers.add_parser('config', help='compile portfolio-config.js into its cached snapshot')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'dist':
+        if build_dist(out_dir=args.out, jobs=args.jobs, force=args.force) is None:
+            return 1
+    elif args.command == 'compress':
+        precompress_assets(force=args.force)
+    elif args.command == 'fingerprint':
+        if fingerprint_assets(out_dir=args.out) is None:
+            return 1
+    elif args.command == 'images':
+        if build_image_variants(widths=args.widths, jobs=args.jobs, force=args.force) is None:
+            return 1
+    elif args.command == 'prerender':
+        prerender_index(force=args.force)
+    elif args.command == 'config':
+        compile_snapshot(ROOT / CONFIG_FILE)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
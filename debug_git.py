@@ -3,24 +3,19 @@
 Debug script to test git commands
 """
 
-import subprocess
-import sys
-
-def run_command(command, shell=False):
-    """Run a shell command and return the result"""
-    try:
-        result = subprocess.run(
-            command,
-            shell=shell,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error running command: {command}")
-        print(f"Error: {e.stderr}")
+from git_runner import GitRunner
+
+git = GitRunner()
+
+
+def run_command(*args):
+    """Run a git command and return its output, or None when it fails"""
+    code, stdout, stderr = git.run(*args, capture_output=True)
+    if code != 0:
+        print(f"❌ Error running command: git {' '.join(args)}")
+        print(f"Error: {stderr}")
         return None
+    return stdout
 
 # Test git commands
 print("Testing git commands...")
@@ -28,19 +23,19 @@ print("=" * 30)
 
 try:
     print("1. Testing 'git rev-parse --git-dir':")
-    result1 = run_command("git rev-parse --git-dir")
+    result1 = run_command("rev-parse", "--git-dir")
     print(f"   Result: {result1}")
 
     print("\n2. Testing 'git status':")
-    result2 = run_command("git status")
+    result2 = run_command("status")
     print(f"   Result: {result2}")
 
     print("\n3. Testing 'git branch --show-current':")
-    result3 = run_command("git branch --show-current")
+    result3 = run_command("branch", "--show-current")
     print(f"   Result: {result3}")
 
     print("\n4. Testing 'git remote':")
-    result4 = run_command("git remote")
+    result4 = run_command("remote")
     print(f"   Result: {result4}")
 
     # Test the logic from our script
@@ -50,7 +45,17 @@ try:
     else:
         print("   ❌ Git repository NOT detected")
 
+    print("\n6. Testing the cat-file batch process:")
+    print(f"   Result: {git.oneline('HEAD')}")
+
+    print("\nTimings:")
+    for timing in git.timings:
+        print(f"   {timing.seconds * 1000:7.1f} ms  {' '.join(timing.argv)}")
+    print(f"   {git.summary()}")
+
 except Exception as e:
     print(f"Exception: {e}")
     import traceback
     traceback.print_exc()
+finally:
+    git.close()
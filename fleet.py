@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+🚢 Fleet mode: run sync.py / update.py across many repository checkouts
+Repositories are processed concurrently by a bounded worker pool, with a
+separate limit on how many talk to the same remote host at once. Each run
+is unattended (no prompts, no credential dialogs) and the fleet ends with a
+summary table and an optional JSON report.
+Usage: python fleet.py [--action sync|update|both] [--workers N] [--per-host N]
+                       [--on-local-changes abort|continue] [--json report.json]
+                       [--from repos.txt] [repo-or-glob ...]
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from git_runner import GitRunner
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ACTIONS = {
+    'sync': ['sync'],
+    'update': ['update'],
+    'both': ['sync', 'update'],  # pull first so the push is a fast-forward
+}
+# Lines of script output kept per step in the report
+OUTPUT_TAIL = 20
+
+
+@dataclass
+class StepResult:
+    action: str
+    success: bool
+    outcome: str
+    exit_code: int
+    seconds: float
+    git_calls: int = 0
+    git_seconds: float = 0.0
+    attempts: list = field(default_factory=list)
+    output_tail: list = field(default_factory=list)
+
+
+@dataclass
+class RepoResult:
+    path: str
+    host: str
+    success: bool = False
+    seconds: float = 0.0
+    waited: float = 0.0  # time spent queued behind the per-host limit
+    steps: list = field(default_factory=list)
+
+
+def expand_repos(patterns, list_file=None):
+    """Unique git checkouts matching the given paths/globs and the lines of `list_file`"""
+    patterns = list(patterns)
+    if list_file:
+        with open(list_file, encoding='utf-8') as f:
+            patterns += [line.strip() for line in f
+                         if line.strip() and not line.lstrip().startswith('#')]
+    repos, seen = [], set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern))) or [pattern]
+        for path in matches:
+            real = os.path.realpath(path)
+            if real in seen:
+                continue
+            if not os.path.exists(os.path.join(real, '.git')):
+                print(f"⚠️  Skipping {path}: not a git checkout")
+                continue
+            seen.add(real)
+            repos.append(real)
+    return repos
+
+
+def remote_host(repo, remote='origin'):
+    """Host of the repository's remote (`local` for path remotes, `?` if unknown)"""
+    code, url, stderr = GitRunner(repo).run("remote", "get-url", remote, capture_output=True)
+    if code != 0 or not url:
+        return '?'
+    if '://' in url:
+        return urlsplit(url).hostname or 'local'
+    if ':' in url.split('/', 1)[0]:  # scp-like: git@github.com:user/repo.git
+        return url.split(':', 1)[0].rsplit('@', 1)[-1]
+    return 'local'
+
+
+class HostLimiter:
+    """One semaphore per remote host so a fleet does not hammer a single server"""
+
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+
+def run_step(repo, action, options):
+    """Run sync.py or update.py in `repo` and collect its JSON report"""
+    fd, report_path = tempfile.mkstemp(prefix='fleet-', suffix='.json')
+    os.close(fd)
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, f'{action}.py'), '--report', report_path]
+    if options.deadline is not None:
+        command += ['--deadline', str(options.deadline)]
+    if action == 'sync':
+        command += ['--on-local-changes', options.on_local_changes]
+    elif options.message:
+        command += ['--', options.message]
+    # Fail instead of waiting for a password prompt nobody will answer
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0', PYTHONIOENCODING='utf-8')
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(command, cwd=repo, env=env, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding='utf-8', errors='replace',
+                                timeout=options.timeout)
+        exit_code, output = result.returncode, result.stdout
+    except subprocess.TimeoutExpired as e:
+        exit_code = -1
+        output = e.stdout or ''
+        if isinstance(output, bytes):  # TimeoutExpired keeps the raw bytes
+            output = output.decode('utf-8', 'replace')
+        output += f"\n⏰ Timed out after {options.timeout}s"
+    seconds = time.perf_counter() - started
+    try:
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        report = {}
+    finally:
+        os.unlink(report_path)
+    if options.logs:
+        os.makedirs(options.logs, exist_ok=True)
+        log_name = f"{os.path.basename(repo)}-{action}.log"
+        with open(os.path.join(options.logs, log_name), 'w', encoding='utf-8') as f:
+            f.write(output)
+    outcome = report.get('outcome') or ('timeout' if exit_code == -1 else 'error')
+    return StepResult(action, exit_code == 0, outcome, exit_code, round(seconds, 3),
+                      report.get('git_calls', 0), report.get('git_seconds', 0.0),
+                      report.get('attempts', []),
+                      output.rstrip('\n').split('\n')[-OUTPUT_TAIL:])
+
+
+def run_repo(repo, limiter, options):
+    """Run the action's pipeline in one repository, holding its host's slot"""
+    host = remote_host(repo)
+    result = RepoResult(repo, host)
+    queued = time.perf_counter()
+    with limiter(host):
+        started = time.perf_counter()
+        result.waited = round(started - queued, 3)
+        for action in ACTIONS[options.action]:
+            step = run_step(repo, action, options)
+            result.steps.append(step)
+            if not step.success:
+                break
+        result.seconds = round(time.perf_counter() - started, 3)
+    result.success = all(step.success for step in result.steps)
+    return result
+
+
+def print_summary(results, elapsed):
+    """Aggregated table of every repository's outcome"""
+    width = max([len(os.path.basename(result.path)) for result in results] + [10])
+    print(f"\n{'Repository':<{width}}  {'Host':<16}  {'Result':<36}  {'Time':>7}  {'Git':>4}")
+    print("-" * (width + 71))
+    for result in results:
+        outcome = ', '.join(f"{step.action}:{step.outcome}" for step in result.steps)
+        icon = "✅" if result.success else "❌"
+        git_calls = sum(step.git_calls for step in result.steps)
+        print(f"{os.path.basename(result.path):<{width}}  {result.host:<16}  "
+              f"{icon} {outcome[:33]:<33}  {result.seconds:6.1f}s  {git_calls:>4}")
+    succeeded = sum(result.success for result in results)
+    busy = sum(result.seconds for result in results)
+    print(f"\n🚢 {succeeded}/{len(results)} repositories succeeded in {elapsed:.1f}s "
+          f"({busy:.1f}s of work, {busy / elapsed if elapsed else 0:.1f}x parallel)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync or update many repositories in parallel')
+    parser.add_argument('repos', nargs='*', help='repository paths or glob patterns')
+    parser.add_argument('--from', dest='list_file', metavar='FILE',
+                        help='file with one repository path or glob per line')
+    parser.add_argument('--action', choices=sorted(ACTIONS), default='sync',
+                        help='sync (fetch + pull), update (commit + push) or both (default: sync)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='repositories processed at once (default: 8)')
+    parser.add_argument('--per-host', type=int, default=4,
+                        help='repositories talking to the same remote host at once (default: 4)')
+    parser.add_argument('--on-local-changes', choices=['abort', 'continue'], default='abort',
+                        help='sync policy for uncommitted changes instead of prompting: abort, '
+                             'or back them up and continue (default: abort)')
+    parser.add_argument('--message', help='commit message for update (default: timestamped)')
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help='retry deadline passed to each step (default: the scripts\' own)')
+    parser.add_argument('--timeout', type=float, help='seconds before a step is killed')
+    parser.add_argument('--logs', metavar='DIR', help='write each step\'s full output to DIR')
+    parser.add_argument('--json', metavar='PATH', help='write a JSON report with per-repo timings')
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.per_host < 1:
+        parser.error('--workers and --per-host must be at least 1')
+    repos = expand_repos(args.repos, args.list_file)
+    if not repos:
+        parser.error('no git repositories given')
+
+    print(f"🚢 Fleet {args.action}: {len(repos)} repositories, {args.workers} worker(s), "
+          f"{args.per_host} per host")
+    started_at = datetime.now().isoformat(timespec='seconds')
+    started = time.perf_counter()
+    limiter = HostLimiter(args.per_host)
+    results = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_repo, repo, limiter, args) for repo in repos]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            icon = "✅" if result.success else "❌"
+            print(f"{icon} {result.path} ({result.seconds:.1f}s)")
+    elapsed = time.perf_counter() - started
+
+    results.sort(key=lambda result: repos.index(result.path))
+    print_summary(results, elapsed)
+    if args.json:
+        report = {
+            'started': started_at,
+            'seconds': round(elapsed, 3),
+            'action': args.action,
+            'workers': args.workers,
+            'per_host': args.per_host,
+            'on_local_changes': args.on_local_changes,
+            'succeeded': sum(result.success for result in results),
+            'failed': sum(not result.success for result in results),
+            'repos': [asdict(result) for result in results],
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📒 Report: {args.json}")
+    sys.exit(0 if all(result.success for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Shared git command runner for sync.py, update.py and debug_git.py
+Runs git with argv lists (no shell, so messages and branch names are passed
+through untouched), records the wall time of every call, and keeps a
+long-lived `git cat-file --batch` process for commit lookups. RetryPolicy
+decides how failed network operations are retried; remote_branches() lists
+a remote's branches once per run.
+"""
+
+import json
+import random
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+
+# Error categories from analyze_pull_error()/analyze_push_error() worth retrying;
+# everything else (auth, missing branch, conflicts, unrecognised errors such as a
+# bad refspec or a rejecting hook) fails fast
+RETRYABLE_ERRORS = frozenset({'network'})
+# Returned by GitRunner.run() when a call exceeds its timeout
+TIMEOUT_RETURNCODE = 124
+# Lowercased git/ssh/curl messages for transient transport failures
+NETWORK_ERROR_HINTS = (
+    'could not resolve host', 'temporary failure in name resolution', 'connection timed out',
+    'connection refused', 'connection reset', 'network is unreachable', 'operation timed out',
+    'failed to connect', "couldn't connect to server",
+    'timed out after', 'early eof', 'the remote end hung up', 'rpc failed',
+    'unable to access', 'gnutls', 'ssl certificate problem', 'ssl_connect', 'ssl_read',
+    'ssl_write', 'ssl_error_syscall', 'returned error: 5',
+)
+# Credential failures; checked before NETWORK_ERROR_HINTS since both can appear together
+AUTH_ERROR_HINTS = (
+    'permission denied', 'authentication failed', 'could not read username',
+    'invalid username or password', 'returned error: 403',
+)
+
+
+def is_auth_error(error_lower):
+    return any(hint in error_lower for hint in AUTH_ERROR_HINTS)
+
+
+def is_network_error(error_lower):
+    return any(hint in error_lower for hint in NETWORK_ERROR_HINTS)
+
+
+@dataclass(frozen=True)
+class CommandTiming:
+    argv: tuple
+    seconds: float
+    returncode: int
+
+
+@dataclass(frozen=True)
+class Commit:
+    oid: str
+    parents: tuple
+    message: str
+
+    @property
+    def subject(self):
+        return self.message.split('\n', 1)[0]
+
+    def oneline(self):
+        """The commit as `git log --oneline` prints it"""
+        return f'{self.oid[:7]} {self.subject}'
+
+
+@dataclass(frozen=True)
+class RemoteBranches:
+    """The branches a remote has and the one its HEAD points at"""
+    remote: str
+    heads: frozenset
+    default: str = None
+    source: str = 'ls-remote'  # or 'fetched refs'
+
+    def pick(self, *preferred):
+        """First of `preferred` the remote has, else its default branch (None if empty)"""
+        for branch in preferred:
+            if branch and branch in self.heads:
+                return branch
+        if self.default in self.heads:
+            return self.default
+        return min(self.heads) if self.heads else None
+
+
+class CatFile:
+    """One `git cat-file --batch` process answering object lookups over a pipe.
+
+    Started on first use; each lookup costs a pipe round trip instead of a
+    git process. Lookups are serialized, so one instance can be shared
+    between threads.
+    """
+
+    def __init__(self, cwd=None):
+        self.cwd = cwd
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=self.cwd,
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL)
+
+    def read(self, rev):
+        """(oid, type, bytes) for `rev`, or None when it does not name an object"""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            process = self._process
+            try:
+                process.stdin.write(rev.encode('utf-8') + b'\n')
+                process.stdin.flush()
+                header = process.stdout.readline().decode('utf-8', 'replace').split()
+                if len(header) != 3:  # `<rev> missing` / `<rev> ambiguous`
+                    return None
+                oid, kind, size = header
+                data = process.stdout.read(int(size))
+                process.stdout.read(1)  # trailing newline
+            except (OSError, ValueError):
+                self.close()
+                return None
+        return oid, kind, data
+
+    def commit(self, rev):
+        """The Commit `rev` points at, or None"""
+        found = self.read(rev)
+        if not found or found[1] != 'commit':
+            return None
+        oid, _, data = found
+        headers, _, message = data.decode('utf-8', 'replace').partition('\n\n')
+        parents = tuple(line.split()[1] for line in headers.split('\n')
+                        if line.startswith('parent '))
+        return Commit(oid, parents, message.rstrip('\n'))
+
+    def close(self):
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+
+class GitRunner:
+    """Runs `git <args>` in `cwd` without a shell and times every call"""
+
+    def __init__(self, cwd=None):
+        self.cwd = cwd
+        self.timings = []
+        self.objects = CatFile(cwd)
+        self._remotes = {}
+
+    def run(self, *args, capture_output=False, encoding='utf-8', timeout=None):
+        """(returncode, stdout, stderr) of `git *args`.
+
+        Captured output is stripped text, or raw bytes with encoding=None.
+        Without capture_output git writes straight to the terminal. A call
+        running longer than `timeout` seconds is killed and returns
+        TIMEOUT_RETURNCODE.
+        """
+        argv = ('git',) + tuple(args)
+        started = time.perf_counter()
+        try:
+            if capture_output:
+                result = subprocess.run(argv, capture_output=True, cwd=self.cwd, timeout=timeout,
+                                        **({'text': True, 'encoding': encoding,
+                                            'errors': 'replace'} if encoding else {}))
+                stdout, stderr = result.stdout, result.stderr
+                if encoding:
+                    stdout, stderr = stdout.strip(), stderr.strip()
+            else:
+                result = subprocess.run(argv, cwd=self.cwd, timeout=timeout)
+                stdout = stderr = ""
+            returncode = result.returncode
+        except subprocess.TimeoutExpired:
+            returncode, stdout = TIMEOUT_RETURNCODE, ""
+            stderr = f"git {args[0]} timed out after {timeout:.1f}s"
+        except OSError as e:
+            print(f"❌ Command failed: {e}")
+            returncode, stdout, stderr = 1, "", str(e)
+        self.timings.append(CommandTiming(argv, time.perf_counter() - started, returncode))
+        return returncode, stdout, stderr
+
+    def divergence(self, base, tip):
+        """(commits only in `tip`, commits only in `base`), newest first, from one rev-list"""
+        code, stdout, stderr = self.run("rev-list", "--left-right", f"{base}...{tip}",
+                                        capture_output=True)
+        if code != 0:
+            return [], []
+        lines = stdout.split('\n') if stdout else []
+        return ([line[1:] for line in lines if line.startswith('>')],
+                [line[1:] for line in lines if line.startswith('<')])
+
+    def remote_branches(self, remote='origin', fetched=False, timeout=None):
+        """RemoteBranches for `remote`, resolved once and cached for the run.
+
+        With fetched=True the remote-tracking refs a fetch just updated are
+        read locally. Otherwise, or when those do not name the default branch,
+        one `git ls-remote --symref` round trip answers. None if the remote
+        cannot be listed.
+        """
+        if remote in self._remotes:
+            return self._remotes[remote]
+        branches = self._tracking_branches(remote) if fetched else None
+        if branches is None or branches.default is None:
+            branches = self._listed_branches(remote, timeout) or branches
+        if branches is not None:
+            self._remotes[remote] = branches
+        return branches
+
+    def _tracking_branches(self, remote):
+        prefix = f"refs/remotes/{remote}/"
+        code, stdout, stderr = self.run("for-each-ref", "--format=%(refname)%09%(symref)", prefix,
+                                        capture_output=True)
+        if code != 0 or not stdout:
+            return None
+        heads, default = set(), None
+        for line in stdout.split('\n'):
+            refname, _, symref = line.partition('\t')
+            if refname == prefix + 'HEAD':
+                default = symref[len(prefix):] if symref.startswith(prefix) else None
+            else:
+                heads.add(refname[len(prefix):])
+        return RemoteBranches(remote, frozenset(heads), default, 'fetched refs')
+
+    def _listed_branches(self, remote, timeout):
+        code, stdout, stderr = self.run("ls-remote", "--symref", remote, "HEAD", "refs/heads/*",
+                                        capture_output=True, timeout=timeout)
+        if code != 0:
+            return None
+        heads, default = set(), None
+        for line in stdout.split('\n'):
+            target, _, name = line.partition('\t')
+            if target.startswith('ref: refs/heads/') and name == 'HEAD':
+                default = target[len('ref: refs/heads/'):]
+            elif name.startswith('refs/heads/'):
+                heads.add(name[len('refs/heads/'):])
+        return RemoteBranches(remote, frozenset(heads), default)
+
+    def oneline(self, rev):
+        """`<short oid> <subject>` read through the cat-file process"""
+        started = time.perf_counter()
+        commit = self.objects.commit(rev)
+        self.timings.append(CommandTiming(('git', 'cat-file', '--batch', rev),
+                                          time.perf_counter() - started, 0 if commit else 1))
+        return commit.oneline() if commit else rev[:7]
+
+    def summary(self):
+        """One line with the number of git calls, their total time and the slowest"""
+        if not self.timings:
+            return "⏱️  No git commands run"
+        total = sum(timing.seconds for timing in self.timings)
+        slowest = max(self.timings, key=lambda timing: timing.seconds)
+        return (f"⏱️  {len(self.timings)} git call(s) in {total:.2f}s "
+                f"(slowest: {' '.join(slowest.argv)} {slowest.seconds:.2f}s)")
+
+    def report(self):
+        """The recorded timings as JSON-ready data"""
+        return {
+            'git_calls': len(self.timings),
+            'git_seconds': round(sum(timing.seconds for timing in self.timings), 4),
+            'commands': [{'argv': list(timing.argv), 'seconds': round(timing.seconds, 4),
+                          'returncode': timing.returncode} for timing in self.timings],
+        }
+
+    def close(self):
+        self.objects.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@dataclass
+class RetryPolicy:
+    """How often, and how long apart, failed network operations are retried.
+
+    Only RETRYABLE_ERRORS categories are retried, with capped, jittered
+    exponential backoff. `deadline` bounds the whole run (every attempt and
+    every alternative branch); 0 disables it. Each attempt is recorded in
+    `attempts` for the --report output.
+    """
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 16.0
+    deadline: float = 120.0
+    started: float = field(default_factory=time.monotonic)
+    attempts: list = field(default_factory=list)
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(args.max_attempts, args.backoff_base, args.backoff_max, args.deadline)
+
+    def remaining(self):
+        """Seconds left before the deadline (None without one)"""
+        if self.deadline <= 0:
+            return None
+        return max(0.0, self.deadline - (time.monotonic() - self.started))
+
+    def expired(self):
+        return self.remaining() == 0
+
+    def backoff(self, attempt):
+        """Delay after failed attempt `attempt`: 2^n growth, capped, jittered over its upper half"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def next_delay(self, attempt, category):
+        """Seconds to wait before retrying, or None to give up"""
+        if category not in RETRYABLE_ERRORS or attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        remaining = self.remaining()
+        return None if remaining is not None and delay >= remaining else delay
+
+    def give_up_reason(self, attempt, category):
+        if category not in RETRYABLE_ERRORS:
+            return category
+        return 'max_attempts_exceeded' if attempt >= self.max_attempts else 'deadline_exceeded'
+
+    def record(self, operation, branch, attempt, seconds, category):
+        """Note one attempt's timing and print it"""
+        self.attempts.append({'operation': operation, 'branch': branch, 'attempt': attempt,
+                              'seconds': round(seconds, 3), 'result': category})
+        print(f"⏱️  {operation} attempt #{attempt} took {seconds:.2f}s ({category})")
+
+
+def add_retry_arguments(parser):
+    """The RetryPolicy options shared by sync.py and update.py"""
+    defaults = RetryPolicy()
+    parser.add_argument('--max-attempts', type=int, default=defaults.max_attempts,
+                        help=f'attempts per branch for network errors (default: {defaults.max_attempts})')
+    parser.add_argument('--backoff-base', type=float, default=defaults.base_delay, metavar='SECONDS',
+                        help=f'first retry delay, doubled per attempt (default: {defaults.base_delay})')
+    parser.add_argument('--backoff-max', type=float, default=defaults.max_delay, metavar='SECONDS',
+                        help=f'longest retry delay (default: {defaults.max_delay})')
+    parser.add_argument('--deadline', type=float, default=defaults.deadline, metavar='SECONDS',
+                        help=f'give up after this long in total, 0 = never (default: {defaults.deadline:g})')
+
+
+def write_report(path, success, outcome, git, retry=None):
+    """JSON result of one sync.py/update.py run, read by fleet.py"""
+    report = {'success': success, 'outcome': outcome, **git.report()}
+    if retry is not None:
+        report['attempts'] = retry.attempts
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
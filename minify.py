@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Minifiers and critical CSS extraction for the Portfolio Website build
+Conservative on purpose: strings, template literals and regular expressions
+are copied verbatim, and line breaks that could end a JavaScript statement
+are kept. rjsmin/rcssmin are used instead when installed.
+Usage: python minify.py path/to/file.{js,css}
+"""
+
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+IDENTIFIER_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$\\')
+# A `/` after one of these (or at the start) begins a regular expression literal
+REGEX_PRECEDERS = frozenset('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = frozenset(['return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                            'void', 'throw', 'instanceof', 'yield', 'await'])
+# A line break after one of these, or before one of the next, cannot end a statement
+CONTINUES_AFTER = frozenset('{([,;:=&|?+-*%<>!~^.')
+CONTINUES_BEFORE = frozenset('}),;].?:=&|')
+# Bump when the builtin minifiers' output changes so cached builds are redone
+BUILTIN_VERSION = '2'
+# `1 .toString()` must keep its space: `1.` would read as a decimal point
+INTEGER_LITERAL = re.compile(r'[0-9][0-9_]*')
+
+
+def minifier_name():
+    """Identifies the minifiers in use, so a build cache notices a change"""
+    builtin = f'builtin-{BUILTIN_VERSION}'
+    return f"js:{'rjsmin' if rjsmin else builtin},css:{'rcssmin' if rcssmin else builtin}"
+
+
+def needs_space(before, after):
+    """Whether dropping the whitespace between two characters would merge tokens"""
+    if before in IDENTIFIER_CHARS and after in IDENTIFIER_CHARS:
+        return True
+    return before + after in ('++', '--', '//', '/*')
+
+
+def minify_js(source):
+    """JavaScript without comments and redundant whitespace"""
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    out = []
+    last = ''           # last significant character written
+    last_two = ''       # ...and the one before it, to spot postfix ++/--
+    last_word = ''      # last identifier written, to tell `return /re/` from division
+    after_literal = False  # last token was a regex, so `/re/ in` must keep its space
+    after_integer = False  # last token was an integer literal, so `1 .x` keeps its space
+    pending = None      # whitespace seen since `last`: ' ' or '\n'
+    templates = []      # brace depth inside each open `${ ... }`
+    i, n = 0, len(source)
+
+    def emit(text):
+        nonlocal last, last_two, pending, after_literal, after_integer
+        if pending is not None and last:
+            first = text[0]
+            continues = (last in CONTINUES_AFTER and last_two not in ('++', '--')
+                         or first in CONTINUES_BEFORE)
+            if pending == '\n' and (after_literal or not continues):
+                out.append('\n')
+            elif needs_space('a' if after_literal else last, first) or after_integer and first == '.':
+                out.append(' ')
+        out.append(text)
+        last_two = (last + text)[-2:]
+        last = text[-1]
+        pending = None
+        after_literal = False
+        after_integer = False
+
+    def copy_quoted(start, quote):
+        j = start + 1
+        while j < n and source[j] != quote:
+            j += 2 if source[j] == '\\' else 1
+        return source[start:j + 1], j + 1
+
+    def copy_template(start):
+        """Template text from `start` up to and including '`' or '${'"""
+        j = start
+        while j < n:
+            char = source[j]
+            if char == '\\':
+                j += 2
+            elif char == '`':
+                return source[start:j + 1], j + 1, False
+            elif source.startswith('${', j):
+                return source[start:j + 2], j + 2, True
+            else:
+                j += 1
+        return source[start:], n, False
+
+    while i < n:
+        char = source[i]
+        if char in ' \t\r\n\f\v':
+            j = i
+            while j < n and source[j] in ' \t\r\n\f\v':
+                j += 1
+            pending = '\n' if '\n' in source[i:j] or pending == '\n' else ' '
+            i = j
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            comment_pending = '\n' if '\n' in source[i:end] else ' '
+            pending = '\n' if pending == '\n' else comment_pending
+            i = end
+        elif char in '"\'':
+            text, i = copy_quoted(i, char)
+            emit(text)
+        elif char == '`':
+            text, i, opened = copy_template(i + 1)
+            emit('`' + text)
+            if opened:
+                templates.append(0)
+        elif char == '}' and templates and templates[-1] == 0:
+            templates.pop()
+            text, i, opened = copy_template(i + 1)
+            # Template text is verbatim: whitespace before the `}` goes with the expression
+            pending = None
+            emit('}' + text)
+            if opened:
+                templates.append(0)
+        elif char == '/' and (not last or last in REGEX_PRECEDERS or last_word in REGEX_KEYWORDS):
+            j = i + 1
+            in_class = False
+            while j < n and (in_class or source[j] != '/') and source[j] != '\n':
+                if source[j] == '\\':
+                    j += 1
+                elif source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                j += 1
+            j += 1
+            while j < n and source[j] in IDENTIFIER_CHARS:
+                j += 1  # flags
+            emit(source[i:j])
+            after_literal = True
+            last_word = ''
+            i = j
+        elif char in IDENTIFIER_CHARS:
+            j = i
+            while j < n and source[j] in IDENTIFIER_CHARS:
+                j += 1
+            word = source[i:j]
+            # Digits after a `.` are a fraction (1.5), not an integer literal
+            integer = last != '.' and INTEGER_LITERAL.fullmatch(word) is not None
+            emit(word)
+            after_integer = integer
+            last_word = word
+            i = j
+        else:
+            if templates:
+                if char == '{':
+                    templates[-1] += 1
+                elif char == '}':
+                    templates[-1] -= 1
+            emit(char)
+            last_word = ''
+            i += 1
+    return ''.join(out).strip() + '\n'
+
+
+def strip_css_comments(source):
+    """CSS without /* comments */, leaving strings alone"""
+    out = []
+    i, n = 0, len(source)
+    while i < n:
+        char = source[i]
+        if char in '"\'':
+            j = i + 1
+            while j < n and source[j] != char:
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j + 1])
+            i = j + 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            out.append(' ')
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out)
+
+
+# At-rules whose blocks hold rules rather than declarations
+GROUPING_AT_RULES = ('@media', '@supports', '@document', '@layer', '@container', '@keyframes',
+                     '@-webkit-keyframes', '@-moz-keyframes', '@scope')
+
+
+def split_css(source):
+    """Top-level items of a stylesheet: (prelude, body) with body None for `@import ...;`"""
+    source = strip_css_comments(source)
+    items = []
+    i, n = 0, len(source)
+    start = 0
+    depth = 0
+    prelude_end = None
+    while i < n:
+        char = source[i]
+        if char in '"\'':
+            j = i + 1
+            while j < n and source[j] != char:
+                j += 2 if source[j] == '\\' else 1
+            i = j + 1
+            continue
+        if char == '{':
+            if depth == 0:
+                prelude_end = i
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                items.append((source[start:prelude_end].strip(), source[prelude_end + 1:i]))
+                start = i + 1
+            depth = max(depth, 0)
+        elif char == ';' and depth == 0:
+            statement = source[start:i].strip()
+            if statement:
+                items.append((statement, None))
+            start = i + 1
+        i += 1
+    return items
+
+
+def is_grouping(prelude):
+    return prelude.lower().startswith(GROUPING_AT_RULES)
+
+
+def is_keyframes(prelude):
+    return re.match(r'@(?:-\w+-)?keyframes\b', prelude, re.I) is not None
+
+
+CSS_STRING = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+
+
+def outside_strings(text, transform):
+    """Apply `transform` to the parts of `text` that are not quoted strings"""
+    parts = CSS_STRING.split(text)
+    parts[::2] = [transform(part) for part in parts[::2]]
+    return ''.join(parts)
+
+
+def squeeze_declarations(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([;:,{}>])\s*', r'\1', text)
+    return re.sub(r'\s*!\s*important', '!important', text)
+
+
+def squeeze_prelude(text):
+    text = re.sub(r'\s+', ' ', text)
+    # Keep `a :hover` (descendant) apart from `a:hover`; commas and `>`/`~` are safe
+    text = re.sub(r'\s*([,>~])\s*', r'\1', text)
+    return re.sub(r'\(\s*', '(', re.sub(r'\s*\)', ')', re.sub(r':\s+', ':', text)))
+
+
+def minify_declarations(body):
+    return outside_strings(body, squeeze_declarations).strip().rstrip(';')
+
+
+def minify_prelude(prelude):
+    return outside_strings(prelude, squeeze_prelude).strip()
+
+
+def serialize_css(items):
+    out = []
+    for prelude, body in items:
+        if body is None:
+            out.append(minify_prelude(prelude) + ';')
+        elif is_grouping(prelude):
+            out.append(minify_prelude(prelude) + '{' + serialize_css(split_css(body)) + '}')
+        else:
+            out.append(minify_prelude(prelude) + '{' + minify_declarations(body) + '}')
+    return ''.join(out)
+
+
+def minify_css(source):
+    """CSS without comments and redundant whitespace"""
+    if rcssmin is not None:
+        return rcssmin.cssmin(source) + '\n'
+    return serialize_css(split_css(source)) + '\n'
+
+
+class PageInventory(HTMLParser):
+    """Tags, classes and ids of the elements up to the end of the first <section>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags = {'html', 'body'}
+        self.classes = set()
+        self.ids = set()
+        self._section_depth = 0
+        self._done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        self.tags.add(tag)
+        for name, value in attrs:
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+        if tag == 'section':
+            self._section_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == 'section' and self._section_depth:
+            self._section_depth -= 1
+            if not self._section_depth:
+                self._done = True
+
+
+SIMPLE_SELECTOR = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*|\*)')
+SELECTOR_NOISE = re.compile(r'::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?|\[[^\]]*\]')
+
+
+def selector_matches(selector, inventory):
+    """Whether every compound part of `selector` names elements present on the page"""
+    selector = SELECTOR_NOISE.sub('', selector)
+    for compound in re.split(r'\s*[\s>+~]\s*', selector.strip()):
+        for prefix, name in SIMPLE_SELECTOR.findall(compound):
+            if prefix == '.' and name not in inventory.classes:
+                return False
+            if prefix == '#' and name not in inventory.ids:
+                return False
+            if not prefix and name != '*' and name.lower() not in inventory.tags:
+                return False
+    return True
+
+
+def keyframe_names(items):
+    names = set()
+    for prelude, body in items:
+        if body is None:
+            continue
+        if is_keyframes(prelude):
+            continue
+        if is_grouping(prelude):
+            names |= keyframe_names(split_css(body))
+        else:
+            for match in re.finditer(r'animation(?:-name)?\s*:([^;]*)', body):
+                names.update(re.findall(r'-?[_a-zA-Z][\w-]*', match.group(1)))
+    return names
+
+
+def critical_rules(items, inventory):
+    kept = []
+    for prelude, body in items:
+        lowered = prelude.lower()
+        if body is None or lowered.startswith('@font-face'):
+            kept.append((prelude, body))
+        elif is_keyframes(prelude):
+            kept.append((prelude, body))  # filtered by name below
+        elif is_grouping(prelude):
+            if lowered.startswith('@media') and re.search(r'\bprint\b', lowered) \
+                    and not re.search(r'\bscreen\b|\ball\b', lowered):
+                continue
+            children = critical_rules(split_css(body), inventory)
+            if children:
+                kept.append((prelude, serialize_css(children)))
+        elif lowered.startswith('@'):
+            continue
+        elif any(selector_matches(selector, inventory) for selector in prelude.split(',')):
+            kept.append((prelude, body))
+    return kept
+
+
+def critical_css(source, html, extra_classes=()):
+    """Minified rules of `source` that apply to the top of `html` (nav and first section).
+
+    `extra_classes` are classes scripts add before first paint, such as the
+    active theme's body class.
+    """
+    inventory = PageInventory()
+    inventory.feed(html)
+    inventory.classes.update(extra_classes)
+    rules = critical_rules(split_css(source), inventory)
+    used = keyframe_names(rules)
+    rules = [(prelude, body) for prelude, body in rules
+             if not is_keyframes(prelude) or prelude.split(None, 1)[-1].strip() in used]
+    return serialize_css(rules)
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:]:
+        path = Path(name)
+        text = path.read_text(encoding='utf-8')
+        minified = minify_js(text) if path.suffix == '.js' else minify_css(text)
+        print(f'✂️  {path}: {len(text.encode()):,} → {len(minified.encode()):,} bytes')
@@ -420,6 +420,36 @@ const portfolioConfig = {
             linkedin: "https://www.linkedin.com/in/lloyd-agonia-573300308/",
             facebook: "https://www.facebook.com/agonialloyd/"
         }
+    },
+
+    // Development Server Settings (used by server.py and server.js)
+    server: {
+        defaultPort: 3000,
+        cacheControl: "no-cache",
+        threads: 0,             // server.py worker threads (0 = single-threaded)
+        backlog: 5,             // Pending connection queue size
+        shutdownTimeout: 10,    // Seconds to drain in-flight requests on exit
+        engine: "stdlib",       // Python backend: "stdlib" or "asyncio"
+        keepaliveTimeout: 15,   // Idle keep-alive seconds
+        maxKeepaliveRequests: 100, // Requests per connection before it is closed (0 = unlimited)
+        workers: 0,             // Pre-forked server.py processes (0 = single process)
+        reusePort: false,       // Workers bind their own SO_REUSEPORT sockets
+        cacheSize: 33554432,    // In-memory file cache budget in bytes (0 = off)
+        cacheMaxFile: 262144,   // Largest file kept in the in-memory cache
+        compression: true,      // gzip/brotli for text assets (see build.py compress)
+        transfer: "sendfile",   // File bodies: "sendfile" (zero-copy), "mmap" or "copy"
+        openBrowser: true,      // Open the site in a browser when server.py starts
+        root: ".",              // Directory to serve ("dist" after build.py fingerprint)
+        prerender: true,        // Serve index.prerendered.html (build.py prerender) when fresh
+        watch: false,           // Live reload: push file changes to open pages (--watch)
+        metrics: false,         // Prometheus-style request metrics at /__metrics (per process:
+                                // with workers > 1 each scrape reports one worker's counters)
+        preloadLinks: false,    // Link: rel=preload headers for page stylesheets and scripts
+        accessLog: "",          // Access log file ("" = coloured console lines, "-" = stdout)
+        accessLogFormat: "json", // "json", "combined" or "common"
+        accessLogMaxBytes: 10485760, // Rotate when the log would exceed this size (0 = never)
+        accessLogBackups: 5,    // Rotated logs to keep
+        accessLogRotateSeconds: 0 // Also rotate every N seconds (0 = never)
     }
 };
 
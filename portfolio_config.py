@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Reads portfolio-config.js from Python
+Parses the `portfolioConfig` object literal into plain dicts and lists and
+keeps a snapshot keyed by the file's hash (in $XDG_CACHE_HOME/portfolio,
+outside the served directory), so later loads skip the parser.
+Usage: python portfolio_config.py [path/to/portfolio-config.js]
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+CONFIG_FILE = 'portfolio-config.js'
+# Snapshots live in the user cache directory, never next to the served files:
+# marshal for fast loads, JSON for other tools
+SNAPSHOT_DIR = 'portfolio'
+SNAPSHOT_BINARY = 'config-{}.marshal'
+SNAPSHOT_JSON = 'config-{}.json'
+SNAPSHOT_VERSION = 2  # bump when the parser's output changes
+CONFIG_ASSIGNMENT = re.compile(r'\bportfolioConfig\s*=\s*(?=\{)')
+
+IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+NUMBER = re.compile(r'-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+KEYWORDS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+HEX_DIGITS = re.compile(r'[0-9a-fA-F]+')
+LINE_TERMINATORS = ('\n', '\r', '\u2028', '\u2029')
+
+
+class ConfigSyntaxError(ValueError):
+    """portfolio-config.js uses syntax the parser does not understand"""
+
+    def __init__(self, message, text, pos):
+        line = text.count('\n', 0, pos) + 1
+        column = pos - text.rfind('\n', 0, pos)
+        super().__init__(f'{message} at line {line}, column {column}')
+        self.line, self.column = line, column
+
+
+class ObjectLiteralParser:
+    """Recursive-descent parser for JavaScript object/array literals.
+
+    Handles what a hand-edited config file contains: unquoted keys,
+    single/double/backtick strings, numbers, true/false/null, comments and
+    trailing commas. Anything else (expressions, `${}` interpolation) is
+    rejected with the line and column.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def error(self, message):
+        raise ConfigSyntaxError(message, self.text, self.pos)
+
+    def skip_space(self):
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char.isspace():
+                self.pos += 1
+            elif text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end < 0 else end + 1
+            elif text.startswith('/*', self.pos):
+                end = text.find('*/', self.pos + 2)
+                if end < 0:
+                    self.error('Unterminated comment')
+                self.pos = end + 2
+            else:
+                break
+
+    def peek(self):
+        self.skip_space()
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            self.error(f'Expected {char!r}')
+        self.pos += 1
+
+    def parse_value(self):
+        char = self.peek()
+        if char == '{':
+            return self.parse_object()
+        if char == '[':
+            return self.parse_array()
+        if char in '"\'`':
+            return self.parse_string()
+        match = NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            literal = match.group()
+            if literal.lstrip('-')[:2].lower() == '0x':
+                return int(literal, 16)
+            number = float(literal)
+            return int(number) if number.is_integer() and not re.search(r'[.eE]', literal) else number
+        match = IDENTIFIER.match(self.text, self.pos)
+        if match and match.group() in KEYWORDS:
+            self.pos = match.end()
+            return KEYWORDS[match.group()]
+        self.error('Expected a value')
+
+    def parse_object(self):
+        self.expect('{')
+        result = {}
+        while self.peek() != '}':
+            char = self.peek()
+            if char in '"\'`':
+                key = self.parse_string()
+            else:
+                match = IDENTIFIER.match(self.text, self.pos) or NUMBER.match(self.text, self.pos)
+                if not match:
+                    self.error('Expected a property name')
+                key = match.group()
+                self.pos = match.end()
+            self.expect(':')
+            result[key] = self.parse_value()
+            if self.peek() != ',':
+                break
+            self.pos += 1
+        self.expect('}')
+        return result
+
+    def parse_array(self):
+        self.expect('[')
+        result = []
+        while self.peek() != ']':
+            result.append(self.parse_value())
+            if self.peek() != ',':
+                break
+            self.pos += 1
+        self.expect(']')
+        return result
+
+    def parse_string(self):
+        text = self.text
+        quote = text[self.pos]
+        self.pos += 1
+        chunks = []
+        while True:
+            if self.pos >= len(text):
+                self.error('Unterminated string')
+            char = text[self.pos]
+            if char == quote:
+                self.pos += 1
+                return ''.join(chunks)
+            if char == '\n' and quote != '`':
+                self.error('Unterminated string')
+            if quote == '`' and text.startswith('${', self.pos):
+                self.error('Template interpolation is not supported')
+            if char != '\\':
+                chunks.append(char)
+                self.pos += 1
+                continue
+            escape = text[self.pos + 1:self.pos + 2]
+            self.pos += 2
+            if escape in ESCAPES:
+                chunks.append(ESCAPES[escape])
+            elif escape in ('x', 'u'):
+                code = self.parse_code_point(escape)
+                if 0xDC00 <= code <= 0xDFFF and chunks and '\ud800' <= chunks[-1] <= '\udbff':
+                    # Second half of a surrogate pair such as \uD83D\uDE00
+                    high = ord(chunks.pop()) - 0xD800
+                    code = 0x10000 + (high << 10) + (code - 0xDC00)
+                chunks.append(chr(code))
+            elif escape in LINE_TERMINATORS:
+                # Line continuation; a CRLF counts as one line break
+                if escape == '\r' and text.startswith('\n', self.pos):
+                    self.pos += 1
+            else:
+                chunks.append(escape)
+
+    def parse_code_point(self, escape):
+        """Code point of a \\xHH, \\uHHHH or \\u{H...} escape whose letter was just read"""
+        text = self.text
+        if escape == 'u' and text.startswith('{', self.pos):
+            end = text.find('}', self.pos)
+            digits = text[self.pos + 1:end] if end >= 0 else ''
+            after = end + 1
+        else:
+            size = 2 if escape == 'x' else 4
+            digits = text[self.pos:self.pos + size]
+            after = self.pos + size
+            if len(digits) != size:
+                digits = ''
+        if not HEX_DIGITS.fullmatch(digits) or int(digits, 16) > 0x10FFFF:
+            self.error(f'Invalid \\{escape} escape')
+        self.pos = after
+        return int(digits, 16)
+
+
+def parse_config(text):
+    """The portfolioConfig object from the source of portfolio-config.js"""
+    match = CONFIG_ASSIGNMENT.search(text)
+    if not match:
+        raise ConfigSyntaxError('No `portfolioConfig = {` assignment found', text, 0)
+    parser = ObjectLiteralParser(text)
+    parser.pos = match.end()
+    return parser.parse_value()
+
+
+def config_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def snapshot_dir():
+    """$XDG_CACHE_HOME/portfolio, or ~/.cache/portfolio"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / SNAPSHOT_DIR
+
+
+def snapshot_paths(path):
+    """Snapshot files for the config at `path`, named after its absolute location"""
+    key = hashlib.blake2b(os.fsencode(Path(path).resolve()), digest_size=8).hexdigest()
+    directory = snapshot_dir()
+    return directory / SNAPSHOT_BINARY.format(key), directory / SNAPSHOT_JSON.format(key)
+
+
+def read_snapshot(path, digest):
+    """The cached config for `path` if a snapshot matches `digest`, else None"""
+    binary, readable = snapshot_paths(path)
+    try:
+        version, known_digest, config = marshal.loads(binary.read_bytes())
+        if version == (SNAPSHOT_VERSION, marshal.version) and known_digest == digest:
+            return config
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    try:
+        snapshot = json.loads(readable.read_text(encoding='utf-8'))
+        if snapshot.get('version') == SNAPSHOT_VERSION and snapshot.get('hash') == digest:
+            return snapshot['config']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return None
+
+
+def write_snapshot(path, digest, config):
+    """Atomically write both snapshot forms; an unwritable cache directory just skips them"""
+    binary, readable = snapshot_paths(path)
+    try:
+        binary.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return False
+    outputs = [
+        (binary, marshal.dumps(((SNAPSHOT_VERSION, marshal.version), digest, config))),
+        (readable, json.dumps({'version': SNAPSHOT_VERSION, 'hash': digest,
+                               'source': str(path.resolve()), 'config': config},
+                              ensure_ascii=False).encode('utf-8')),
+    ]
+    for output, data in outputs:
+        tmp = output.with_name(f'{output.name}.{os.getpid()}.tmp')
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, output)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return False
+    return True
+
+
+def load_config(path=None, use_snapshot=True):
+    """The parsed config at `path`, served from the snapshot while the hash matches"""
+    path = Path(path) if path else ROOT / CONFIG_FILE
+    data = path.read_bytes()
+    digest = config_digest(data)
+    if use_snapshot:
+        config = read_snapshot(path, digest)
+        if config is not None:
+            return config
+    config = parse_config(data.decode('utf-8'))
+    if use_snapshot:
+        write_snapshot(path, digest, config)
+    return config
+
+
+def compile_snapshot(path=None):
+    """Reparse the config, rewrite its snapshot and report load times"""
+    path = Path(path) if path else ROOT / CONFIG_FILE
+    started = time.perf_counter()
+    config = load_config(path, use_snapshot=False)
+    parsed = time.perf_counter()
+    write_snapshot(path, config_digest(path.read_bytes()), config)
+    written = time.perf_counter()
+    load_config(path)
+    loaded = time.perf_counter()
+    binary, readable = snapshot_paths(path)
+    print(f'🧩 Compiled {path.name} → {binary.parent}/{binary.name}, {readable.name}')
+    print(f'   parse {(parsed - started) * 1000:.2f} ms, '
+          f'snapshot load {(loaded - written) * 1000:.2f} ms')
+    return config
+
+
+if __name__ == "__main__":
+    compile_snapshot(sys.argv[1] if len(sys.argv) > 1 else None)
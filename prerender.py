@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Prerenders index.html from portfolio-config.js
+Writes index.prerendered.html with the sections script.js would otherwise
+build in the browser already in the markup, and the active theme's critical
+CSS inlined. Used by `python build.py prerender`.
+"""
+
+import datetime
+import html
+import json
+import re
+import textwrap
+from html.parser import HTMLParser
+from pathlib import Path
+
+from minify import critical_css
+from portfolio_config import CONFIG_FILE, load_config
+
+TEMPLATE_FILE = 'index.html'
+PRERENDERED_FILE = 'index.prerendered.html'
+THEME_STYLESHEET = 'themes/{}-theme.css'
+# Bump when the generated markup changes so cached builds are redone
+PRERENDER_VERSION = '3'
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                 'source', 'track', 'wbr'}
+SOCIAL_ICONS = {'github': '🐙', 'linkedin': '💼', 'twitter': '🐦', 'instagram': '📷'}
+REFERENCE_FALLBACK_IMAGE = ('https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d'
+                            '?w=200&h=200&fit=crop&crop=face')
+
+
+class Element:
+    __slots__ = ('tag', 'attrs', 'start', 'start_end', 'end', 'end_end')
+
+    def __init__(self, tag, attrs, start, start_end):
+        self.tag, self.attrs = tag, dict(attrs)
+        self.start, self.start_end = start, start_end
+        self.end = self.end_end = start_end
+
+    def matches(self, selector):
+        if selector.startswith('#'):
+            return self.attrs.get('id') == selector[1:]
+        if selector.startswith('.'):
+            return selector[1:] in (self.attrs.get('class') or '').split()
+        return self.tag == selector
+
+
+class HTMLTemplate(HTMLParser):
+    """An HTML document whose elements can be refilled by simple selector.
+
+    Only `#id`, `.class` and tag selectors are supported and, like
+    querySelector, the first matching element wins. Edits are collected and
+    applied in one pass by `render()`, leaving the rest of the file untouched.
+    """
+
+    def __init__(self, text):
+        super().__init__(convert_charrefs=True)
+        self.text = text
+        self.line_offsets = [0] + [m.end() for m in re.finditer('\n', text)]
+        self.elements = []
+        self._open = []
+        self.edits = {}
+        self.feed(text)
+        self.close()
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_offsets[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        start = self._offset()
+        element = Element(tag, attrs, start, start + len(self.get_starttag_text()))
+        self.elements.append(element)
+        if tag not in VOID_ELEMENTS:
+            self._open.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        start = self._offset()
+        self.elements.append(Element(tag, attrs, start, start + len(self.get_starttag_text())))
+
+    def handle_endtag(self, tag):
+        start = self._offset()
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index].tag == tag:
+                element = self._open[index]
+                element.end = start
+                element.end_end = self.text.index('>', start) + 1
+                del self._open[index:]
+                break
+
+    def find(self, selector):
+        return next((element for element in self.elements if element.matches(selector)), None)
+
+    def set_inner(self, selector, markup, mark=False):
+        """Replace an element's children; `mark` tags it data-prerendered for script.js.
+
+        Multi-line markup is re-indented one level below the element's closing tag.
+        """
+        element = self.find(selector)
+        if element is None:
+            return False
+        if '\n' in markup:
+            line_start = self.text.rfind('\n', 0, element.end) + 1
+            closing_indent = self.text[line_start:element.end]
+            if closing_indent.strip():
+                closing_indent = ''
+            markup = textwrap.indent(textwrap.dedent(markup).strip('\n'), closing_indent + '    ')
+            markup = f'\n{markup}\n{closing_indent}'
+        self.edits[(element.start_end, element.end)] = markup
+        if mark:
+            self.set_attrs(selector, {'data-prerendered': ''})
+        return True
+
+    def set_text(self, selector, text):
+        return self.set_inner(selector, html.escape(text, quote=False))
+
+    def set_attrs(self, selector, attrs):
+        element = self.find(selector)
+        if element is None:
+            return False
+        element.attrs.update(attrs)
+        rendered = ''.join(f' {name}' if value is None or value == '' and name.startswith('data-')
+                           else f' {name}="{html.escape(value)}"'
+                           for name, value in element.attrs.items())
+        self.edits[(element.start, element.start_end)] = f'<{element.tag}{rendered}>'
+        return True
+
+    def render(self):
+        chunks = []
+        position = 0
+        for (start, end), replacement in sorted(self.edits.items()):
+            chunks.append(self.text[position:start])
+            chunks.append(replacement)
+            position = end
+        chunks.append(self.text[position:])
+        return ''.join(chunks)
+
+
+def format_date(value):
+    """Mirror of formatDate() in script.js for ISO dates"""
+    if not value:
+        return ''
+    try:
+        parts = [int(part) for part in str(value).split('-')]
+        date = datetime.date(*(parts + [1, 1])[:3])
+    except (TypeError, ValueError):
+        return 'Invalid Date'
+    return f'{date:%b} {date.day}, {date.year}'
+
+
+def escape(value):
+    """A config value as HTML text or a quoted attribute value"""
+    return html.escape(str(value))
+
+
+def js_string(value):
+    """A config value as a JavaScript string literal inside a quoted attribute"""
+    return html.escape(json.dumps(str(value)))
+
+
+# The render_* functions below mirror the innerHTML templates in script.js, with
+# every config value escaped; the containers they fill are marked data-prerendered,
+# so script.js keeps this markup instead of rebuilding it.
+
+def tech_tags(technologies):
+    return ''.join(f'<span class="tech-tag">{escape(tech)}</span>' for tech in technologies or [])
+
+
+def render_nav_menu(items):
+    return ''.join(f'<li><a href="{escape(item["link"])}" class="nav-link">'
+                   f'{escape(item["name"])}</a></li>' for item in items)
+
+
+def render_nav_logo(config):
+    logo = config.get('personal', {}).get('pageLogo')
+    if logo and (logo.startswith('/') or logo.startswith('http')):
+        return f'<img src="{escape(logo)}" alt="Logo" class="nav-logo-image">'
+    logo = logo or config.get('navigation', {}).get('logo')
+    return html.escape(logo, quote=False) if logo else None
+
+
+def render_technical_skills(categories):
+    return ''.join(f'''
+            <div class="skill-category">
+                <div class="skill-category-header">
+                    <div class="skill-category-icon">{escape(category["icon"])}</div>
+                    <h3 class="skill-category-title">{escape(category["title"])}</h3>
+                </div>
+                <div class="skill-list">
+                    {"".join(f'<div class="skill-item">{escape(skill)}</div>' for skill in category["skills"])}
+                </div>
+            </div>''' for category in categories)
+
+
+def render_services(services):
+    return ''.join(f'''
+                        <div class="service-item">
+                            <div class="service-icon">{escape(service["icon"])}</div>
+                            <div class="service-text">{escape(service["title"])}</div>
+                        </div>''' for service in services)
+
+
+def render_experience(positions):
+    return ''.join(f'''
+                <div class="experience-item">
+                    <div class="experience-header">
+                        <h3 class="experience-position">{escape(position["title"])}</h3>
+                        <div class="experience-company">{escape(position["company"])}</div>
+                        <div class="experience-period">{escape(position["period"])}</div>
+                    </div>
+                    <div class="experience-description">
+                        <p>{escape(position["description"])}</p>
+                    </div>
+                </div>''' for position in positions)
+
+
+def render_projects(config):
+    videos = config.get('videoLinks', {}).get('videos') or []
+    tiktok_videos = [video for video in videos if video.get('platform') == 'tiktok']
+    markup = ''
+    if tiktok_videos:
+        frames = ''.join(f'''
+                                <div class="video-container">
+                                    <iframe class="tiktok-video" src="https://www.tiktok.com/embed/{escape(video["videoId"])}" allowfullscreen="" allow="autoplay"></iframe>
+                                </div>''' for video in tiktok_videos)
+        markup += f'''
+                <div class="project-card gallery-tiktok-phone" style="background: transparent;">
+                    <div class="iphone-container">
+                        <div class="iphone-notch"></div>
+                        <div class="iphone-screen">
+                            <div class="scrollable-videos">{frames}
+                            </div>
+                        </div>
+                        <div class="iphone-buttons"></div>
+                    </div>
+                </div>'''
+    for project in config.get('projects', {}).get('list') or []:
+        markup += f'''
+                <div class="project-card {"featured" if project.get("featured") else ""}">
+                    <div class="project-image">
+                        <img src="{escape(project["image"])}" alt="{escape(project["name"])}">
+                        <div class="project-overlay">
+                            <a href="{escape(project["link"])}" class="project-link" target="_blank">View Project</a>
+                        </div>
+                    </div>
+                    <div class="project-content">
+                        <div class="project-header">
+                            <h3 class="project-name">{escape(project["name"])}</h3>
+                            <div class="project-date">{format_date(project.get("date"))}</div>
+                        </div>
+                        <p class="project-description">{escape(project["description"])}</p>
+                        <div class="project-technologies">
+                            {tech_tags(project.get("technologies"))}
+                        </div>
+                    </div>
+                </div>'''
+    return markup
+
+
+def render_youtube_videos(videos):
+    youtube_videos = [video for video in videos if video.get('platform') == 'youtube']
+    return ''.join(render_youtube_video(index, video) for index, video in enumerate(youtube_videos))
+
+
+def render_youtube_video(index, video):
+    video_id, title = escape(video["videoId"]), escape(video["title"])
+    modal_args = ', '.join(js_string(video[key]) for key in ('title', 'description', 'videoId'))
+    return f'''
+                <div class="youtube-video-card">
+                    <div class="video-container">
+                        <iframe
+                            id="youtube-tile-{index}"
+                            class="video-iframe"
+                            src="https://www.youtube.com/embed/{video_id}?autoplay=1&mute=1&controls=0&loop=1&playlist={video_id}&modestbranding=1"
+                            title="{title}"
+                            frameborder="0"
+                            allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
+                            allowfullscreen>
+                        </iframe>
+                        <div class="video-overlay" onclick="openYouTubeModal({modal_args})">
+                            <button class="video-play-btn">
+                                <span class="play-icon">▶</span>
+                                <span class="platform-badge">Watch Full Video</span>
+                            </button>
+                        </div>
+                    </div>
+                    <div class="youtube-video-content">
+                        <h3 class="youtube-video-title">{title}</h3>
+                        <p class="youtube-video-description">{escape(video["description"])}</p>
+                    </div>
+                </div>'''
+
+
+def render_references(references):
+    return ''.join(f'''
+                <div class="reference-card">
+                    <div class="reference-image">
+                        <img src="{escape(reference["image"])}" alt="{escape(reference["name"])}" onerror="this.src='{REFERENCE_FALLBACK_IMAGE}'">
+                    </div>
+                    <div class="reference-content">
+                        <h3 class="reference-name">{escape(reference["name"])}</h3>
+                        <p class="reference-title">{escape(reference["title"])}</p>
+                        <p class="reference-relationship">{escape(reference["relationship"])}</p>
+                        <div class="reference-contact">
+                            <div class="contact-info">📧 {escape(reference["email"])}</div>
+                            <div class="contact-info">📱 {escape(reference["phone"])}</div>
+                        </div>
+                    </div>
+                </div>''' for reference in references)
+
+
+def render_social_links(social):
+    return ''.join(f'''
+                <a href="{escape(url)}" class="social-link" target="_blank">
+                    <div class="social-icon">{SOCIAL_ICONS.get(platform, '🔗')}</div>
+                    <span>{escape(platform[:1].upper() + platform[1:])}</span>
+                </a>''' for platform, url in social.items() if url and url != '#')
+
+
+def prerender_html(template, config):
+    """Fill `template` (index.html source) with the content of `config`.
+
+    Mirrors the populate* functions in script.js. Containers that are fully
+    rendered here get a data-prerendered attribute so script.js can skip
+    rebuilding them and only attach behaviour.
+    """
+    page = HTMLTemplate(template)
+    personal = config.get('personal', {})
+
+    if personal.get('pageTitle'):
+        page.set_text('#page-title', personal['pageTitle'])
+    elif personal.get('name') and personal.get('title'):
+        page.set_text('#page-title', f"{personal['name']} - {personal['title']}")
+    nav_logo = render_nav_logo(config)
+    if nav_logo is not None:
+        page.set_inner('#nav-logo', nav_logo)
+    menu_items = config.get('navigation', {}).get('menuItems')
+    if menu_items:
+        page.set_inner('#nav-menu', render_nav_menu(menu_items), mark=True)
+
+    if personal.get('greeting'):
+        page.set_text('.hero-greeting', personal['greeting'])
+    if personal.get('name') and personal.get('title'):
+        # Same markup as the innerHTML populateFromConfig() sets, with the values escaped
+        prefix = personal.get('heroTitlePrefix') or "I'm"
+        page.set_inner('.hero-title', f'{escape(prefix)} <span class="highlight">'
+                                      f'{escape(personal["name"])}</span>'
+                                      f'<br>{escape(personal["title"])}')
+    if personal.get('profileImage'):
+        page.set_attrs('.profile-img', {'src': personal['profileImage'],
+                                        'alt': personal.get('name') or 'Profile'})
+
+    skills = config.get('skills', {}).get('list')
+    if skills:
+        page.set_inner('.skills-scroll', ''.join(f'<div class="skill-item">{escape(skill)}</div>'
+                                                 for skill in skills), mark=True)
+
+    technical = config.get('technicalSkills', {})
+    if technical.get('enabled'):
+        if technical.get('title'):
+            page.set_text('.technical-skills-title', technical['title'])
+        if technical.get('subtitle'):
+            page.set_text('.technical-skills-subtitle', technical['subtitle'])
+        if technical.get('categories'):
+            page.set_inner('.technical-skills-grid',
+                           render_technical_skills(technical['categories']), mark=True)
+
+    about = config.get('about', {})
+    if about.get('title'):
+        page.set_text('.about-title', about['title'])
+    if about.get('description'):
+        # Shown as-is without JS; script.js types it out again from data-text
+        page.set_text('.about-description', about['description'])
+        page.set_attrs('.about-description', {'data-text': about['description']})
+    if about.get('services'):
+        page.set_inner('.services', render_services(about['services']), mark=True)
+
+    experience = config.get('experience', {})
+    if experience.get('enabled'):
+        if experience.get('title'):
+            page.set_text('.experience-title', experience['title'])
+        if experience.get('positions'):
+            page.set_inner('.experience-timeline',
+                           render_experience(experience['positions']), mark=True)
+
+    page.set_inner('.projects-grid', render_projects(config), mark=True)
+
+    video_links = config.get('videoLinks', {})
+    if video_links.get('enabled') and video_links.get('videos'):
+        page.set_inner('.video-links-grid',
+                       render_youtube_videos(video_links['videos']), mark=True)
+
+    references = config.get('references', {})
+    if references.get('enabled') and references.get('list'):
+        page.set_inner('#references-grid',
+                       render_references(references['list']), mark=True)
+
+    contacts = config.get('contacts', {})
+    if contacts.get('enabled'):
+        if contacts.get('title'):
+            page.set_text('.contact-title', contacts['title'])
+        if contacts.get('subtitle'):
+            page.set_text('.contact-subtitle', contacts['subtitle'])
+        if contacts.get('social'):
+            page.set_inner('.social-links',
+                           render_social_links(contacts['social']), mark=True)
+
+    return page.render()
+
+
+def active_theme(config):
+    """The theme script.js starts with (populateThemeToggle() falls back to dark)"""
+    return (config.get('theme') or {}).get('mode') or 'dark'
+
+
+def render_theme_head(root, config, page):
+    """<head> markup that applies the active theme without a render-blocking request.
+
+    The theme's critical rules for `page` are inlined and its stylesheet is
+    preloaded and applied once it arrives (with a <noscript> link when
+    scripts are off); both carry data-theme so switchToTheme() replaces them.
+    The other themes are prefetched so a switch is served from cache.
+    Returns '' when the theme has no stylesheet.
+    """
+    root = Path(root)
+    theme = active_theme(config)
+    href = THEME_STYLESHEET.format(theme)
+    if not (root / href).is_file():
+        return ''
+    critical = critical_css((root / href).read_text(encoding='utf-8'), page, [f'{theme}-active'])
+    tags = [f'<style data-theme="{theme}">{critical}</style>',
+            f'<link rel="preload" href="{href}" as="style" data-theme="{theme}" '
+            f'onload="this.onload=null;this.rel=\'stylesheet\'">',
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>']
+    for mode in (config.get('theme') or {}).get('modes') or {}:
+        other = THEME_STYLESHEET.format(mode)
+        if mode != theme and (root / other).is_file():
+            tags.append(f'<link rel="prefetch" href="{other}" as="style">')
+    return '\n    '.join(tags)
+
+
+def prerender_inputs(root):
+    root = Path(root)
+    return [root / TEMPLATE_FILE, root / CONFIG_FILE, *sorted(root.glob('themes/*.css'))]
+
+
+def prerender_page(root):
+    """Render the page for `root` and return its HTML"""
+    template, config_file, *_ = prerender_inputs(root)
+    config = load_config(config_file)
+    page = prerender_html(template.read_text(encoding='utf-8'), config)
+    theme_head = render_theme_head(root, config, page)
+    if theme_head:
+        page = page.replace('</head>', f'    {theme_head}\n</head>', 1)
+    return page
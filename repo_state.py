@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Repository state from a single `git status` call
+Parses `git status --porcelain=v2 --branch -z` into a RepoState snapshot
+(branch, upstream, ahead/behind, staged/unstaged/untracked/conflicted
+entries) that sync.py and update.py share instead of re-querying git.
+Usage: python repo_state.py [path/to/repo]
+"""
+
+import sys
+from dataclasses import dataclass, field
+
+from git_runner import GitRunner
+
+STATUS_ARGS = ('status', '--porcelain=v2', '--branch', '-z')
+
+
+class RepoStateError(RuntimeError):
+    """`git status` failed, e.g. outside a repository"""
+
+
+@dataclass(frozen=True)
+class StatusEntry:
+    """One path from `git status`; `index`/`worktree` use porcelain v1 letters"""
+    path: str
+    index: str
+    worktree: str
+    kind: str  # 'changed', 'renamed', 'unmerged', 'untracked' or 'ignored'
+    orig_path: str = None
+
+    @property
+    def staged(self):
+        return self.kind in ('changed', 'renamed') and self.index != ' '
+
+    @property
+    def unstaged(self):
+        return self.kind in ('changed', 'renamed') and self.worktree != ' '
+
+    @property
+    def conflicted(self):
+        return self.kind == 'unmerged'
+
+    def porcelain(self):
+        """The entry as a `git status --porcelain` (v1) line"""
+        path = f'{self.orig_path} -> {self.path}' if self.orig_path else self.path
+        return f'{self.index}{self.worktree} {path}'
+
+
+@dataclass(frozen=True)
+class RepoState:
+    """Snapshot of a working tree; branch is None when HEAD is detached"""
+    branch: str = None
+    head: str = None  # None before the first commit
+    upstream: str = None
+    ahead: int = 0
+    behind: int = 0
+    entries: tuple = field(default_factory=tuple)
+
+    @property
+    def staged(self):
+        return [entry for entry in self.entries if entry.staged]
+
+    @property
+    def unstaged(self):
+        return [entry for entry in self.entries if entry.unstaged]
+
+    @property
+    def untracked(self):
+        return [entry for entry in self.entries if entry.kind == 'untracked']
+
+    @property
+    def conflicted(self):
+        return [entry for entry in self.entries if entry.conflicted]
+
+    @property
+    def has_changes(self):
+        return any(entry.kind != 'ignored' for entry in self.entries)
+
+    def upstream_branch(self, remote='origin'):
+        """Name of the branch the upstream tracks on `remote` (None without one there)"""
+        prefix = f'{remote}/'
+        if self.upstream and self.upstream.startswith(prefix):
+            return self.upstream[len(prefix):]
+        return None
+
+    def describe(self):
+        """Branch line in the style of `git status -sb`, e.g. `main...origin/main [ahead 1]`"""
+        if self.branch:
+            text = self.branch
+        else:
+            text = f'HEAD (detached at {self.head[:7]})' if self.head else '(unknown)'
+        if self.upstream:
+            text += f'...{self.upstream}'
+            counts = [f'{name} {count}' for name, count in (('ahead', self.ahead),
+                                                            ('behind', self.behind)) if count]
+            if counts:
+                text += f' [{", ".join(counts)}]'
+        return text
+
+
+def v1_letter(code):
+    return ' ' if code == '.' else code
+
+
+def parse_status(output):
+    """RepoState from the bytes (or text) of `git status --porcelain=v2 --branch -z`"""
+    if isinstance(output, bytes):
+        output = output.decode('utf-8', 'surrogateescape')
+    records = iter(output.split('\0'))
+    info = {}
+    entries = []
+    for record in records:
+        if not record:
+            continue
+        kind = record[0]
+        if kind == '#':
+            _, key, value = record.split(' ', 2)
+            if key == 'branch.oid':
+                info['head'] = None if value == '(initial)' else value
+            elif key == 'branch.head':
+                info['branch'] = None if value == '(detached)' else value
+            elif key == 'branch.upstream':
+                info['upstream'] = value
+            elif key == 'branch.ab':
+                ahead, behind = value.split()
+                info['ahead'], info['behind'] = int(ahead), -int(behind)
+        elif kind == '1':
+            fields = record.split(' ', 8)
+            entries.append(StatusEntry(fields[8], v1_letter(fields[1][0]),
+                                       v1_letter(fields[1][1]), 'changed'))
+        elif kind == '2':
+            # The original path follows as its own NUL-terminated record
+            fields = record.split(' ', 9)
+            entries.append(StatusEntry(fields[9], v1_letter(fields[1][0]),
+                                       v1_letter(fields[1][1]), 'renamed', next(records, None)))
+        elif kind == 'u':
+            fields = record.split(' ', 10)
+            entries.append(StatusEntry(fields[10], fields[1][0], fields[1][1], 'unmerged'))
+        elif kind == '?':
+            entries.append(StatusEntry(record[2:], '?', '?', 'untracked'))
+        elif kind == '!':
+            entries.append(StatusEntry(record[2:], '!', '!', 'ignored'))
+    return RepoState(entries=tuple(entries), **info)
+
+
+def target_branch(state, branches, remote='origin', create=False):
+    """The remote branch sync.py pulls from and update.py pushes to.
+
+    The upstream wins, then the current branch, then the remote's default
+    branch (`branches` as listed by GitRunner.remote_branches, None when
+    that failed). Without `create` only branches the remote has count, and
+    None means it has none; with it, the upstream or current branch is used
+    even when the push has yet to create it.
+    """
+    preferred = [branch for branch in (state.upstream_branch(remote), state.branch) if branch]
+    if branches is None:
+        return (preferred or ['main'])[0]
+    if create:
+        return (preferred or [branches.pick() or 'main'])[0]
+    return branches.pick(*preferred)
+
+
+def read_repo_state(cwd=None, runner=None):
+    """Snapshot of the repository at `cwd` (default: the current directory)"""
+    runner = runner or GitRunner(cwd)
+    code, stdout, stderr = runner.run(*STATUS_ARGS, capture_output=True, encoding=None)
+    if code != 0:
+        raise RepoStateError(stderr.decode('utf-8', 'replace').strip()
+                             if isinstance(stderr, bytes) else stderr)
+    return parse_status(stdout)
+
+
+if __name__ == "__main__":
+    try:
+        state = read_repo_state(sys.argv[1] if len(sys.argv) > 1 else None)
+    except RepoStateError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"📋 Branch: {state.describe()}")
+    print(f"📝 {len(state.staged)} staged, {len(state.unstaged)} unstaged, "
+          f"{len(state.untracked)} untracked, {len(state.conflicted)} conflicted")
+    for entry in state.entries:
+        print(f"  {entry.porcelain()}")
@@ -13,6 +13,11 @@ if (typeof window !== 'undefined' && window.portfolioConfig) {
 // Flag to track if typing animation is active
 let isTypingActive = false;
 
+// Containers filled by build.py prerender already hold their markup
+function isPrerendered(element) {
+    return element.hasAttribute('data-prerendered');
+}
+
 // Populate HTML content from configuration
 function populateFromConfig() {
     // Update page title
@@ -47,7 +52,7 @@ function populateFromConfig() {
 
     // Populate navigation menu
     const navMenu = document.getElementById('nav-menu');
-    if (navMenu && config.navigation?.menuItems) {
+    if (navMenu && config.navigation?.menuItems && !isPrerendered(navMenu)) {
         navMenu.innerHTML = '';
         config.navigation.menuItems.forEach(item => {
             const li = document.createElement('li');
@@ -140,6 +145,15 @@ function populateThemeToggle() {
     // Set initial active theme
     const currentTheme = config.theme?.mode || 'dark';
     setActiveTheme(currentTheme);
+    applyInitialTheme(currentTheme);
+}
+
+// A prerendered page already carries the theme's inlined critical CSS and
+// stylesheet, so only its effects are added; otherwise nothing changes at load.
+function applyInitialTheme(themeKey) {
+    if (document.querySelector(`link[data-theme="${themeKey}"]`)) {
+        applyThemeEffects(themeKey);
+    }
 }
 
 // Set active theme button
@@ -156,10 +170,15 @@ function setActiveTheme(themeKey) {
     }
 }
 
+// Resolve an asset path to its fingerprinted name (injected by build.py fingerprint)
+function assetUrl(path) {
+    return (window.portfolioAssets && window.portfolioAssets[path]) || path;
+}
+
 // Switch to specific theme
 function switchToTheme(themeKey) {
-    // Remove existing theme CSS links
-    const existingThemeLinks = document.querySelectorAll('link[data-theme]');
+    // Remove existing theme CSS (links and the critical CSS inlined by build.py dist)
+    const existingThemeLinks = document.querySelectorAll('link[data-theme], style[data-theme]');
     existingThemeLinks.forEach(link => link.remove());
 
     // Remove all theme active classes
@@ -169,7 +188,7 @@ function switchToTheme(themeKey) {
     if (themeKey !== 'default') {
         const themeLink = document.createElement('link');
         themeLink.rel = 'stylesheet';
-        themeLink.href = `themes/${themeKey}-theme.css`;
+        themeLink.href = assetUrl(`themes/${themeKey}-theme.css`);
         themeLink.setAttribute('data-theme', themeKey);
         document.head.appendChild(themeLink);
 
@@ -229,7 +248,7 @@ function switchToTheme(themeKey) {
 
     // Update skills section
     const skillsScroll = document.querySelector('.skills-scroll');
-    if (skillsScroll && config.skills?.list) {
+    if (skillsScroll && config.skills?.list && !isPrerendered(skillsScroll)) {
         skillsScroll.innerHTML = '';
         config.skills.list.forEach(skill => {
             const skillDiv = document.createElement('div');
@@ -265,6 +284,11 @@ function populateTechnicalSkills() {
     const skillsGrid = document.querySelector('.technical-skills-grid');
     if (!skillsGrid || !config.technicalSkills?.categories) return;
 
+    if (isPrerendered(skillsGrid)) {
+        initTechnicalSkillsAnimations();
+        return;
+    }
+
     skillsGrid.innerHTML = '';
 
     config.technicalSkills.categories.forEach(category => {
@@ -332,6 +356,11 @@ function populateExperience() {
     const experienceTimeline = document.querySelector('.experience-timeline');
     if (!experienceTimeline || !config.experience?.positions) return;
 
+    if (isPrerendered(experienceTimeline)) {
+        initExperienceAnimations();
+        return;
+    }
+
     experienceTimeline.innerHTML = '';
 
     config.experience.positions.forEach((position, index) => {
@@ -399,7 +428,7 @@ function initExperienceAnimations() {
 
     // Update services
     const servicesContainer = document.querySelector('.services');
-    if (servicesContainer && config.about?.services) {
+    if (servicesContainer && config.about?.services && !isPrerendered(servicesContainer)) {
         servicesContainer.innerHTML = '';
         config.about.services.forEach(service => {
             const serviceDiv = document.createElement('div');
@@ -466,6 +495,13 @@ function populateProjectsWithTikTok() {
     // Get TikTok videos for the phone UI
     const tiktokVideos = config.videoLinks?.videos?.filter(video => video.platform === 'tiktok') || [];
 
+    if (isPrerendered(projectsGrid)) {
+        if (tiktokVideos.length > 0) {
+            initTikTokPhoneScroll();
+        }
+        return;
+    }
+
     // Create TikTok phone tile HTML if there are TikTok videos
     let tiktokHTML = '';
     if (tiktokVideos.length > 0) {
@@ -558,7 +594,7 @@ function populateContact() {
     // Update social links
     if (config.contacts?.social) {
         const socialLinks = document.querySelector('.social-links');
-        if (socialLinks) {
+        if (socialLinks && !isPrerendered(socialLinks)) {
             socialLinks.innerHTML = '';
 
             Object.entries(config.contacts.social).forEach(([platform, url]) => {
@@ -1183,7 +1219,7 @@ function populateReferences() {
     if (!config.references?.enabled) return;
 
     const referencesGrid = document.getElementById('references-grid');
-    if (!referencesGrid || !config.references?.list) return;
+    if (!referencesGrid || !config.references?.list || isPrerendered(referencesGrid)) return;
 
     referencesGrid.innerHTML = '';
 
@@ -1316,11 +1352,16 @@ function populateVideoLinks() {
     const videoLinksGrid = document.querySelector('.video-links-grid');
     if (!videoLinksGrid || !config.videoLinks?.videos) return;
 
-    videoLinksGrid.innerHTML = '';
-
     // Only handle YouTube videos now (TikTok phone moved to Gallery section)
     const youtubeVideos = config.videoLinks.videos.filter(video => video.platform === 'youtube');
 
+    if (isPrerendered(videoLinksGrid)) {
+        initVideoPreviews(youtubeVideos);
+        return;
+    }
+
+    videoLinksGrid.innerHTML = '';
+
     // Create YouTube video cards (embedded videos with modal)
     if (youtubeVideos.length > 0) {
         youtubeVideos.forEach((video, originalIndex) => {
@@ -1990,8 +2031,8 @@ function switchTheme() {
 
     const selectedTheme = themeSelect.value;
 
-    // Remove existing theme CSS links
-    const existingThemeLinks = document.querySelectorAll('link[data-theme]');
+    // Remove existing theme CSS (links and the critical CSS inlined by build.py dist)
+    const existingThemeLinks = document.querySelectorAll('link[data-theme], style[data-theme]');
     existingThemeLinks.forEach(link => link.remove());
 
     // Remove all theme active classes
@@ -2001,7 +2042,7 @@ function switchTheme() {
     if (selectedTheme !== 'default') {
         const themeLink = document.createElement('link');
         themeLink.rel = 'stylesheet';
-        themeLink.href = `themes/${selectedTheme}-theme.css`;
+        themeLink.href = assetUrl(`themes/${selectedTheme}-theme.css`);
         themeLink.setAttribute('data-theme', selectedTheme);
         document.head.appendChild(themeLink);
 
@@ -1,106 +1,2871 @@
 #!/usr/bin/env python3
 """
 Simple HTTP Server for Portfolio Website
-Usage: python server.py [port]
+Usage: python server.py [port] [--threads N] [--backlog N] [--engine stdlib|asyncio]
+                        [--workers N [--reuse-port]] [--watch] [--metrics]
 Default port: 3000
 """
 
+import argparse
+import asyncio
+import bisect
+import ctypes
+import ctypes.util
+import email.utils
+import errno
+import glob
+import gzip
+import hashlib
+import html
 import http.server
+import io
+import json
+import mimetypes
+import mmap
+import posixpath
+import queue
+import select
+import signal
+import socket
 import socketserver
+import stat
+import struct
 import sys
 import os
+import re
+import time
+import threading
+import traceback
+import uuid
 import webbrowser
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from http import HTTPStatus
 from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+
+from portfolio_config import load_config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
-# Get port from command line arguments or use default
-# Check if portfolio-config.js exists and use its server settings
-port = 3000
 try:
-    import json
-    with open('portfolio-config.js', 'r') as f:
-        # Extract port from JavaScript config file
-        content = f.read()
-        if 'defaultPort' in content:
-            # Simple extraction of port value from JS config
-            import re
-            port_match = re.search(r'defaultPort:\s*(\d+)', content)
-            if port_match:
-                port = int(port_match.group(1))
-except:
-    # Fallback to command line argument or default
-    port = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    import ssl
+except ImportError:
+    ssl = None
+
+CONFIG_FILE = 'portfolio-config.js'
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """Server settings read from the `server` section of portfolio-config.js"""
+    default_port: int = 3000
+    cache_control: str = 'no-cache'
+    threads: int = 0
+    backlog: int = 5
+    shutdown_timeout: float = 10.0
+    engine: str = 'stdlib'
+    keepalive_timeout: float = 15.0
+    max_keepalive_requests: int = 100
+    workers: int = 0
+    reuse_port: bool = False
+    cache_size: int = 32 * 1024 * 1024
+    cache_max_file: int = 256 * 1024
+    compression: bool = True
+    transfer: str = 'sendfile'
+    open_browser: bool = True
+    root: str = '.'
+    prerender: bool = True
+    watch: bool = False
+    metrics: bool = False
+    preload_links: bool = False
+    access_log: str = ''
+    access_log_format: str = 'json'
+    access_log_max_bytes: int = 10 * 1024 * 1024
+    access_log_backups: int = 5
+    access_log_rotate_seconds: float = 0.0
+
+
+def boolean(value):
+    if not isinstance(value, bool):
+        raise ValueError(f'expected true or false, got {value!r}')
+    return value
+
+
+def one_of(*choices):
+    def convert(value):
+        if value not in choices:
+            raise ValueError(f'expected one of {", ".join(choices)}, got {value!r}')
+        return value
+    return convert
+
+
+def non_negative(convert):
+    def check(value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f'expected a non-negative number, got {value!r}')
+        return convert(value)
+    return check
+
+
+# JS config key in the `server` section -> (ServerSettings field, converter)
+SERVER_SETTING_KEYS = {
+    'defaultPort': ('default_port', non_negative(int)),
+    'cacheControl': ('cache_control', str),
+    'threads': ('threads', non_negative(int)),
+    'backlog': ('backlog', non_negative(int)),
+    'shutdownTimeout': ('shutdown_timeout', non_negative(float)),
+    'engine': ('engine', one_of('stdlib', 'asyncio')),
+    'keepaliveTimeout': ('keepalive_timeout', non_negative(float)),
+    'maxKeepaliveRequests': ('max_keepalive_requests', non_negative(int)),
+    'workers': ('workers', non_negative(int)),
+    'reusePort': ('reuse_port', boolean),
+    'cacheSize': ('cache_size', non_negative(int)),
+    'cacheMaxFile': ('cache_max_file', non_negative(int)),
+    'compression': ('compression', boolean),
+    'transfer': ('transfer', one_of('sendfile', 'mmap', 'copy')),
+    'openBrowser': ('open_browser', boolean),
+    'root': ('root', str),
+    'prerender': ('prerender', boolean),
+    'watch': ('watch', boolean),
+    'metrics': ('metrics', boolean),
+    'preloadLinks': ('preload_links', boolean),
+    'accessLog': ('access_log', str),
+    'accessLogFormat': ('access_log_format', one_of('json', 'combined', 'common')),
+    'accessLogMaxBytes': ('access_log_max_bytes', non_negative(int)),
+    'accessLogBackups': ('access_log_backups', non_negative(int)),
+    'accessLogRotateSeconds': ('access_log_rotate_seconds', non_negative(float)),
+}
+
+
+def parse_server_settings(config):
+    """ServerSettings from the `server` section of the parsed portfolioConfig"""
+    values = {}
+    section = config.get('server') or {}
+    for key, value in section.items():
+        if key not in SERVER_SETTING_KEYS:
+            print(f'⚠️  Unknown server setting {key!r} in {CONFIG_FILE}')
+            continue
+        field, convert = SERVER_SETTING_KEYS[key]
+        try:
+            values[field] = convert(value)
+        except (TypeError, ValueError) as e:
+            print(f'⚠️  Ignoring server.{key} in {CONFIG_FILE}: {e}')
+    return replace(ServerSettings(), **values)
+
+
+class ConfigLoader:
+    """Loads portfolio-config.js once and reloads it only when the file changes.
+
+    The file is stat()ed at most every `check_interval` seconds, so request
+    handlers can read `settings` without touching the disk. Parsing goes
+    through the hash-keyed snapshot in portfolio_config, so an unchanged
+    config is not reparsed across restarts.
+    """
+
+    def __init__(self, path=CONFIG_FILE, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._next_check = 0.0
+        self._settings = ServerSettings()
+        self.reload()
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def reload(self):
+        """Re-read the config file if its inode/mtime/size changed"""
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return False
+        settings = ServerSettings()
+        if signature is not None:
+            try:
+                settings = parse_server_settings(load_config(self.path))
+            except (OSError, ValueError) as e:
+                print(f'⚠️  Could not parse {self.path}: {e}')
+                return False
+        self._settings = settings
+        self._signature = signature
+        return True
+
+    def expire(self):
+        """Re-check the file on the next `settings` access"""
+        self._next_check = 0.0
+
+    @property
+    def settings(self):
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                self._next_check = now + self.check_interval
+                self.reload()
+            finally:
+                self._lock.release()
+        return self._settings
+
+
+config_loader = ConfigLoader()
+
+
+def guess_mime_type(path):
+    """MIME type for a file path, shared by every serving engine"""
+    # Custom MIME types
+    if path.endswith('.js'):
+        return 'text/javascript'
+    elif path.endswith('.css'):
+        return 'text/css'
+    elif path.endswith('.json'):
+        return 'application/json'
+
+    ext = posixpath.splitext(path)[1].lower()
+    extensions_map = http.server.SimpleHTTPRequestHandler.extensions_map
+    if ext in extensions_map:
+        return extensions_map[ext]
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def is_not_modified_since(if_modified_since, mtime):
+    """Evaluate an If-Modified-Since header against a file mtime"""
+    try:
+        since = email.utils.parsedate_to_datetime(if_modified_since)
+    except (TypeError, IndexError, OverflowError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return int(mtime) <= since.timestamp()
+
+
+# Files named like styles.3f9a0c1b2d.css (see `python build.py fingerprint`)
+FINGERPRINTED_PATTERN = re.compile(r'\.[0-9a-f]{10}\.[A-Za-z0-9]+(\.gz|\.br)?$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def cache_control_for(path, mimetype):
+    """Fingerprinted assets never change; HTML entry points always revalidate"""
+    if FINGERPRINTED_PATTERN.search(path):
+        return IMMUTABLE_CACHE_CONTROL
+    if mimetype == 'text/html':
+        return 'no-cache'
+    return config_loader.settings.cache_control
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(static_file, if_none_match=None, if_modified_since=None):
+    """RFC 7232 evaluation: If-None-Match wins over If-Modified-Since"""
+    if if_none_match is not None:
+        return etag_matches(if_none_match, static_file.etag)
+    if if_modified_since is not None:
+        return is_not_modified_since(if_modified_since, static_file.mtime)
+    return False
+
+
+def content_etag(hasher):
+    return f'"{hasher.hexdigest()}"'
+
+
+@dataclass(frozen=True)
+class StaticFile:
+    """Metadata and validators for one version of a file on disk.
+
+    `data` holds the body for files served from memory and is None when the
+    body is streamed from disk.
+    """
+    path: str
+    mimetype: str
+    length: int
+    mtime: float
+    mtime_ns: int
+    inode: int
+    last_modified: str
+    etag: str
+    data: bytes = None
+    encoding: str = None
+    vary: str = None
+    link: str = None
+
+    def matches(self, st):
+        return (st.st_ino, st.st_mtime_ns, st.st_size) == (self.inode, self.mtime_ns, self.length)
+
+    def cache_headers(self):
+        headers = {
+            'ETag': self.etag,
+            'Last-Modified': self.last_modified,
+            'Cache-Control': cache_control_for(self.path, self.mimetype),
+        }
+        vary = [self.vary] if self.vary else []
+        if is_compressible(self.mimetype):
+            vary.append('Accept-Encoding')
+        if vary:
+            headers['Vary'] = ', '.join(vary)
+        return headers
+
+    def headers(self):
+        headers = {
+            'Content-Type': self.mimetype,
+            'Content-Length': str(self.length),
+            'Accept-Ranges': 'bytes',
+        }
+        if self.encoding:
+            headers['Content-Encoding'] = self.encoding
+        if self.link:
+            headers['Link'] = self.link
+        headers.update(self.cache_headers())
+        return headers
+
+    @classmethod
+    def from_stat(cls, path, st, etag, data=None):
+        return cls(
+            path=path,
+            mimetype=guess_mime_type(path),
+            length=st.st_size,
+            mtime=st.st_mtime,
+            mtime_ns=st.st_mtime_ns,
+            inode=st.st_ino,
+            last_modified=email.utils.formatdate(st.st_mtime, usegmt=True),
+            etag=etag,
+            data=data,
+        )
+
+
+class ETagRegistry:
+    """Strong content-hash ETags for files served from disk.
+
+    Hashing a multi-megabyte image is done once per file version (inode,
+    mtime, size); later requests reuse the stored StaticFile.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def describe(self, path, f):
+        """StaticFile for an open file object; hashes it only if it changed"""
+        st = os.fstat(f.fileno())
+        with self._lock:
+            known = self._entries.get(path)
+            if known is not None and known.matches(st):
+                self._entries.move_to_end(path)
+                return known
+        hasher = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(chunk)
+        f.seek(0)
+        static_file = StaticFile.from_stat(path, st, content_etag(hasher))
+        with self._lock:
+            self._entries[path] = static_file
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return static_file
+
+    def forget(self, path=None):
+        """Drop one file's ETag, or all of them when `path` is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+
+etag_registry = ETagRegistry()
+
+
+class FileCache:
+    """Size-bounded LRU cache of small, hot static files.
+
+    Files larger than `max_file_bytes` are never cached so the big images
+    cannot push out index.html, the stylesheets and the scripts. Each lookup
+    stat()s the file and drops the entry when its inode, mtime or size changed.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_file_bytes=256 * 1024):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bypasses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0 and self.max_file_bytes > 0
+
+    def get(self, path):
+        """Return a fresh StaticFile with `data` for `path`, or None if it is not cacheable"""
+        if not self.enabled:
+            return None
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                if entry.matches(st):
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return entry
+                self._remove(path)
+                self.invalidations += 1
+            if st.st_size > self.max_file_bytes or st.st_size > self.max_bytes:
+                self.bypasses += 1
+                return None
+            self.misses += 1
+
+        entry = self._load(path)
+        if entry is not None:
+            self._store(entry)
+        return entry
+
+    def _load(self, path):
+        try:
+            with open(path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                if st.st_size > self.max_file_bytes:
+                    return None
+                data = f.read()
+        except (OSError, ValueError):
+            return None
+        if len(data) != st.st_size:
+            # File changed while we were reading it; serve from disk this time
+            return None
+        return StaticFile.from_stat(path, st, content_etag(hashlib.blake2b(data, digest_size=16)),
+                                    data=data)
+
+    def _store(self, entry):
+        with self._lock:
+            if entry.path in self._entries:
+                self._remove(entry.path)
+            self._entries[entry.path] = entry
+            self.current_bytes += entry.length
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, path):
+        entry = self._entries.pop(path)
+        self.current_bytes -= entry.length
+
+    def invalidate(self, path=None):
+        """Drop one entry, or everything when `path` is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.current_bytes = 0
+            elif path in self._entries:
+                self._remove(path)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'bypasses': self.bypasses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+    def report(self):
+        stats = self.stats()
+        print(f"🗃️  File cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions, {stats['invalidations']} invalidations, "
+              f"{stats['entries']} files / {stats['bytes'] / 1024:.0f} KiB cached "
+              f"({stats['hit_ratio']:.0%} hit ratio)")
+
+
+file_cache = FileCache(config_loader.settings.cache_size, config_loader.settings.cache_max_file)
+
+
+# Content codings we can serve, best first, with the suffix of their precompressed sibling
+CONTENT_CODINGS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_TYPES = ('application/javascript', 'application/json', 'image/svg+xml')
+
+
+def is_compressible(mimetype):
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+
+def parse_qvalue_header(header):
+    """Map each token of an Accept/Accept-Encoding style header to its q-value"""
+    codings = {}
+    for item in (header or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+def acceptable_codings(header):
+    """Codings we support that the client accepts, in our preference order"""
+    codings = parse_qvalue_header(header)
+    wildcard = codings.get('*', 0.0)
+    accepted = []
+    for coding, suffix in CONTENT_CODINGS:
+        if coding == 'br' and brotli is None:
+            continue
+        if codings.get(coding, wildcard) > 0:
+            accepted.append((coding, suffix))
+    return accepted
+
+
+class CompressedCache:
+    """Small LRU of on-the-fly compressed bodies for files without a precompressed sibling"""
+
+    def __init__(self, max_entries=64, max_source_bytes=1024 * 1024):
+        self.max_entries = max_entries
+        self.max_source_bytes = max_source_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, static_file, coding, f=None):
+        if static_file.length > self.max_source_bytes:
+            return None
+        key = (static_file.path, static_file.etag, coding)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        data = static_file.data
+        if data is None:
+            data = f.read()
+            f.seek(0)
+        if coding == 'br':
+            body = brotli.compress(data, quality=5)
+        else:
+            body = gzip.compress(data, compresslevel=6, mtime=0)
+        compressed = None
+        if len(body) < len(data):
+            compressed = replace(static_file, data=body, length=len(body), encoding=coding,
+                                 etag=f'{static_file.etag[:-1]}-{coding}"')
+        with self._lock:
+            # Remember incompressible files too, so they aren't retried on every request
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def forget(self, path=None):
+        """Drop every compressed version of `path`, or everything when it is None"""
+        with self._lock:
+            for key in [key for key in self._entries if path is None or key[0] == path]:
+                del self._entries[key]
+
+
+compressed_cache = CompressedCache()
+
+
+def select_representation(static_file, accept_encoding, f=None):
+    """Pick the encoded variant of `static_file` the client should get.
+
+    Prefers a fresh precompressed sibling (styles.css.br, styles.css.gz)
+    written by `python build.py compress`, then falls back to compressing in
+    memory. Returns (representation, open file object or None when its body
+    is in memory); `f` is closed when another representation is chosen.
+    Returns the identity representation and `f` when nothing applies.
+    """
+    if static_file.encoding or not is_compressible(static_file.mimetype):
+        return static_file, f
+    codings = acceptable_codings(accept_encoding)
+    for coding, suffix in codings:
+        # Siblings are opened directly: the file cache skips anything over cacheMaxFile
+        try:
+            variant, variant_f = open_static_file(static_file.path + suffix)
+        except OSError:
+            continue
+        if variant.mtime >= static_file.mtime:
+            if f is not None:
+                f.close()
+            return replace(variant, mimetype=static_file.mimetype, encoding=coding), variant_f
+        if variant_f is not None:
+            variant_f.close()
+    for coding, suffix in codings:
+        compressed = compressed_cache.get(static_file, coding, f)
+        if compressed is not None:
+            if f is not None:
+                f.close()
+            return compressed, None
+    return static_file, f
+
+
+MAX_RANGES = 16
+# first-last, first- or -suffix; int() alone would also take '+5', ' 5' or '1_0'
+BYTE_RANGE = re.compile(r'([0-9]*)-([0-9]*)')
+
+
+def parse_range_header(header, length):
+    """Parse a `Range: bytes=...` header into inclusive (start, end) pairs.
+
+    Returns None when the header should be ignored (other unit, bad syntax,
+    too many ranges) and an empty list when no range is satisfiable.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec.strip():
+        return None
+    specs = spec.split(',')
+    if len(specs) > MAX_RANGES:
+        return None
+    ranges = []
+    for item in specs:
+        match = BYTE_RANGE.fullmatch(item.strip())
+        if not match or not any(match.groups()):
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = int(last) if last else length - 1
+            if last and end < start:
+                return None
+        else:
+            suffix = int(last)
+            start, end = max(length - suffix, 0), length - 1
+            if suffix == 0:
+                continue
+        if start < length:
+            ranges.append((start, min(end, length - 1)))
+    return ranges
+
+
+def if_range_allows(if_range, static_file):
+    """True when an If-Range validator still matches, so the Range may be honoured"""
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        # If-Range requires a strong comparison
+        return if_range == static_file.etag
+    return if_range == static_file.last_modified
+
+
+class RangeBody:
+    """Body of a 206 response: one or more byte ranges of a StaticFile.
+
+    `parts` mixes literal bytes (multipart boundaries) with (offset, count)
+    slices of the file, which the engines transmit without reading the
+    whole file into Python memory.
+    """
+
+    def __init__(self, static_file, f, ranges):
+        self.static_file = static_file
+        self.f = f
+        length = static_file.length
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.content_type = static_file.mimetype
+            self.content_range = f'bytes {start}-{end}/{length}'
+            self.parts = [(start, end - start + 1)]
+        else:
+            boundary = uuid.uuid4().hex
+            self.content_type = f'multipart/byteranges; boundary={boundary}'
+            self.content_range = None
+            self.parts = []
+            for start, end in ranges:
+                self.parts.append((f'\r\n--{boundary}\r\n'
+                                   f'Content-Type: {static_file.mimetype}\r\n'
+                                   f'Content-Range: bytes {start}-{end}/{length}\r\n'
+                                   f'\r\n').encode('latin-1'))
+                self.parts.append((start, end - start + 1))
+            self.parts.append(f'\r\n--{boundary}--\r\n'.encode('latin-1'))
+        self.length = sum(len(part) if isinstance(part, bytes) else part[1]
+                          for part in self.parts)
+
+    def headers(self):
+        headers = {'Content-Type': self.content_type, 'Content-Length': str(self.length)}
+        if self.content_range:
+            headers['Content-Range'] = self.content_range
+        if self.static_file.encoding:
+            headers['Content-Encoding'] = self.static_file.encoding
+        headers.update(self.static_file.cache_headers())
+        return headers
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+
+
+def can_sendfile(sock):
+    """os.sendfile() only works on plain sockets, not TLS-wrapped ones"""
+    if not hasattr(os, 'sendfile'):
+        return False
+    return ssl is None or not isinstance(sock, ssl.SSLSocket)
+
+
+def write_file_range_mmap(outputfile, f, offset, count):
+    """Write a slice of `f` through an mmap-backed memoryview (no read() copies)"""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            chunk_size = 1024 * 1024
+            end = offset + count
+            while offset < end:
+                with view[offset:min(offset + chunk_size, end)] as chunk:
+                    outputfile.write(chunk)
+                offset += chunk_size
+
+
+def is_valid_fs_path(path):
+    """False for paths the OS can't look up: embedded NULs or unencodable surrogates"""
+    if '\0' in path:
+        return False
+    try:
+        os.fsencode(path)
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def open_static_file(path):
+    """StaticFile for `path` plus an open file object when the body isn't cached.
+
+    Raises OSError when the file can't be opened.
+    """
+    if not is_valid_fs_path(path):
+        raise FileNotFoundError(errno.ENOENT, 'Invalid path', path)
+    static_file = file_cache.get(path)
+    if static_file is not None:
+        return static_file, None
+    f = open(path, 'rb')
+    try:
+        return etag_registry.describe(path, f), f
+    except OSError:
+        f.close()
+        raise
+
+
+# Modern formats written by `python build.py images`, best first
+MODERN_IMAGE_TYPES = ('image/avif', 'image/webp')
+IMAGE_MANIFEST = 'images/variants/manifest.json'
+
+
+class ImageVariants:
+    """Serves AVIF/WebP variants of images to browsers that accept them.
+
+    Reads the manifest written by `python build.py images` and reloads it
+    when it changes, checking at most every `check_interval` seconds.
+    Variants are only used while the source image still has the size and
+    mtime recorded in the manifest; after an edit the original is served
+    until the variants are rebuilt.
+    """
+
+    def __init__(self, manifest=IMAGE_MANIFEST, check_interval=2.0):
+        self.manifest = manifest
+        self.check_interval = check_interval
+        self._entries = {}
+        self._signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self, root):
+        path = os.path.join(root, self.manifest)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._entries, self._signature = {}, None
+            return
+        signature = (path, st.st_ino, st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'⚠️  Could not read {path}: {e}')
+            self._entries = {}
+        self._signature = signature
+
+    def expire(self):
+        self._next_check = 0.0
+
+    def entries(self, root):
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._load(root)
+                    self._next_check = now + self.check_interval
+        return self._entries
+
+    def negotiate(self, root, path, accept):
+        """Return (path to serve, whether the response varies on Accept)"""
+        rel = os.path.relpath(path, root)
+        if rel.startswith(os.pardir):
+            return path, False
+        entry = self.entries(root).get('/' + rel.replace(os.sep, '/'))
+        if not entry or not self._is_fresh(path, entry):
+            return path, False
+        accepted = parse_qvalue_header(accept)
+        for mimetype in MODERN_IMAGE_TYPES:
+            if accepted.get(mimetype, 0) <= 0:
+                continue
+            candidates = [variant for variant in entry['variants'] if variant['type'] == mimetype]
+            if candidates:
+                best = max(candidates, key=lambda variant: variant['width'])
+                variant_path = os.path.join(root, best['src'].lstrip('/'))
+                if os.path.isfile(variant_path):
+                    return variant_path, True
+        return path, True
+
+    @staticmethod
+    def _is_fresh(path, entry):
+        """Whether the variants in `entry` were rendered from the current source"""
+        source = entry.get('source')
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return (source is not None and st.st_size == source['size']
+                and st.st_mtime_ns == source['mtime_ns'])
+
+
+image_variants = ImageVariants()
+
+
+# Written by `python build.py prerender`
+PRERENDER_TEMPLATE = 'index.html'
+PRERENDERED_PAGE = 'index.prerendered.html'
+PRERENDER_INPUTS = (PRERENDER_TEMPLATE, CONFIG_FILE)
+# The page inlines the active theme's critical CSS
+PRERENDER_INPUT_GLOBS = ('themes/*.css',)
+
+
+class PrerenderedPage:
+    """Serves index.prerendered.html in place of index.html while it is fresh.
+
+    The page is only used when it is at least as new as index.html,
+    portfolio-config.js and the theme stylesheets, so editing any of them
+    falls back to client-side rendering until the next prerender. Checked at
+    most every `check_interval` seconds per root.
+    """
+
+    def __init__(self, check_interval=2.0):
+        self.enabled = True
+        self.check_interval = check_interval
+        self._state = {}  # root -> (next check, prerendered path or None)
+        self._lock = threading.Lock()
+
+    def _fresh_path(self, root):
+        prerendered = os.path.join(root, PRERENDERED_PAGE)
+        try:
+            output_mtime = os.stat(prerendered).st_mtime_ns
+            inputs = [os.path.join(root, name) for name in PRERENDER_INPUTS]
+            for pattern in PRERENDER_INPUT_GLOBS:
+                inputs.extend(glob.glob(os.path.join(root, pattern)))
+            inputs_mtime = max(os.stat(path).st_mtime_ns for path in inputs)
+        except OSError:
+            return None
+        return prerendered if output_mtime >= inputs_mtime else None
+
+    def expire(self):
+        with self._lock:
+            self._state.clear()
+
+    def resolve(self, root, path):
+        """Return the prerendered page for requests of root/index.html, else `path`"""
+        if not self.enabled or os.path.basename(path) != PRERENDER_TEMPLATE:
+            return path
+        if os.path.normpath(path) != os.path.normpath(os.path.join(root, PRERENDER_TEMPLATE)):
+            return path
+        now = time.monotonic()
+        with self._lock:
+            next_check, prerendered = self._state.get(root, (0.0, None))
+            if now >= next_check:
+                prerendered = self._fresh_path(root)
+                self._state[root] = (now + self.check_interval, prerendered)
+        return prerendered or path
+
+
+prerendered_page = PrerenderedPage()
+
+
+PRELOAD_TAG = re.compile(r'<(link|script)\b([^>]*)>', re.I)
+TAG_ATTRIBUTE = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def preload_targets(page):
+    """(href, destination) for the stylesheets and scripts an HTML page loads"""
+    targets = []
+    for tag, attr_text in PRELOAD_TAG.findall(page):
+        attrs = {name.lower(): html.unescape(double or single)
+                 for name, double, single in TAG_ATTRIBUTE.findall(attr_text)}
+        rel = attrs.get('rel', '').lower().split()
+        if tag.lower() == 'script':
+            href, destination = attrs.get('src'), 'script'
+        elif 'stylesheet' in rel:
+            href, destination = attrs.get('href'), 'style'
+        elif 'preload' in rel and attrs.get('as'):
+            href, destination = attrs.get('href'), attrs['as']
+        else:
+            continue
+        if href and not href.startswith('//') and not urlsplit(href).scheme:
+            targets.append((href, destination))
+    return targets
+
+
+class PreloadLinks:
+    """`Link: rel=preload` headers for HTML pages (opt-in with --preload-links).
+
+    Lists the same-origin stylesheets and scripts the page loads, so the
+    browser can request them before it has parsed the markup. Computed once
+    per file version.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._headers = {}  # path -> (mtime_ns, length, header or None)
+        self._lock = threading.Lock()
+
+    def header_for(self, root, static_file, f=None):
+        if not self.enabled or static_file.mimetype != 'text/html':
+            return None
+        with self._lock:
+            known = self._headers.get(static_file.path)
+        if known and known[:2] == (static_file.mtime_ns, static_file.length):
+            return known[2]
+        data = static_file.data
+        if data is None:
+            data = os.pread(f.fileno(), static_file.length, 0)
+        base = '/' + os.path.relpath(os.path.dirname(static_file.path), root).replace(os.sep, '/')
+        links = []
+        for href, destination in preload_targets(data.decode('utf-8', 'replace')):
+            url = posixpath.normpath(posixpath.join(base, href)) if not href.startswith('/') else href
+            link = f'<{quote(url, safe="/:?&=#%;,@+$!*()~")}>; rel=preload; as={destination}'
+            if link not in links:
+                links.append(link)
+        header = ', '.join(links) or None
+        with self._lock:
+            self._headers[static_file.path] = (static_file.mtime_ns, static_file.length, header)
+        return header
+
+
+preload_links = PreloadLinks()
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+INOTIFY_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+INOTIFY_EVENT = struct.Struct('iIII')
+
+WATCH_IGNORED_DIRS = {'__pycache__', 'node_modules'}
+WATCH_IGNORED_SUFFIXES = ('~', '.swp', '.swx', '.tmp', '.pyc')
+# Reported instead of a path when events were lost and everything may have changed
+EVERYTHING = '*'
+
+
+def is_watched_name(name):
+    return not name.startswith('.') and not name.endswith(WATCH_IGNORED_SUFFIXES)
+
+
+def load_inotify():
+    """libc with the inotify functions, or None off Linux"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """Reports changed files under `root` to `on_change` in debounced batches.
+
+    Uses inotify on Linux and falls back to polling mtimes every
+    `poll_interval` seconds. Events are coalesced until the tree has been
+    quiet for `debounce` seconds (or `max_delay` has passed since the first
+    one), so saving many files at once produces a single callback with the
+    sorted, de-duplicated relative paths.
+    """
+
+    def __init__(self, root, on_change, debounce=0.1, max_delay=1.0, poll_interval=1.0):
+        self.root = os.path.abspath(root)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.backend = None
+        self._libc = None
+        self._fd = None
+        self._watches = {}  # watch descriptor -> relative directory
+        self._snapshot = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._libc = load_inotify()
+        if self._libc is not None:
+            self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self._fd < 0:
+                self._fd = None
+        if self._fd is not None:
+            self.backend = 'inotify'
+            self._add_tree('')
+        else:
+            self.backend = 'polling'
+            self._snapshot = self._scan()
+        self._thread = threading.Thread(target=self._run, name='portfolio-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _walk(self, rel_dir):
+        """Yield (relative path, DirEntry) for watched entries below `rel_dir`"""
+        try:
+            entries = list(os.scandir(os.path.join(self.root, rel_dir)))
+        except OSError:
+            return
+        for entry in entries:
+            if not is_watched_name(entry.name) or entry.name in WATCH_IGNORED_DIRS:
+                continue
+            rel = posixpath.join(rel_dir, entry.name) if rel_dir else entry.name
+            yield rel, entry
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._walk(rel)
+
+    def _add_watch(self, rel_dir):
+        path = os.path.join(self.root, rel_dir).encode('utf-8', 'surrogateescape')
+        wd = self._libc.inotify_add_watch(self._fd, path, INOTIFY_MASK)
+        if wd >= 0:
+            self._watches[wd] = rel_dir
+
+    def _add_tree(self, rel_dir):
+        self._add_watch(rel_dir)
+        for rel, entry in self._walk(rel_dir):
+            if entry.is_dir(follow_symlinks=False):
+                self._add_watch(rel)
+
+    def _read_inotify(self, timeout):
+        changed = set()
+        try:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+            if not readable:
+                return changed
+            buffer = os.read(self._fd, 64 * 1024)
+        except (BlockingIOError, InterruptedError):
+            return changed
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(buffer):
+            wd, mask, _cookie, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = buffer[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(EVERYTHING)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            rel_dir = self._watches.get(wd)
+            if rel_dir is None or not name or not is_watched_name(name):
+                continue
+            rel = posixpath.join(rel_dir, name) if rel_dir else name
+            if mask & IN_ISDIR:
+                if name in WATCH_IGNORED_DIRS:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(rel)
+                    changed.update(child for child, entry in self._walk(rel) if entry.is_file())
+                continue
+            changed.add(rel)
+        return changed
+
+    def _scan(self):
+        snapshot = {}
+        for rel, entry in self._walk(''):
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    snapshot[rel] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        return snapshot
+
+    def _poll(self, timeout):
+        if self._stop.wait(min(timeout, self.poll_interval)):
+            return set()
+        snapshot = self._scan()
+        previous, self._snapshot = self._snapshot, snapshot
+        return {rel for rel in previous.keys() | snapshot.keys()
+                if previous.get(rel) != snapshot.get(rel)}
+
+    def _run(self):
+        pending = set()
+        first_change = last_change = None
+        while not self._stop.is_set():
+            timeout = self.poll_interval
+            if pending:
+                now = time.monotonic()
+                timeout = max(0.0, min(last_change + self.debounce, first_change + self.max_delay) - now)
+            if self.backend == 'inotify':
+                changed = self._read_inotify(timeout)
+            else:
+                changed = self._poll(timeout)
+            now = time.monotonic()
+            if changed:
+                if not pending:
+                    first_change = now
+                pending |= changed
+                last_change = now
+            if pending and (now >= last_change + self.debounce or now >= first_change + self.max_delay):
+                batch = sorted(pending)
+                pending.clear()
+                try:
+                    self.on_change(batch)
+                except Exception:
+                    traceback.print_exc()
+
+
+class LiveReload:
+    """Fans file-change batches out to browsers over Server-Sent Events.
+
+    Threaded handlers block in `wait()`; asyncio connections subscribe a
+    queue that `publish()` feeds through the owning event loop.
+    """
+
+    event_path = '/__livereload'
+    script_path = '/__livereload.js'
+
+    def __init__(self, heartbeat=15.0, history=64):
+        self.enabled = False
+        self.heartbeat = heartbeat
+        self._condition = threading.Condition()
+        self._events = deque(maxlen=history)
+        self._sequence = 0
+        self._closed = False
+        self._subscribers = set()
+
+    @property
+    def sequence(self):
+        with self._condition:
+            return self._sequence
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def publish(self, paths):
+        payload = json.dumps({'paths': paths})
+        with self._condition:
+            self._sequence += 1
+            self._events.append((self._sequence, payload))
+            self._condition.notify_all()
+            subscribers = list(self._subscribers)
+        for loop, events in subscribers:
+            loop.call_soon_threadsafe(events.put_nowait, payload)
+
+    def wait(self, after, timeout):
+        """Block until events newer than `after` exist; returns (sequence, payloads)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence > after or self._closed, timeout)
+            return self._sequence, [payload for sequence, payload in self._events if sequence > after]
+
+    def subscribe(self, loop):
+        events = asyncio.Queue()
+        with self._condition:
+            self._subscribers.add((loop, events))
+        return events
+
+    def unsubscribe(self, loop, events):
+        with self._condition:
+            self._subscribers.discard((loop, events))
+
+    def close(self):
+        """End every open event stream"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            subscribers = list(self._subscribers)
+        for loop, events in subscribers:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    def inject(self, static_file, f=None):
+        """HTML `static_file` with the live reload client added before </body>"""
+        data = static_file.data
+        if data is None:
+            data = f.read()
+        index = data.lower().rfind(b'</body>')
+        if index < 0:
+            index = len(data)
+        tag = f'<script src="{self.script_path}"></script>\n'.encode('ascii')
+        data = data[:index] + tag + data[index:]
+        return replace(static_file, data=data, length=len(data),
+                       etag=f'{static_file.etag[:-1]}-livereload"')
+
+
+# Served at /__livereload.js in --watch mode
+LIVE_RELOAD_CLIENT = rb"""// Injected by server.py --watch: applies changes without a full page reload
+(function () {
+    const source = new EventSource('/__livereload');
+
+    function bust(url) {
+        const next = new URL(url, location.href);
+        next.searchParams.set('livereload', Date.now());
+        return next.href;
+    }
+
+    function isPath(url, path) {
+        return new URL(url, location.href).pathname.replace(/^\//, '') === path;
+    }
+
+    function swapStylesheet(path) {
+        document.querySelectorAll('link[rel="stylesheet"]').forEach(link => {
+            if (!isPath(link.href, path)) return;
+            const next = link.cloneNode();
+            next.href = bust(link.href);
+            next.onload = () => link.remove();
+            link.after(next);
+        });
+    }
+
+    function swapImage(path) {
+        document.querySelectorAll('img').forEach(img => {
+            if (isPath(img.src, path)) img.src = bust(img.src);
+        });
+    }
+
+    async function swapConfig(path) {
+        const response = await fetch(bust('/' + path), { cache: 'no-store' });
+        const load = new Function('window', 'module', (await response.text()) + '\nreturn portfolioConfig;');
+        config = load(window, undefined);
+        window.portfolioConfig = config;
+        document.querySelectorAll('[data-prerendered]').forEach(el => el.removeAttribute('data-prerendered'));
+        // populateFromConfig() binds the menu toggle again; start from a listener-free copy
+        const toggle = document.getElementById('mobile-menu-toggle');
+        if (toggle) toggle.replaceWith(toggle.cloneNode(true));
+        populateFromConfig();
+        document.querySelectorAll('[data-text]').forEach(el => {
+            if (!el.textContent) el.textContent = el.getAttribute('data-text');
+        });
+    }
+
+    source.addEventListener('change', event => {
+        const paths = JSON.parse(event.data).paths;
+        let reload = false;
+        paths.forEach(path => {
+            if (path.endsWith('.css')) {
+                swapStylesheet(path);
+            } else if (/\.(png|jpe?g|gif|webp|avif|svg)$/i.test(path)) {
+                swapImage(path);
+            } else if (path === 'portfolio-config.js' && typeof populateFromConfig === 'function') {
+                swapConfig(path).catch(() => location.reload());
+            } else if (path === '*' || /\.(html?|js)$/i.test(path)) {
+                reload = true;
+            }
+        });
+        if (reload) location.reload();
+    });
+})();
+"""
+
+
+class EventStream:
+    """Response body for /__livereload on the threaded engine"""
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.sequence = hub.sequence
+
+    def stream(self, outputfile):
+        try:
+            outputfile.write(b'retry: 1000\n\n')
+            outputfile.flush()
+            last_write = time.monotonic()
+            while not self.hub.closed:
+                self.sequence, payloads = self.hub.wait(self.sequence, timeout=1.0)
+                if payloads:
+                    for payload in payloads:
+                        outputfile.write(f'event: change\ndata: {payload}\n\n'.encode('utf-8'))
+                elif time.monotonic() - last_write >= self.hub.heartbeat:
+                    outputfile.write(b': ping\n\n')
+                else:
+                    continue
+                outputfile.flush()
+                last_write = time.monotonic()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def close(self):
+        pass
+
+
+live_reload = LiveReload()
+# Threads the stdlib engine gets in --watch mode so event streams can't starve requests
+WATCH_MIN_THREADS = 16
+EVENT_STREAM_HEADERS = {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'}
+
+
+def invalidate_changed(root, paths):
+    """Drop cached state for changed files and tell open browsers about them"""
+    for rel in paths:
+        if rel == EVERYTHING:
+            file_cache.invalidate()
+            etag_registry.forget()
+            compressed_cache.forget()
+            continue
+        path = os.path.join(root, *rel.split('/'))
+        for suffix in [''] + [suffix for _, suffix in CONTENT_CODINGS]:
+            file_cache.invalidate(path + suffix)
+            etag_registry.forget(path + suffix)
+        compressed_cache.forget(path)
+    config_loader.expire()
+    image_variants.expire()
+    prerendered_page.expire()
+    log_access('watch', f'changed: {", ".join(paths)}')
+    live_reload.publish(paths)
+
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PATH_CLASSES = {
+    '.html': 'html', '.htm': 'html',
+    '.css': 'css',
+    '.js': 'script',
+    '.json': 'data',
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image', '.gif': 'image', '.webp': 'image',
+    '.avif': 'image', '.svg': 'image', '.ico': 'image',
+    '.woff': 'font', '.woff2': 'font', '.ttf': 'font', '.otf': 'font',
+}
+
+
+def path_class(url_path):
+    """Coarse label for a request path, keeping metric cardinality small"""
+    if url_path.startswith('/__'):
+        return 'internal'
+    if url_path.endswith('/'):
+        return 'html'
+    return PATH_CLASSES.get(posixpath.splitext(url_path)[1].lower(), 'other')
+
+
+class MetricsShard:
+    """Counters owned and updated by a single thread"""
+    __slots__ = ('requests', 'latency', 'bytes_sent', 'in_flight', 'connections',
+                 'connections_total', 'reused_requests')
+
+    def __init__(self):
+        self.requests = {}  # (status, path class) -> count
+        self.latency = {}   # path class -> per-bucket counts + [+Inf count, sum]
+        self.bytes_sent = 0
+        self.in_flight = 0
+        self.connections = 0
+        self.connections_total = 0
+        self.reused_requests = 0  # requests after the first on a keep-alive connection
+
+    def merge(self, other):
+        """Add the counts of `other` to this shard"""
+        for key, count in other.requests.copy().items():
+            self.requests[key] = self.requests.get(key, 0) + count
+        for label, histogram in other.latency.copy().items():
+            total = self.latency.setdefault(label, [0] * (len(LATENCY_BUCKETS) + 1) + [0.0])
+            for index, value in enumerate(list(histogram)):
+                total[index] += value
+        self.bytes_sent += other.bytes_sent
+        self.in_flight += other.in_flight
+        self.connections += other.connections
+        self.connections_total += other.connections_total
+        self.reused_requests += other.reused_requests
+
+
+class Metrics:
+    """Request metrics for /__metrics in Prometheus text exposition format.
+
+    Every thread updates its own MetricsShard without taking a lock; a
+    scrape sums the shards. Gauges work the same way because connections
+    and requests start and finish on the same thread. Shards of threads
+    that have exited are folded into a retired total, so the list only
+    holds live threads. With --workers each process counts on its own.
+    """
+
+    path = '/__metrics'
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self.enabled = False
+        self._local = threading.local()
+        self._shards = {}  # thread -> MetricsShard
+        self._retired = MetricsShard()  # counts of threads that have exited
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = MetricsShard()
+            with self._lock:
+                self._retire_finished()
+                self._shards[threading.current_thread()] = shard
+        return shard
+
+    def _retire_finished(self):
+        """Fold the shards of exited threads into the retired total (lock held)"""
+        for thread in [thread for thread in self._shards if not thread.is_alive()]:
+            self._retired.merge(self._shards.pop(thread))
+
+    def connection_opened(self):
+        shard = self._shard()
+        shard.connections += 1
+        shard.connections_total += 1
+
+    def connection_closed(self):
+        self._shard().connections -= 1
+
+    def request_started(self, reused=False):
+        shard = self._shard()
+        shard.in_flight += 1
+        if reused:
+            shard.reused_requests += 1
+
+    def request_finished(self, path_class, status, seconds, bytes_sent):
+        shard = self._shard()
+        shard.in_flight -= 1
+        key = (status, path_class)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        histogram = shard.latency.get(path_class)
+        if histogram is None:
+            histogram = shard.latency[path_class] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+        histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+        shard.bytes_sent += bytes_sent
+
+    def render(self):
+        totals = MetricsShard()
+        with self._lock:
+            self._retire_finished()
+            totals.merge(self._retired)
+            for shard in self._shards.values():
+                totals.merge(shard)
+        requests, latency = totals.requests, totals.latency
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{labels} {value}')
+
+        metric('portfolio_http_requests_total', 'counter', 'Requests served by status and path class.',
+               [(f'{{status="{status}",path_class="{label}"}}', count)
+                for (status, label), count in sorted(requests.items())])
+        samples = []
+        for label, histogram in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), histogram):
+                cumulative += count
+                samples.append((f'_bucket{{path_class="{label}",le="{bound}"}}', cumulative))
+            samples.append((f'_sum{{path_class="{label}"}}', f'{histogram[-1]:.6f}'))
+            samples.append((f'_count{{path_class="{label}"}}', cumulative))
+        lines.append('# HELP portfolio_http_request_duration_seconds Time to serve a request.')
+        lines.append('# TYPE portfolio_http_request_duration_seconds histogram')
+        lines.extend(f'portfolio_http_request_duration_seconds{suffix} {value}'
+                     for suffix, value in samples)
+        metric('portfolio_http_response_bytes_total', 'counter', 'Response body bytes sent.',
+               [('', totals.bytes_sent)])
+        metric('portfolio_http_requests_in_flight', 'gauge', 'Requests being served.',
+               [('', totals.in_flight)])
+        metric('portfolio_http_connections_open', 'gauge', 'Open client connections.',
+               [('', totals.connections)])
+        metric('portfolio_http_connections_total', 'counter', 'Client connections accepted.',
+               [('', totals.connections_total)])
+        metric('portfolio_http_keepalive_requests_total', 'counter',
+               'Requests served on a reused keep-alive connection.',
+               [('', totals.reused_requests)])
+
+        cache = file_cache.stats()
+        metric('portfolio_file_cache_hits_total', 'counter', 'In-memory file cache hits.',
+               [('', cache['hits'])])
+        metric('portfolio_file_cache_misses_total', 'counter', 'In-memory file cache misses.',
+               [('', cache['misses'])])
+        metric('portfolio_file_cache_hit_ratio', 'gauge', 'Hits over lookups since startup.',
+               [('', f"{cache['hit_ratio']:.4f}")])
+        metric('portfolio_file_cache_bytes', 'gauge', 'Bytes held by the in-memory file cache.',
+               [('', cache['bytes'])])
+        metric('portfolio_access_log_dropped_total', 'counter',
+               'Access log entries dropped because the writer fell behind.',
+               [('', access_log.dropped)])
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+metrics = Metrics()
+
+
+def log_access(client, message):
+    # Custom log format with colors
+    print(f"\033[92m{client}\033[0m - \033[94m{message}\033[0m")
+
+
+class AccessLog:
+    """Access log written by a background thread from a bounded queue.
+
+    Request threads only enqueue a tuple; formatting, writing and flushing
+    happen on the writer thread, one write per batch. When the queue is full
+    entries are dropped and counted rather than slowing requests down.
+    Without a `path` entries are printed as coloured console lines; with one
+    they are written as JSON lines or Common/Combined Log Format (plus the
+    request duration in microseconds) and rotated by size and/or age.
+    """
+
+    def __init__(self, queue_size=10000, batch_size=512, flush_interval=0.5):
+        self.path = None
+        self.format = 'json'
+        self.max_bytes = 0
+        self.backups = 5
+        self.rotate_seconds = 0.0
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(queue_size)
+        self._drop_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._file = None
+        self._inode = None
+        self._next_rotation = None
+
+    def configure(self, path='', log_format='json', max_bytes=0, backups=5, rotate_seconds=0.0):
+        """`path` '' keeps the coloured console lines, '-' writes `log_format` to stdout"""
+        self.path = path or None
+        self.format = log_format if path else 'console'
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.rotate_seconds = rotate_seconds
+
+    @property
+    def wants_headers(self):
+        return self.format == 'json' or self.format == 'combined'
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='portfolio-access-log',
+                                                daemon=True)
+                self._thread.start()
+
+    def record(self, client, requestline, status, size, duration, referer=None, user_agent=None):
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((time.time(), client, requestline, status, size, duration,
+                                    referer, user_agent))
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Write out queued entries and stop the writer thread"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        if self.dropped:
+            print(f'⚠️  Access log dropped {self.dropped} entr{"y" if self.dropped == 1 else "ies"} '
+                  f'under load')
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [entry for entry in batch if entry is not None]
+            if batch:
+                try:
+                    self._write(''.join(self._format(entry) for entry in batch))
+                except OSError as e:
+                    print(f'⚠️  Could not write access log: {e}')
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _format(self, entry):
+        timestamp, client, requestline, status, size, duration, referer, user_agent = entry
+        if self.format == 'console':
+            return (f'\033[92m{client}\033[0m - \033[94m"{requestline}" {status} '
+                    f'{size or "-"}\033[0m\n')
+        if self.format == 'json':
+            method, _, rest = requestline.partition(' ')
+            target, _, protocol = rest.rpartition(' ') if ' ' in rest else (rest, '', '')
+            return json.dumps({
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(timestamp))
+                        + f'.{int(timestamp % 1 * 1000):03d}Z',
+                'remote': client,
+                'method': method,
+                'path': target,
+                'protocol': protocol,
+                'status': status,
+                'bytes': size,
+                'duration_ms': round(duration * 1000, 3),
+                'referer': referer,
+                'user_agent': user_agent,
+            }, separators=(',', ':')) + '\n'
+        line = (f'{client} - - [{time.strftime("%d/%b/%Y:%H:%M:%S %z", time.localtime(timestamp))}] '
+                f'"{requestline}" {status} {size or "-"}')
+        if self.format == 'combined':
+            line += f' "{referer or "-"}" "{user_agent or "-"}"'
+        return f'{line} {int(duration * 1_000_000)}\n'
+
+    def _write(self, text):
+        if self.path is None or self.path == '-':
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        data = text.encode('utf-8')
+        self._open_current()
+        now = time.time()
+        if self._file.tell() > 0 and (
+                (self.max_bytes and self._file.tell() + len(data) > self.max_bytes)
+                or (self._next_rotation is not None and now >= self._next_rotation)):
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def _open_current(self):
+        """Open the log file, reopening it if another process rotated it away"""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if self._file is not None and inode == self._inode:
+            return
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, 'ab')
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        if self.rotate_seconds and self._next_rotation is None:
+            self._next_rotation = time.time() + self.rotate_seconds
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if self.backups:
+            for index in range(self.backups - 1, 0, -1):
+                source = f'{self.path}.{index}'
+                if os.path.exists(source):
+                    os.replace(source, f'{self.path}.{index + 1}')
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.unlink(self.path)
+        if self.rotate_seconds:
+            self._next_rotation = time.time() + self.rotate_seconds
+        self._open_current()
+
+
+access_log = AccessLog()
+
+
+def has_request_body(headers):
+    """True when a request announces a body; GET/HEAD bodies are never read"""
+    return (headers.get('transfer-encoding') is not None
+            or headers.get('content-length', '0').strip() != '0')
+
+
+def header_value(header_block, name):
+    """Value of header `name` (lower case) in a raw CRLF-separated header block"""
+    for line in header_block.split('\r\n'):
+        key, _, value = line.partition(':')
+        if key.strip().lower() == name:
+            return value.strip()
+    return None
+
 
 class PortfolioHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests (and serves pipelined
+    # ones in order) until `keepalive_timeout` idle seconds pass or
+    # `max_keepalive_requests` have been served (0 = unlimited)
+    protocol_version = 'HTTP/1.1'
+    keepalive_timeout = 15.0
+    max_keepalive_requests = 100
+    compression = True
+    # How file bodies reach the socket: 'sendfile' (zero-copy, falls back to
+    # mmap on TLS), 'mmap', or 'copy' (SimpleHTTPRequestHandler's copyfileobj)
+    transfer = 'sendfile'
+    serve_root = None
+    _sent_cache_control = False
+    _sent_connection = False
+    _started = None
+    _status = 0
+    _response_bytes = 0
+    _requests_served = 0
+
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=os.getcwd(), **kwargs)
+        super().__init__(*args, directory=self.serve_root or os.getcwd(), **kwargs)
 
-    def end_headers(self):
-        # Get cache control from config if available
-        cache_control = 'no-cache'
-        try:
-            with open('portfolio-config.js', 'r') as f:
-                content = f.read()
-                import re
-                cache_match = re.search(r'cacheControl:\s*["\']([^"\']+)["\']', content)
-                if cache_match:
-                    cache_control = cache_match.group(1)
-        except:
-            pass
+    def setup(self):
+        super().setup()
+        if metrics.enabled:
+            metrics.connection_opened()
+
+    def finish(self):
+        if metrics.enabled:
+            metrics.connection_closed()
+        super().finish()
+
+    def parse_request(self):
+        # The request line has been read: the request starts now
+        self._started = time.perf_counter()
+        self._status = 0
+        self._response_bytes = 0
+        if metrics.enabled:
+            metrics.request_started(reused=self._requests_served > 0)
+        if not super().parse_request():
+            return False
+        if has_request_body(self.headers):
+            # The body is never read: close instead of parsing it as the next request
+            self.close_connection = True
+        return True
+
+    def handle_one_request(self):
+        self._started = None
+        if self._requests_served and not self._await_next_request():
+            self.close_connection = True
+            return
+        try:
+            super().handle_one_request()
+        finally:
+            if self._started is not None:
+                self._requests_served += 1
+                self._request_done()
+
+    def _await_next_request(self):
+        """Wait on an idle keep-alive connection; False when it should be closed"""
+        self.connection.setblocking(False)
+        try:
+            if self.rfile.peek(1):
+                return True  # pipelined request already buffered
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+        return self.server.wait_for_request(self.connection, self.keepalive_timeout)
+
+    def _request_done(self):
+        """Record metrics and the access log entry for the request just served"""
+        duration = time.perf_counter() - self._started
+        sent = 0 if self.command == 'HEAD' else self._response_bytes
+        if metrics.enabled:
+            metrics.request_finished(path_class(urlsplit(getattr(self, 'path', '')).path),
+                                     self._status, duration, sent)
+        headers = getattr(self, 'headers', None)
+        if access_log.wants_headers and headers is not None:
+            referer, user_agent = headers.get('Referer'), headers.get('User-Agent')
+        else:
+            referer = user_agent = None
+        access_log.record(self.address_string(), self.requestline, self._status, sent, duration,
+                          referer, user_agent)
 
-        self.send_header('Cache-Control', cache_control)
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'cache-control':
+            self._sent_cache_control = True
+        elif keyword.lower() == 'connection':
+            self._sent_connection = True
+        elif keyword.lower() == 'content-length':
+            self._response_bytes = int(value)
+        super().send_header(keyword, value)
+
+    def end_headers(self):
+        if not self._sent_cache_control:
+            self.send_header('Cache-Control', config_loader.settings.cache_control)
+        self._sent_cache_control = False
+        if not self.close_connection:
+            if (self.max_keepalive_requests
+                    and self._requests_served + 1 >= self.max_keepalive_requests):
+                self.send_header('Connection', 'close')
+            elif self.request_version == 'HTTP/1.0':
+                self.send_header('Connection', 'keep-alive')
+        elif not self._sent_connection and self.request_version == 'HTTP/1.1':
+            self.send_header('Connection', 'close')
+        self._sent_connection = False
         super().end_headers()
 
+    def send_error(self, code, message=None, explain=None):
+        """Error page that leaves the connection open after a well-formed GET/HEAD"""
+        if (self.close_connection or self.command not in ('GET', 'HEAD')
+                or 'Content-Length' in self.headers or 'Transfer-Encoding' in self.headers
+                or code < 200 or code in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED)):
+            # Malformed request or an unread body: the base class closes the connection
+            super().send_error(code, message, explain)
+            return
+        short_message, long_message = self.responses.get(code, ('???', '???'))
+        message = short_message if message is None else message
+        explain = long_message if explain is None else explain
+        self.log_error('code %d, message %s', code, message)
+        body = (self.error_message_format % {
+            'code': code,
+            'message': html.escape(message, quote=False),
+            'explain': html.escape(explain, quote=False),
+        }).encode('UTF-8', 'replace')
+        self.send_response(code, message)
+        self.send_header('Content-Type', self.error_content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
     def guess_type(self, path):
         # Get MIME type for the file
-        guess_result = super().guess_type(path)
+        return guess_mime_type(path)
+
+    def send_head(self):
+        """Serve files with validators, answering hot files from the in-memory cache"""
+        if metrics.enabled and urlsplit(self.path).path == metrics.path:
+            body = metrics.render()
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', metrics.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            return io.BytesIO(body)
+        if live_reload.enabled:
+            url_path = urlsplit(self.path).path
+            if url_path == live_reload.event_path:
+                self.send_response(HTTPStatus.OK)
+                for name, value in EVENT_STREAM_HEADERS.items():
+                    self.send_header(name, value)
+                # No Content-Length: the stream ends when the connection does
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                return EventStream(live_reload)
+            if url_path == live_reload.script_path:
+                self.send_response(HTTPStatus.OK)
+                self.send_header('Content-Type', 'text/javascript')
+                self.send_header('Content-Length', str(len(LIVE_RELOAD_CLIENT)))
+                self.end_headers()
+                return io.BytesIO(LIVE_RELOAD_CLIENT)
+        path = self.translate_path(self.path)
+        if not is_valid_fs_path(path):
+            self.send_error(HTTPStatus.BAD_REQUEST, 'Invalid path')
+            return None
+        if os.path.isdir(path):
+            if not urlsplit(self.path).path.endswith('/'):
+                return super().send_head()
+            for index in ('index.html', 'index.htm'):
+                index_path = os.path.join(path, index)
+                if os.path.isfile(index_path):
+                    path = index_path
+                    break
+            else:
+                return super().send_head()
+        elif path.endswith('/'):
+            return super().send_head()
+
+        path = prerendered_page.resolve(self.directory, path)
+        path, varies_on_accept = image_variants.negotiate(self.directory, path,
+                                                          self.headers.get('Accept'))
+        try:
+            static_file, f = open_static_file(path)
+        except OSError:
+            return super().send_head()
+        if varies_on_accept:
+            static_file = replace(static_file, vary='Accept')
+        link = preload_links.header_for(self.directory, static_file, f)
+        if live_reload.enabled and static_file.mimetype == 'text/html':
+            static_file = live_reload.inject(static_file, f)
+            if f is not None:
+                f.close()
+                f = None
+
+        if self.compression:
+            static_file, f = select_representation(static_file,
+                                                   self.headers.get('Accept-Encoding'), f)
+        if link:
+            static_file = replace(static_file, link=link)
+
+        if is_not_modified(static_file, self.headers.get('If-None-Match'),
+                           self.headers.get('If-Modified-Since')):
+            if f is not None:
+                f.close()
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name, value in static_file.cache_headers().items():
+                self.send_header(name, value)
+            self.end_headers()
+            return None
 
-        # Handle different return value formats
-        if isinstance(guess_result, tuple):
-            mimetype, encoding = guess_result[0], guess_result[1] if len(guess_result) > 1 else None
+        range_header = self.headers.get('Range')
+        if range_header and if_range_allows(self.headers.get('If-Range'), static_file):
+            ranges = parse_range_header(range_header, static_file.length)
+            if ranges == []:
+                if f is not None:
+                    f.close()
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{static_file.length}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+            if ranges:
+                body = RangeBody(static_file, f, ranges)
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                for name, value in body.headers().items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return body
+
+        self.send_response(HTTPStatus.OK)
+        for name, value in static_file.headers().items():
+            self.send_header(name, value)
+        self.end_headers()
+        if f is not None:
+            return f
+        return io.BytesIO(static_file.data)
+
+    def copyfile(self, source, outputfile):
+        if isinstance(source, EventStream):
+            source.stream(outputfile)
+        elif isinstance(source, RangeBody):
+            data = source.static_file.data
+            for part in source.parts:
+                if isinstance(part, bytes):
+                    outputfile.write(part)
+                elif data is not None:
+                    offset, count = part
+                    outputfile.write(memoryview(data)[offset:offset + count])
+                else:
+                    self.transmit_file(source.f, *part, outputfile)
+        elif isinstance(source, io.BytesIO):
+            # Cached body: one write straight from the shared bytes object
+            outputfile.write(source.getvalue())
+        elif self.transfer == 'copy':
+            super().copyfile(source, outputfile)
         else:
-            mimetype, encoding = guess_result, None
+            self.transmit_file(source, 0, os.fstat(source.fileno()).st_size, outputfile)
 
-        # Custom MIME types
-        if path.endswith('.js'):
-            return 'text/javascript'
-        elif path.endswith('.css'):
-            return 'text/css'
-        elif path.endswith('.json'):
-            return 'application/json'
+    def transmit_file(self, f, offset, count, outputfile):
+        """Send `count` bytes of `f` from `offset`, zero-copy when the socket allows it"""
+        if count <= 0:
+            return
+        if self.transfer == 'sendfile' and can_sendfile(self.connection):
+            outputfile.flush()
+            self.connection.sendfile(f, offset, count)
+        else:
+            write_file_range_mmap(outputfile, f, offset, count)
 
-        return mimetype
+    def log_request(self, code='-', size='-'):
+        # Logged once the response is complete, see _request_done()
+        pass
 
     def log_message(self, format, *args):
-        # Custom log format with colors
-        print(f"\033[92m{self.address_string()}\033[0m - \033[94m{format % args}\033[0m")
+        if access_log.format == 'console':
+            log_access(self.address_string(), format % args)
 
-def start_server():
+
+def create_listen_socket(port, backlog, reuse_port=False):
+    """Bind a listening TCP socket, optionally shared via SO_REUSEPORT"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
-        with socketserver.TCPServer(("", port), PortfolioHandler) as httpd:
-            print('\n🚀 Portfolio Website Server Started!')
-            print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
-            print(f'📂 Serving from: {os.getcwd()}')
-            print(f'🌐 Server running at: http://localhost:{port}')
-            print(f'📱 Open in browser: http://localhost:{port}')
-            print('')
-            print('💡 Tips:')
-            print(f'   • Press Ctrl+C to stop the server')
-            print(f'   • Change port: python server.py [port_number]')
-            print(f'   • Default port is 3000 if not specified')
-            print('')
-            print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n')
-
-            # Automatically open browser (optional)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(("", port))
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+# How often idle keep-alive workers check whether to give up their thread
+IDLE_POLL_INTERVAL = 0.25
+
+
+class PortfolioTCPServer(socketserver.TCPServer):
+    """Classic single-threaded server with a configurable listen backlog.
+
+    Pass `sock` to serve on an already listening socket, e.g. one inherited
+    from the pre-fork supervisor.
+    """
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, backlog=5, sock=None):
+        self.request_queue_size = backlog
+        super().__init__(server_address, handler_class, bind_and_activate=sock is None)
+        if sock is not None:
+            self.socket.close()
+            self.socket = sock
+            self.server_address = sock.getsockname()
+
+    def wait_for_request(self, connection, timeout):
+        """Wait for the next request on an idle keep-alive `connection`.
+
+        Returns False to close it instead: after `timeout` seconds, or as soon
+        as a new client is waiting, since this server handles one at a time.
+        """
+        readable, _, _ = select.select([connection, self.socket], [], [], timeout)
+        return connection in readable
+
+
+class ThreadPoolHTTPServer(PortfolioTCPServer):
+    """Serves requests on a bounded pool of worker threads.
+
+    The accept loop blocks once every worker is busy, so excess clients wait
+    in the kernel listen backlog instead of piling up as threads. Closing the
+    server drains in-flight requests for up to `shutdown_timeout` seconds.
+    """
+
+    def __init__(self, server_address, handler_class, threads=8, backlog=64,
+                 shutdown_timeout=10.0, sock=None):
+        self.threads = threads
+        self.shutdown_timeout = shutdown_timeout
+        self._executor = ThreadPoolExecutor(max_workers=threads,
+                                            thread_name_prefix='portfolio-worker')
+        self._slots = threading.BoundedSemaphore(threads)
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        self._waiting = False  # a new connection is waiting for a free worker
+        self._closing = False
+        super().__init__(server_address, handler_class, backlog=backlog, sock=sock)
+
+    def wait_for_request(self, connection, timeout):
+        """Wait for the next request on an idle keep-alive `connection`.
+
+        Returns False to close it instead: after `timeout` seconds, when every
+        worker is busy and a new client is waiting for one, or on shutdown.
+        """
+        deadline = time.monotonic() + timeout
+        while not self._waiting and not self._closing:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([connection], [], [],
+                                           min(remaining, IDLE_POLL_INTERVAL))
+            if readable:
+                return True
+        return False
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self._waiting = True
+            self._slots.acquire()
+            self._waiting = False
+        try:
+            future = self._executor.submit(self._process_request_worker, request, client_address)
+        except RuntimeError:
+            # Executor already shut down
+            self._slots.release()
+            self.shutdown_request(request)
+            return
+        with self._in_flight_lock:
+            self._in_flight.add(future)
+        future.add_done_callback(self._request_done)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def _request_done(self, future):
+        with self._in_flight_lock:
+            self._in_flight.discard(future)
+        self._slots.release()
+
+    def server_close(self):
+        self._closing = True
+        super().server_close()
+        with self._in_flight_lock:
+            pending = list(self._in_flight)
+        drained = True
+        if pending:
+            print(f'⏳ Draining {len(pending)} in-flight request(s)...')
+            done, not_done = wait(pending, timeout=self.shutdown_timeout)
+            if not_done:
+                print(f'⚠️  {len(not_done)} request(s) still running after {self.shutdown_timeout}s')
+                drained = False
+        self._executor.shutdown(wait=drained, cancel_futures=True)
+
+
+class AsyncStaticServer:
+    """asyncio-based HTTP/1.1 static file engine.
+
+    Serves GET/HEAD from `directory` with keep-alive connections, the same
+    MIME types, Cache-Control header and access log as PortfolioHandler, and
+    streams file bodies with loop.sendfile() (zero-copy where supported).
+    """
+
+    server_version = 'PortfolioAsync/1.0'
+    max_header_bytes = 64 * 1024
+
+    def __init__(self, directory, port, backlog=100, keepalive_timeout=15.0,
+                 shutdown_timeout=10.0, sock=None, compression=True, max_keepalive_requests=100):
+        self.directory = os.fspath(directory)
+        self.compression = compression
+        self.port = port
+        self.sock = sock
+        self.backlog = backlog
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        self.shutdown_timeout = shutdown_timeout
+        self._server = None
+        self._connections = set()
+        self._idle = set()
+        self._stopping = None
+        self._responses = {}  # writer -> (status, body length) of the last response
+
+    def translate_path(self, url_path):
+        """Map a URL path onto the served directory, like SimpleHTTPRequestHandler"""
+        path = unquote(url_path, errors='surrogatepass')
+        trailing_slash = path.rstrip().endswith('/')
+        path = posixpath.normpath(path)
+        parts = [part for part in path.split('/') if part and part not in (os.curdir, os.pardir)]
+        path = os.path.join(self.directory, *parts)
+        if trailing_slash:
+            path += '/'
+        return path
+
+    async def start(self):
+        """Bind the listening socket"""
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        if self.sock is not None:
+            self._server = await asyncio.start_server(self._handle_connection, sock=self.sock,
+                                                      backlog=self.backlog)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, port=self.port,
+                                                      backlog=self.backlog, reuse_address=True)
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._stopping.wait()
+            self._server.close()
+            # Drop idle keep-alive connections, let in-flight requests finish
+            for task in list(self._idle):
+                task.cancel()
+            busy = self._connections - self._idle
+            if busy:
+                print(f'⏳ Draining {len(busy)} in-flight request(s)...')
+                await asyncio.wait(busy, timeout=self.shutdown_timeout)
+            remaining = list(self._connections)
+            for task in remaining:
+                task.cancel()
+            await asyncio.gather(*remaining, return_exceptions=True)
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        peer = writer.get_extra_info('peername')
+        client = peer[0] if peer else '-'
+        measure = metrics.enabled
+        if measure:
+            metrics.connection_opened()
+        try:
+            keep_alive = True
+            served = 0
+            while keep_alive and not self._stopping.is_set():
+                self._idle.add(task)
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'),
+                                                  timeout=self.keepalive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send_error(writer, client, '-', HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+                    break
+                finally:
+                    self._idle.discard(task)
+                started = time.perf_counter()
+                if metrics.enabled:
+                    metrics.request_started(reused=served > 0)
+                served += 1
+                last = bool(self.max_keepalive_requests) and served >= self.max_keepalive_requests
+                try:
+                    keep_alive = await self._handle_request(head, writer, client, last)
+                except (ConnectionError, asyncio.CancelledError):
+                    raise
+                except Exception:
+                    # A bug in one request must not take the connection task down silently
+                    traceback.print_exc()
+                    keep_alive = False
+                    if writer not in self._responses:
+                        requestline = head.decode('iso-8859-1').partition('\r\n')[0]
+                        await self._send_error(writer, client, requestline,
+                                               HTTPStatus.INTERNAL_SERVER_ERROR)
+                finally:
+                    self._request_done(head, writer, client, started)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if measure:
+                metrics.connection_closed()
+            self._responses.pop(writer, None)
+            self._connections.discard(task)
+            self._idle.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    def _request_done(self, head, writer, client, started):
+        """Record metrics and the access log entry for the request just served"""
+        duration = time.perf_counter() - started
+        status, length = self._responses.pop(writer, (0, 0))
+        requestline, _, header_block = head.decode('iso-8859-1').partition('\r\n')
+        method, _, rest = requestline.partition(' ')
+        sent = 0 if method == 'HEAD' else length
+        if metrics.enabled:
+            metrics.request_finished(path_class(urlsplit(rest.split(' ', 1)[0]).path), status,
+                                     duration, sent)
+        referer = user_agent = None
+        if access_log.wants_headers:
+            referer = header_value(header_block, 'referer')
+            user_agent = header_value(header_block, 'user-agent')
+        access_log.record(client, requestline, status, sent, duration, referer, user_agent)
+
+    async def _handle_request(self, head, writer, client, last=False):
+        """Serve one request; returns whether the connection stays open"""
+        lines = head.decode('iso-8859-1').split('\r\n')
+        requestline = lines[0]
+        words = requestline.split()
+        if len(words) != 3 or not words[2].startswith('HTTP/'):
+            await self._send_error(writer, client, requestline, HTTPStatus.BAD_REQUEST)
+            return False
+        method, target, version = words
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        if last or has_request_body(headers):
+            # An unread body would be parsed as the next request
+            keep_alive = False
+        elif version == 'HTTP/1.1':
+            keep_alive = connection != 'close'
+        else:
+            keep_alive = connection == 'keep-alive'
+
+        if method not in ('GET', 'HEAD'):
+            await self._send_error(writer, client, requestline, HTTPStatus.NOT_IMPLEMENTED)
+            return False
+
+        url = urlsplit(target)
+        if metrics.enabled and url.path == metrics.path:
+            body = metrics.render()
+            self._write_head(writer, HTTPStatus.OK, {
+                'Content-Type': metrics.content_type,
+                'Content-Length': str(len(body)),
+                'Cache-Control': 'no-store',
+            }, keep_alive)
+            if method != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+            return keep_alive
+        if live_reload.enabled and url.path == live_reload.event_path:
+            await self._send_event_stream(writer, client, requestline)
+            return False
+        if live_reload.enabled and url.path == live_reload.script_path:
+            self._write_head(writer, HTTPStatus.OK, {
+                'Content-Type': 'text/javascript',
+                'Content-Length': str(len(LIVE_RELOAD_CLIENT)),
+            }, keep_alive)
+            if method != 'HEAD':
+                writer.write(LIVE_RELOAD_CLIENT)
+            await writer.drain()
+            return keep_alive
+
+        path = self.translate_path(url.path)
+        if not is_valid_fs_path(path):
+            await self._send_error(writer, client, requestline, HTTPStatus.BAD_REQUEST, keep_alive)
+            return keep_alive
+        # Opening a file can load and hash it, reload manifests or compress it: keep
+        # all of that off the loop and leave only the socket writes here
+        static_file, f, error = await asyncio.get_running_loop().run_in_executor(
+            None, self._open_representation, url, path, headers)
+        if error is not None:
+            status, extra_headers = error
+            await self._send_error(writer, client, requestline, status, keep_alive,
+                                   extra_headers=extra_headers)
+            return keep_alive
+
+        try:
+            if is_not_modified(static_file, headers.get('if-none-match'),
+                               headers.get('if-modified-since')):
+                status = HTTPStatus.NOT_MODIFIED
+                self._write_head(writer, status, static_file.cache_headers(), keep_alive)
+                await writer.drain()
+            else:
+                ranges = None
+                if 'range' in headers and if_range_allows(headers.get('if-range'), static_file):
+                    ranges = parse_range_header(headers['range'], static_file.length)
+                if ranges == []:
+                    status = HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+                    self._write_head(writer, status, {
+                        'Content-Range': f'bytes */{static_file.length}',
+                        'Content-Length': '0',
+                    }, keep_alive)
+                    await writer.drain()
+                elif ranges:
+                    status = HTTPStatus.PARTIAL_CONTENT
+                    await self._send_ranges(writer, method, static_file, f, ranges, keep_alive)
+                else:
+                    status = HTTPStatus.OK
+                    await self._send_file(writer, method, static_file, f, keep_alive)
+        finally:
+            if f is not None:
+                f.close()
+        return keep_alive
+
+    def _open_representation(self, url, path, headers):
+        """Find the representation to send for `path` (blocking; runs in an executor).
+
+        Returns (static_file, f, None), or (None, None, (status, extra_headers))
+        when the request gets an error or redirect instead.
+        """
+        if os.path.isdir(path):
+            if not url.path.endswith('/'):
+                location = url.path + '/' + ('?' + url.query if url.query else '')
+                return None, None, (HTTPStatus.MOVED_PERMANENTLY, {'Location': location})
+            for index in ('index.html', 'index.htm'):
+                index_path = os.path.join(path, index)
+                if os.path.isfile(index_path):
+                    path = index_path
+                    break
+            else:
+                return None, None, (HTTPStatus.NOT_FOUND, None)
+
+        if path.endswith('/'):
+            return None, None, (HTTPStatus.NOT_FOUND, None)
+        path = prerendered_page.resolve(self.directory, path)
+        path, varies_on_accept = image_variants.negotiate(self.directory, path,
+                                                          headers.get('accept'))
+        try:
+            static_file, f = open_static_file(path)
+        except OSError:
+            return None, None, (HTTPStatus.NOT_FOUND, None)
+        if varies_on_accept:
+            static_file = replace(static_file, vary='Accept')
+
+        try:
+            link = preload_links.header_for(self.directory, static_file, f)
+            if live_reload.enabled and static_file.mimetype == 'text/html':
+                static_file = live_reload.inject(static_file, f)
+                if f is not None:
+                    f.close()
+                    f = None
+            if self.compression:
+                static_file, f = select_representation(static_file,
+                                                       headers.get('accept-encoding'), f)
+        except BaseException:
+            if f is not None:
+                f.close()
+            raise
+        if link:
+            static_file = replace(static_file, link=link)
+        return static_file, f, None
+
+    async def _send_event_stream(self, writer, client, requestline):
+        """Stream live reload events until the client goes away or the server stops"""
+        loop = asyncio.get_running_loop()
+        events = live_reload.subscribe(loop)
+        try:
+            self._write_head(writer, HTTPStatus.OK, EVENT_STREAM_HEADERS, keep_alive=False)
+            writer.write(b'retry: 1000\n\n')
+            await writer.drain()
+            last_write = loop.time()
+            while not self._stopping.is_set():
+                try:
+                    payload = await asyncio.wait_for(events.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    if loop.time() - last_write < live_reload.heartbeat:
+                        continue
+                    writer.write(b': ping\n\n')
+                else:
+                    if payload is None:
+                        break
+                    writer.write(f'event: change\ndata: {payload}\n\n'.encode('utf-8'))
+                await writer.drain()
+                last_write = loop.time()
+        finally:
+            live_reload.unsubscribe(loop, events)
+
+    async def _send_file(self, writer, method, static_file, f, keep_alive):
+        self._write_head(writer, HTTPStatus.OK, static_file.headers(), keep_alive)
+        if method == 'HEAD' or not static_file.length:
+            await writer.drain()
+        elif f is None:
+            writer.write(static_file.data)
+            await writer.drain()
+        else:
+            await writer.drain()
+            await asyncio.get_running_loop().sendfile(writer.transport, f, 0, static_file.length)
+
+    async def _send_ranges(self, writer, method, static_file, f, ranges, keep_alive):
+        body = RangeBody(static_file, None, ranges)
+        self._write_head(writer, HTTPStatus.PARTIAL_CONTENT, body.headers(), keep_alive)
+        if method == 'HEAD':
+            await writer.drain()
+            return
+        loop = asyncio.get_running_loop()
+        for part in body.parts:
+            if isinstance(part, bytes):
+                writer.write(part)
+            elif f is None:
+                offset, count = part
+                writer.write(memoryview(static_file.data)[offset:offset + count])
+            else:
+                offset, count = part
+                await writer.drain()
+                await loop.sendfile(writer.transport, f, offset, count)
+        await writer.drain()
+
+    def _write_head(self, writer, status, headers, keep_alive):
+        self._responses[writer] = (status.value, int(headers.get('Content-Length', 0)))
+        lines = [
+            f'HTTP/1.1 {status.value} {status.phrase}',
+            f'Server: {self.server_version}',
+            f'Date: {email.utils.formatdate(usegmt=True)}',
+        ]
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        lines.append(f'Connection: {"keep-alive" if keep_alive else "close"}')
+        if 'Cache-Control' not in headers:
+            lines.append(f'Cache-Control: {config_loader.settings.cache_control}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', 'strict'))
+
+    async def _send_error(self, writer, client, requestline, status, keep_alive=False,
+                          extra_headers=None):
+        body = (f'<!DOCTYPE HTML>\n<html><head><title>Error response</title></head>'
+                f'<body><h1>Error response</h1><p>Error code: {status.value}</p>'
+                f'<p>Message: {status.phrase}.</p></body></html>\n').encode('utf-8')
+        headers = {'Content-Type': 'text/html;charset=utf-8', 'Content-Length': str(len(body))}
+        headers.update(extra_headers or {})
+        self._write_head(writer, status, headers, keep_alive)
+        if not requestline.startswith('HEAD '):
+            writer.write(body)
+        await writer.drain()
+
+
+def create_server(options, sock=None):
+    """Build the listening server for the selected serving mode"""
+    address = ("", options.port)
+    if options.threads > 0:
+        return ThreadPoolHTTPServer(address, PortfolioHandler, threads=options.threads,
+                                    backlog=options.backlog,
+                                    shutdown_timeout=options.shutdown_timeout, sock=sock)
+    return PortfolioTCPServer(address, PortfolioHandler, backlog=options.backlog, sock=sock)
+
+
+class PreforkSupervisor:
+    """Runs `workers` forked server processes on one port and keeps them alive.
+
+    Workers either inherit a socket bound by the supervisor or, with
+    `reuse_port`, bind their own SO_REUSEPORT socket so the kernel balances
+    connections between them. Crashed workers are restarted. SIGTERM/SIGINT
+    stop every worker gracefully; SIGHUP re-reads the config, re-parses the
+    options from it and `argv` and replaces the workers one generation at a
+    time. The listening socket is not rebuilt, so changes to the keys in
+    `restart_options` only take effect after a restart.
+    """
+
+    restart_delay = 1.0
+    restart_options = ('port', 'backlog', 'reuse_port')
+
+    def __init__(self, options, argv=None):
+        self.options = options
+        self.argv = argv  # None: the process's command line
+        self.sock = None
+        self.workers = {}  # pid -> (generation, start time)
+        self.generation = 0
+        self._stopping = False
+        self._reload_requested = False
+
+    def start(self):
+        options = self.options
+        if options.reuse_port:
+            # Fail fast if the port is taken; each worker binds its own socket
+            create_listen_socket(options.port, options.backlog, reuse_port=True).close()
+        else:
+            self.sock = create_listen_socket(options.port, options.backlog)
+        for _ in range(options.workers):
+            self.spawn_worker()
+
+    def spawn_worker(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                # Ctrl+C reaches the whole process group; let the supervisor decide
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGHUP, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                sock = self.sock
+                if sock is None:
+                    sock = create_listen_socket(self.options.port, self.options.backlog,
+                                                reuse_port=True)
+                serve(self.options, sock)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = (self.generation, time.monotonic())
+        return pid
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_reload)
+        try:
+            while not self._stopping:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self.reload()
+                self.reap_workers()
+                time.sleep(0.5)
+        finally:
+            self.stop()
+
+    def reap_workers(self):
+        """Collect exited workers and restart the ones that crashed"""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            generation, started = self.workers.pop(pid, (None, 0.0))
+            if self._stopping or generation != self.generation:
+                continue
+            print(f'⚠️  Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting')
+            if time.monotonic() - started < self.restart_delay:
+                time.sleep(self.restart_delay)
+            self.spawn_worker()
+
+    def reload(self):
+        """Start a fresh generation of workers, then retire the old one"""
+        print('🔄 SIGHUP received: reloading configuration and workers...')
+        config_loader.reload()
+        self.options = self.reload_options()
+        old_pids = list(self.workers)
+        self.generation += 1
+        for _ in range(self.options.workers):
+            self.spawn_worker()
+        self._signal_workers(signal.SIGTERM, old_pids)
+
+    def reload_options(self):
+        """Options re-parsed against the reloaded config; socket settings stay as they are"""
+        try:
+            options = parse_args(self.argv)
+        except SystemExit:
+            print('⚠️  Could not parse the reloaded options; keeping the current ones')
+            return self.options
+        if options.workers < 1:
+            print('⚠️  workers must stay above 0 while pre-forking; keeping '
+                  f'{self.options.workers}')
+            options.workers = self.options.workers
+        for name in self.restart_options:
+            if getattr(options, name) != getattr(self.options, name):
+                print(f'⚠️  {name} changed to {getattr(options, name)!r}; '
+                      'restart the server to apply it')
+                setattr(options, name, getattr(self.options, name))
+        changed = [name for name, value in vars(options).items()
+                   if getattr(self.options, name, None) != value]
+        if changed:
+            print(f"⚙️  Applying {', '.join(changed)}")
+        return options
+
+    def stop(self):
+        """Forward SIGTERM, wait for workers to drain, then kill stragglers"""
+        self._stopping = True
+        self._signal_workers(signal.SIGTERM, list(self.workers))
+        deadline = time.monotonic() + self.options.shutdown_timeout + 1.0
+        while self.workers and time.monotonic() < deadline:
+            self.reap_workers()
+            time.sleep(0.1)
+        self._signal_workers(signal.SIGKILL, list(self.workers))
+        for pid in list(self.workers):
             try:
-                webbrowser.open(f'http://localhost:{port}')
-                print(f'🌐 Opening browser to http://localhost:{port}\n')
-            except:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
                 pass
+            self.workers.pop(pid, None)
+        if self.sock is not None:
+            self.sock.close()
 
+    def _signal_workers(self, signum, pids):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+
+    def _request_reload(self, signum, frame):
+        self._reload_requested = True
+
+
+def parse_args(argv=None):
+    """Parse command line options, using portfolio-config.js for defaults"""
+    settings = config_loader.settings
+    parser = argparse.ArgumentParser(description='Simple HTTP Server for Portfolio Website')
+    parser.add_argument('port', nargs='?', type=int, default=settings.default_port,
+                        help=f'port to listen on (default: {settings.default_port})')
+    parser.add_argument('--threads', type=int, default=settings.threads,
+                        help='serve concurrently with a pool of N worker threads (0 = single-threaded)')
+    parser.add_argument('--backlog', type=int, default=settings.backlog,
+                        help='listen backlog for pending connections')
+    parser.add_argument('--shutdown-timeout', type=float, default=settings.shutdown_timeout,
+                        help='seconds to wait for in-flight requests on shutdown')
+    parser.add_argument('--engine', choices=['stdlib', 'asyncio'], default=settings.engine,
+                        help='serving backend: stdlib PortfolioHandler or the asyncio engine')
+    parser.add_argument('--keepalive-timeout', type=float, default=settings.keepalive_timeout,
+                        help='idle seconds before a keep-alive connection is closed')
+    parser.add_argument('--max-keepalive-requests', type=int,
+                        default=settings.max_keepalive_requests,
+                        help='requests served on one connection before closing it (0 = unlimited)')
+    parser.add_argument('--workers', type=int, default=settings.workers,
+                        help='pre-fork N worker processes sharing the port (0 = single process)')
+    parser.add_argument('--reuse-port', action=argparse.BooleanOptionalAction,
+                        default=settings.reuse_port,
+                        help='let each worker bind its own SO_REUSEPORT socket')
+    parser.add_argument('--cache-size', type=int, default=settings.cache_size,
+                        help='in-memory file cache budget in bytes (0 = disabled)')
+    parser.add_argument('--cache-max-file', type=int, default=settings.cache_max_file,
+                        help='largest file in bytes the in-memory cache will hold')
+    parser.add_argument('--compression', action=argparse.BooleanOptionalAction,
+                        default=settings.compression,
+                        help='serve gzip/brotli encoded text assets when the client accepts them')
+    parser.add_argument('--transfer', choices=['sendfile', 'mmap', 'copy'], default=settings.transfer,
+                        help='how the stdlib engine sends file bodies (default: zero-copy sendfile)')
+    parser.add_argument('--browser', dest='open_browser', action=argparse.BooleanOptionalAction,
+                        default=settings.open_browser,
+                        help='open the site in a web browser on startup')
+    parser.add_argument('--root', default=settings.root,
+                        help='directory to serve, e.g. dist after `python build.py fingerprint`')
+    parser.add_argument('--prerender', action=argparse.BooleanOptionalAction,
+                        default=settings.prerender,
+                        help='serve index.prerendered.html (python build.py prerender) for index.html')
+    parser.add_argument('--watch', action=argparse.BooleanOptionalAction, default=settings.watch,
+                        help='watch the served files and push changes to open pages (live reload)')
+    parser.add_argument('--metrics', action=argparse.BooleanOptionalAction,
+                        default=settings.metrics,
+                        help='expose Prometheus-style request metrics at /__metrics')
+    parser.add_argument('--preload-links', action=argparse.BooleanOptionalAction,
+                        default=settings.preload_links,
+                        help='send Link: rel=preload headers for the stylesheets and scripts '
+                             'of HTML pages')
+    parser.add_argument('--access-log', metavar='PATH', default=settings.access_log,
+                        help="write a structured access log to PATH ('-' = stdout); "
+                             "default: coloured console lines")
+    parser.add_argument('--access-log-format', choices=['json', 'combined', 'common'],
+                        default=settings.access_log_format,
+                        help='access log line format (default: JSON lines)')
+    parser.add_argument('--access-log-max-bytes', type=int, default=settings.access_log_max_bytes,
+                        help='rotate the access log when it would exceed this size (0 = never)')
+    parser.add_argument('--access-log-backups', type=int, default=settings.access_log_backups,
+                        help='rotated access logs to keep')
+    parser.add_argument('--access-log-rotate', dest='access_log_rotate_seconds', type=float,
+                        default=settings.access_log_rotate_seconds, metavar='SECONDS',
+                        help='also rotate the access log every SECONDS (0 = never)')
+    return parser.parse_args(argv)
+
+
+def announce_server(options):
+    """Print the startup banner and open the browser"""
+    port = options.port
+    print('\n🚀 Portfolio Website Server Started!')
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━')
+    print(f'📂 Serving from: {os.path.abspath(options.root)}')
+    print(f'🌐 Server running at: http://localhost:{port}')
+    print(f'📱 Open in browser: http://localhost:{port}')
+    if options.workers > 0:
+        sharing = 'SO_REUSEPORT' if options.reuse_port else 'shared socket'
+        print(f'🧬 Worker processes: {options.workers} ({sharing}, supervisor pid {os.getpid()})')
+    if options.engine == 'asyncio':
+        print(f'⚡ Engine: asyncio (keep-alive timeout {options.keepalive_timeout}s)')
+    elif options.threads > 0:
+        print(f'🧵 Worker threads: {options.threads} (backlog {options.backlog}, '
+              f'keep-alive timeout {options.keepalive_timeout}s)')
+    print('')
+    print('💡 Tips:')
+    print(f'   • Press Ctrl+C to stop the server')
+    print(f'   • Change port: python server.py [port_number]')
+    print(f'   • Serve concurrently: python server.py --threads 16')
+    print(f'   • Try the asyncio engine: python server.py --engine asyncio')
+    print(f'   • Use every core: python server.py --workers {os.cpu_count() or 1}')
+    print(f'   • Default port is 3000 if not specified')
+    print('')
+    print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n')
+
+    # Automatically open browser (optional)
+    if not options.open_browser:
+        return
+    try:
+        webbrowser.open(f'http://localhost:{port}')
+        print(f'🌐 Opening browser to http://localhost:{port}\n')
+    except (webbrowser.Error, OSError):
+        pass
+
+
+async def run_async_server(options, sock=None, on_ready=None):
+    server = AsyncStaticServer(os.path.abspath(options.root), options.port, backlog=options.backlog,
+                               keepalive_timeout=options.keepalive_timeout,
+                               shutdown_timeout=options.shutdown_timeout, sock=sock,
+                               compression=options.compression,
+                               max_keepalive_requests=options.max_keepalive_requests)
+    await server.start()
+    if on_ready:
+        on_ready(options)
+    await server.serve_forever()
+
+
+def serve(options, sock=None, on_ready=None):
+    """Run the selected engine until Ctrl+C or SIGTERM"""
+    file_cache.max_bytes = options.cache_size
+    file_cache.max_file_bytes = options.cache_max_file
+    PortfolioHandler.compression = options.compression
+    PortfolioHandler.keepalive_timeout = options.keepalive_timeout
+    PortfolioHandler.max_keepalive_requests = options.max_keepalive_requests
+    PortfolioHandler.transfer = options.transfer
+    PortfolioHandler.serve_root = os.path.abspath(options.root)
+    prerendered_page.enabled = options.prerender
+    metrics.enabled = options.metrics
+    preload_links.enabled = options.preload_links
+    access_log.configure(options.access_log, options.access_log_format,
+                         options.access_log_max_bytes, options.access_log_backups,
+                         options.access_log_rotate_seconds)
+    access_log.start()
+    watcher = None
+    if options.watch:
+        if options.engine == 'stdlib' and options.threads < WATCH_MIN_THREADS:
+            # Each open page holds an event stream on a worker thread
+            options.threads = WATCH_MIN_THREADS
+        live_reload.enabled = True
+        root = PortfolioHandler.serve_root
+        watcher = FileWatcher(root, lambda paths: invalidate_changed(root, paths)).start()
+        print(f'👀 Watching {root} for changes ({watcher.backend})')
+    try:
+        if options.engine == 'asyncio':
+            asyncio.run(run_async_server(options, sock, on_ready))
+            return
+        with create_server(options, sock) as httpd:
+            # Stop cleanly on SIGTERM; shutdown() must run off the serving thread
+            signal.signal(signal.SIGTERM,
+                          lambda signum, frame: threading.Thread(target=httpd.shutdown).start())
+            if on_ready:
+                on_ready(options)
             try:
                 httpd.serve_forever()
             except KeyboardInterrupt:
-                print('\n🛑 Server stopped. Goodbye!')
+                pass
+            finally:
+                # Let open event streams end before the server drains requests
+                live_reload.close()
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        live_reload.close()
+        access_log.close()
+        if file_cache.enabled:
+            file_cache.report()
+
+
+def start_server(options):
+    port = options.port
+    try:
+        if options.workers > 0:
+            if not hasattr(os, 'fork'):
+                print('❌ --workers requires a platform with os.fork()')
+                sys.exit(1)
+            supervisor = PreforkSupervisor(options)
+            supervisor.start()
+            announce_server(options)
+            supervisor.run()
+        else:
+            serve(options, on_ready=announce_server)
+        print('\n🛑 Server stopped. Goodbye!')
 
     except OSError as e:
         if e.errno == 48:  # Address already in use
@@ -114,10 +2879,12 @@ def start_server():
         sys.exit(1)
 
 if __name__ == "__main__":
+    options = parse_args()
+
     # Check if index.html exists
-    if not Path("index.html").exists():
-        print("❌ Error: index.html not found!")
+    if not (Path(options.root) / "index.html").exists():
+        print(f"❌ Error: index.html not found in {os.path.abspath(options.root)}!")
         print("Make sure you're running this script from the portfolio website directory.")
         sys.exit(1)
 
-    start_server()
+    start_server(options)
@@ -4,68 +4,82 @@
 The Smart Pull System - Handles Pull Conflicts Like a Boss!
 """
 
-import subprocess
+import argparse
 import sys
 import os
 import json
 from datetime import datetime
 import time
 
+from git_runner import (GitRunner, RetryPolicy, add_retry_arguments, is_auth_error,
+                        is_network_error, write_report)
+from repo_state import RepoState, RepoStateError, read_repo_state, target_branch
+
+LOCAL_CHANGES_POLICIES = ('ask', 'abort', 'continue')
+
+
 class GitSyncMaster:
-    def __init__(self):
-        self.current_dir = os.getcwd()
+    def __init__(self, repo_dir=None, on_local_changes='ask', retry=None):
+        self.current_dir = repo_dir or os.getcwd()
+        self.on_local_changes = on_local_changes
+        self.retry = retry or RetryPolicy()
+        self.outcome = None
         self.repo_name = "Portfolio-Project"
         self.current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    def run_command(self, command, capture_output=False, encoding='utf-8'):
-        """Enhanced command runner with error handling"""
-        try:
-            if capture_output:
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    encoding=encoding,
-                    cwd=self.current_dir
-                )
-                return result.returncode, result.stdout.strip(), result.stderr.strip()
-            else:
-                result = subprocess.run(command, shell=True, cwd=self.current_dir)
-                return result.returncode, "", ""
-        except Exception as e:
-            print(f"❌ Command failed: {e}")
-            return 1, "", str(e)
+        self.state = None
+        self.git = GitRunner(self.current_dir)
+
+    def repo_state(self, refresh=False):
+        """Snapshot of the repository from one `git status` call, reused until `refresh`"""
+        if self.state is None or refresh:
+            try:
+                self.state = read_repo_state(self.current_dir, self.git)
+            except RepoStateError as e:
+                print(f"⚠️  Could not read git status: {e}")
+                self.state = RepoState()
+        return self.state
 
     def check_git_status(self):
         """Check current git status and detect any uncommitted changes"""
         print("🔍 Checking git status...")
 
-        code, stdout, stderr = self.run_command("git status --porcelain", capture_output=True)
-        has_local_changes = len(stdout.strip()) > 0
+        state = self.repo_state()
+        has_local_changes = state.has_changes
 
         if has_local_changes:
             print("⚠️  WARNING: You have uncommitted local changes!")
             print("Details:")
-            for line in stdout.split('\n'):
-                if line.strip():
-                    print(f"  {line}")
+            for entry in state.entries:
+                print(f"  {entry.porcelain()}")
             print("\n💡 Consider committing your changes first with: python update.py")
 
         return has_local_changes
 
     def intelligent_fetch(self):
-        """Intelligent fetch with progress feedback"""
+        """Intelligent fetch with progress feedback; network errors are retried"""
         print("📡 Fetching latest changes from GitHub...")
 
-        code, stdout, stderr = self.run_command("git fetch origin --prune", capture_output=True)
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.perf_counter()
+            code, stdout, stderr = self.git.run("fetch", "origin", "--prune", capture_output=True,
+                                                timeout=self.retry.remaining())
+            error_type = "success" if code == 0 else self.analyze_pull_error(stderr)['type']
+            self.retry.record("fetch", "origin", attempt, time.perf_counter() - started, error_type)
+
+            if code == 0:
+                print("✅ Successfully fetched remote changes!")
+                return True
 
-        if code == 0:
-            print("✅ Successfully fetched remote changes!")
-            return True
-        else:
             print(f"❌ Fetch failed: {stderr}")
-            return False
+            delay = self.retry.next_delay(attempt, error_type)
+            if delay is None:
+                if self.retry.give_up_reason(attempt, error_type) == "deadline_exceeded":
+                    print("⏰ Sync deadline reached.")
+                return False
+            print(f"⏳ Retrying in {delay:.1f} seconds... ({self.retry.max_attempts - attempt} attempts left)")
+            time.sleep(delay)
 
     def analyze_pull_error(self, stderr):
         """Analyze pull error and categorize it"""
@@ -74,13 +88,16 @@ class GitSyncMaster:
         if any(keyword in error_lower for keyword in ['merge conflict', 'automatic merge failed', 'conflicts']):
             return {'type': 'merge_conflict', 'severity': 'critical'}
 
-        elif any(keyword in error_lower for keyword in ['diverged', 'branch has diverged']):
+        elif any(keyword in error_lower for keyword in ['diverged', 'branch has diverged', 'divergent branches']):
             return {'type': 'diverged', 'severity': 'moderate'}
 
-        elif 'permission denied' in error_lower or 'authentication failed' in error_lower:
+        elif is_auth_error(error_lower):
             return {'type': 'auth_error', 'severity': 'critical'}
 
-        elif any(keyword in error_lower for keyword in ['could not resolve', 'unknown revision']):
+        elif is_network_error(error_lower):
+            return {'type': 'network', 'severity': 'minor'}
+
+        elif any(keyword in error_lower for keyword in ["couldn't find remote ref", 'could not resolve', 'unknown revision']):
             return {'type': 'branch_not_found', 'severity': 'moderate'}
 
         else:
@@ -93,17 +110,17 @@ class GitSyncMaster:
         # Check what changes are coming
         print("📊 Analyzing incoming changes...")
 
-        code, stdout, stderr = self.run_command("git log HEAD..origin/main --oneline -5", capture_output=True)
-        if code == 0 and stdout.strip():
-            print(f"📥 Incoming commits ({len(stdout.split('\n'))}):")
-            for line in stdout.split('\n')[:5]:
-                if line.strip():
-                    print(f"  {line}")
+        incoming, _ = self.git.divergence("HEAD", f"origin/{branch}")
+        if incoming:
+            print(f"📥 Incoming commits ({len(incoming)}):")
+            for oid in incoming[:5]:
+                print(f"  {self.git.oneline(oid)}")
         else:
             print("ℹ️  No incoming commits detected.")
 
         # Try rebase (cleaner history)
-        code, stdout, stderr = self.run_command(f"git pull --rebase origin {branch}", capture_output=True)
+        code, stdout, stderr = self.git.run("pull", "--rebase", "origin", branch, capture_output=True,
+                                            timeout=self.retry.remaining())
 
         if code == 0:
             print("✅ Successfully rebased your changes on top of remote!")
@@ -116,10 +133,10 @@ class GitSyncMaster:
                 print("🔄 Falling back to merge strategy...")
 
                 # Abort rebase and try merge
-                self.run_command("git rebase --abort")
-                time.sleep(1)
+                self.git.run("rebase", "--abort")
 
-                code, stdout, stderr = self.run_command(f"git pull origin {branch}", capture_output=True)
+                code, stdout, stderr = self.git.run("pull", "--no-rebase", "origin", branch,
+                                                    capture_output=True, timeout=self.retry.remaining())
 
                 if code == 0:
                     print("✅ Successfully merged remote changes!")
@@ -131,50 +148,58 @@ class GitSyncMaster:
                 print(f"❌ Auto-resolution failed: {stderr}")
                 return False
 
-    def intelligent_pull(self, branch="main", max_attempts=3):
-        """Intelligent pull with conflict resolution"""
+    def intelligent_pull(self, branch="main"):
+        """Intelligent pull with conflict resolution; retries follow self.retry"""
         attempt = 0
-        while attempt < max_attempts:
+        while True:
+            if self.retry.expired():
+                print("⏰ Sync deadline reached.")
+                return False, "deadline_exceeded"
             attempt += 1
             print(f"\n🔄 Pull Attempt #{attempt} (Branch: {branch})")
 
             # Try pulling
-            code, stdout, stderr = self.run_command(f"git pull origin {branch}", capture_output=True)
+            started = time.perf_counter()
+            code, stdout, stderr = self.git.run("pull", "origin", branch, capture_output=True,
+                                                timeout=self.retry.remaining())
+            error_type = "success" if code == 0 else self.analyze_pull_error(stderr)['type']
+            self.retry.record("pull", branch, attempt, time.perf_counter() - started, error_type)
 
             if code == 0:
                 print("✅ Successfully pulled latest changes!")
                 return True, "success"
 
-            # Analyze error
-            error_analysis = self.analyze_pull_error(stderr)
-
-            if error_analysis['type'] == 'diverged':
+            if error_type == 'diverged':
                 print("🔄 Branches have diverged. Attempting auto-resolution...")
                 if self.auto_resolve_diverged(branch):
                     return True, "auto_resolved"
+                return False, "diverged"
 
-            elif error_analysis['type'] == 'merge_conflict':
+            elif error_type == 'merge_conflict':
                 print("💥 Major merge conflict detected!")
                 self.generate_conflict_resolution_guide("merge", branch)
                 return False, "merge_conflict"
 
-            elif error_analysis['type'] == 'branch_not_found':
-                print(f"📝 Branch '{branch}' not found on remote. Trying alternatives...")
-                continue  # Will try different branches in try_alternative_branches
+            elif error_type == 'branch_not_found':
+                print(f"📝 Branch '{branch}' not found on remote.")
+                return False, "branch_not_found"
 
-            elif error_analysis['type'] == 'auth_error':
+            elif error_type == 'auth_error':
                 print("🔐 Authentication failed. Please check your GitHub credentials.")
                 return False, "auth_error"
 
+            elif error_type == 'network':
+                print(f"📡 Network error: {stderr}")
+
             else:
                 print(f"⚠️  Pull failed with unknown error: {stderr}")
 
-                # Wait before retry
-                if attempt < max_attempts:
-                    print(f"⏳ Retrying in 3 seconds... ({max_attempts - attempt} attempts left)")
-                    time.sleep(3)
-
-        return False, "max_attempts_exceeded"
+            # Wait before retry
+            delay = self.retry.next_delay(attempt, error_type)
+            if delay is None:
+                return False, self.retry.give_up_reason(attempt, error_type)
+            print(f"⏳ Retrying in {delay:.1f} seconds... ({self.retry.max_attempts - attempt} attempts left)")
+            time.sleep(delay)
 
     def generate_conflict_resolution_guide(self, conflict_type, branch):
         """Generate detailed conflict resolution guide"""
@@ -218,7 +243,7 @@ class GitSyncMaster:
                 f.write("   # Your changes remain, remote changes are ignored\n\n")
 
                 f.write("OPTION 3 - ACCEPT REMOTE CHANGES (DISCARD LOCAL):\n")
-                f.write("   git reset --hard origin/main\n")
+                f.write(f"   git reset --hard origin/{branch}\n")
                 f.write("   ⚠️  WARNING: This will lose ALL your local changes!\n\n")
 
             elif conflict_type == "rebase":
@@ -238,12 +263,8 @@ class GitSyncMaster:
             f.write("CONFLICTING FILES:\n")
             f.write("------------------\n")
 
-            # Check for conflicts
-            code, stdout, stderr = self.run_command("git status --porcelain", capture_output=True)
-            conflict_files = []
-            for line in stdout.split('\n'):
-                if 'UU' in line or line.startswith('DD'):
-                    conflict_files.append(line[3:])  # Remove status codes
+            # The failed merge changed the tree, so take a fresh snapshot
+            conflict_files = [entry.path for entry in self.repo_state(refresh=True).conflicted]
 
             if conflict_files:
                 for file in conflict_files:
@@ -267,39 +288,51 @@ class GitSyncMaster:
         print("📖 Open this file to see detailed resolution steps!")
         print("🎨 Consider using VS Code's Git integration for visual conflict resolution!")
 
-    def try_alternative_branches(self):
-        """Try alternative branch names if main fails"""
-        print("\n🔄 Trying alternative branch names...")
-
-        branches_to_try = ['master', 'develop', 'staging', 'dev']
-
-        for branch in branches_to_try:
-            print(f"🔄 Attempting to sync with '{branch}' branch...")
+    def resolve_target_branch(self):
+        """The remote branch to sync with, chosen once from the refs the fetch just updated.
 
-            success, result_type = self.intelligent_pull(branch)
-            if success:
-                return True, branch
-            elif result_type in ["merge_conflict", "auth_error"]:
-                return False, f"conflict_on_{branch}"
+        The current branch's upstream wins, then the current branch itself,
+        then the remote's default branch. None when the remote has no branches.
+        """
+        state = self.repo_state()
+        remote = self.git.remote_branches("origin", fetched=True, timeout=self.retry.remaining())
+        branch = target_branch(state, remote)
+        if remote is None:
+            print(f"⚠️  Could not list the remote's branches; syncing with '{branch}'")
+            return branch
 
-        return False, "all_branches_failed"
+        if branch:
+            print(f"🎯 Target branch: '{branch}' (remote default: {remote.default or 'unknown'}, "
+                  f"{len(remote.heads)} branch(es) from {remote.source})")
+        return branch
 
     def backup_strategy(self):
         """Backup current state before risky operations"""
         print("🛒 Creating safety backup...")
 
         backup_branch = f"backup_before_sync_{self.current_time}"
-        code, stdout, stderr = self.run_command(f"git checkout -b {backup_branch}")
+        code, stdout, stderr = self.git.run("checkout", "-b", backup_branch)
 
         if code == 0:
             print(f"✅ Backup created: '{backup_branch}'")
             # Switch back to original branch
-            self.run_command("git checkout -")
+            self.git.run("checkout", "-")
             return backup_branch
         else:
             print(f"⚠️  Backup failed: {stderr}")
             return None
 
+    def continue_with_local_changes(self):
+        """Ask whether to sync over local changes, or apply the batch-mode policy"""
+        if self.on_local_changes != 'ask':
+            print(f"🤖 Local changes policy: {self.on_local_changes}")
+            return self.on_local_changes == 'continue'
+        try:
+            choice = input("Continue anyway? (y/N): ").lower().strip()
+        except EOFError:  # no terminal to ask
+            return False
+        return choice in ['y', 'yes']
+
     def main_workflow(self):
         """Main intelligent sync workflow"""
         print("🔄 Enhanced GitHub Sync Script Starting...")
@@ -319,9 +352,9 @@ class GitSyncMaster:
             print("2. Or stash them temporarily: git stash")
             print("3. Then run sync again\n")
 
-            choice = input("Continue anyway? (y/N): ").lower().strip()
-            if choice not in ['y', 'yes']:
+            if not self.continue_with_local_changes():
                 print("❌ Sync cancelled by user.")
+                self.outcome = "local_changes"
                 return False
 
             # Create backup anyway
@@ -330,11 +363,21 @@ class GitSyncMaster:
         # Step 2: Fetch latest changes
         if not self.intelligent_fetch():
             print("❌ Cannot proceed without fetching remote changes.")
+            self.outcome = "fetch_failed"
+            return False
+
+        # Step 3: Pick the branch once, from what the remote actually has
+        branch = self.resolve_target_branch()
+        if branch is None:
+            print("❌ The remote has no branches to sync with yet.")
+            print("💡 Push your work first: python update.py")
+            self.outcome = "branch_not_found"
             return False
 
-        # Step 3: Try intelligent pull
+        # Step 4: Try intelligent pull
         print("\n🔄 Attempting to sync with remote...")
-        success, result = self.intelligent_pull()
+        success, result = self.intelligent_pull(branch)
+        self.outcome = result
 
         if success:
             print("\n🎉 SUCCESS! Repository synchronized with GitHub!")
@@ -345,21 +388,11 @@ class GitSyncMaster:
 
             return True
         else:
-            # Step 4: Try alternative approaches
-            if result in ["max_attempts_exceeded", "diverged"]:
-                print("\n🔄 Trying alternative branches...")
-
+            if result in ["max_attempts_exceeded", "diverged", "branch_not_found"]:
+                print(f"\n❌ Could not sync with '{branch}'.")
                 if has_local_changes:
                     print("⚠️  WARNING: You have local changes - be careful!")
-
-                alt_success, alt_result = self.try_alternative_branches()
-
-                if alt_success:
-                    print(f"\n✅ SUCCESS! Synced with alternative branch: {alt_result}")
-                    return True
-                else:
-                    print("❌ All sync attempts failed.")
-                    print("💡 Try manual sync or check your internet connection.")
+                print("💡 Try manual sync or check your internet connection.")
             elif result in ["merge_conflict", "auth_error"]:
                 print("\n💥 CRITICAL ISSUE DETECTED!")
                 if result == "auth_error":
@@ -367,13 +400,29 @@ class GitSyncMaster:
                 else:
                     print("⚔️  Merge conflicts require manual resolution.")
                 print("📖 Check the conflict resolution guide that was generated!")
+            elif result == "deadline_exceeded":
+                print(f"\n⏰ Gave up after the {self.retry.deadline:g}s deadline.")
 
             return False
 
 def main():
     """Main entry point"""
-    syncer = GitSyncMaster()
-    success = syncer.main_workflow()
+    parser = argparse.ArgumentParser(description='Pull the latest changes from GitHub')
+    parser.add_argument('--on-local-changes', choices=LOCAL_CHANGES_POLICIES, default='ask',
+                        help='what to do when the tree has uncommitted changes: ask, abort, '
+                             'or back them up and continue (default: ask)')
+    parser.add_argument('--report', metavar='PATH', help='write the outcome and git timings as JSON')
+    add_retry_arguments(parser)
+    args = parser.parse_args()
+
+    syncer = GitSyncMaster(on_local_changes=args.on_local_changes, retry=RetryPolicy.from_args(args))
+    try:
+        success = syncer.main_workflow()
+    finally:
+        syncer.git.close()
+    print(syncer.git.summary())
+    if args.report:
+        write_report(args.report, success, syncer.outcome, syncer.git, syncer.retry)
 
     if success:
         sys.exit(0)
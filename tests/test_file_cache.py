@@ -0,0 +1,100 @@
+"""FileCache in server.py: LRU order, byte budget, size cap, invalidation and counters"""
+
+import os
+import tempfile
+import unittest
+
+from server import FileCache
+
+
+class FileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, size, fill=b'x'):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(fill * size)
+        return path
+
+    def test_hit_returns_the_cached_body(self):
+        cache = FileCache(max_bytes=1000, max_file_bytes=100)
+        path = self.write('a.css', 10, b'a')
+        first = cache.get(path)
+        self.assertEqual(first.data, b'a' * 10)
+        self.assertIs(cache.get(path), first)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries'], stats['bytes']),
+                         (1, 1, 1, 10))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_least_recently_used_entry_is_evicted_first(self):
+        cache = FileCache(max_bytes=30, max_file_bytes=10)
+        a, b, c, d = (self.write(name, 10) for name in 'abcd')
+        for path in (a, b, c):
+            cache.get(path)
+        cache.get(a)  # b is now the least recently used
+        cache.get(d)
+        self.assertEqual(list(cache._entries), [c, a, d])
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['bytes'], 30)
+
+    def test_byte_budget_holds_after_many_inserts(self):
+        cache = FileCache(max_bytes=25, max_file_bytes=10)
+        for i in range(10):
+            cache.get(self.write(f'{i}.js', 10))
+            self.assertLessEqual(cache.stats()['bytes'], 25)
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual(cache.stats()['evictions'], 8)
+
+    def test_files_over_the_size_cap_bypass_the_cache(self):
+        cache = FileCache(max_bytes=1000, max_file_bytes=100)
+        big = self.write('big.png', 101)
+        self.assertIsNone(cache.get(big))
+        self.assertIsNone(cache.get(big))
+        stats = cache.stats()
+        self.assertEqual((stats['bypasses'], stats['misses'], stats['entries']), (2, 0, 0))
+        self.assertIsNotNone(cache.get(self.write('small.png', 100)))
+
+    def test_file_larger_than_the_budget_is_not_cached(self):
+        cache = FileCache(max_bytes=50, max_file_bytes=100)
+        self.assertIsNone(cache.get(self.write('a.html', 60)))
+
+    def test_changed_mtime_invalidates_the_entry(self):
+        cache = FileCache(max_bytes=1000, max_file_bytes=100)
+        path = self.write('index.html', 10, b'a')
+        cache.get(path)
+        with open(path, 'wb') as f:
+            f.write(b'b' * 10)  # same size
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        fresh = cache.get(path)
+        self.assertEqual(fresh.data, b'b' * 10)
+        stats = cache.stats()
+        self.assertEqual((stats['invalidations'], stats['misses'], stats['hits']), (1, 2, 0))
+        self.assertEqual(stats['bytes'], 10)
+
+    def test_explicit_invalidation(self):
+        cache = FileCache(max_bytes=1000, max_file_bytes=100)
+        a, b = self.write('a', 10), self.write('b', 20)
+        cache.get(a)
+        cache.get(b)
+        cache.invalidate(a)
+        self.assertEqual((cache.stats()['entries'], cache.stats()['bytes']), (1, 20))
+        cache.invalidate()
+        self.assertEqual((cache.stats()['entries'], cache.stats()['bytes']), (0, 0))
+
+    def test_disabled_and_missing(self):
+        path = self.write('a', 10)
+        self.assertIsNone(FileCache(max_bytes=0).get(path))
+        self.assertIsNone(FileCache(max_file_bytes=0).get(path))
+        cache = FileCache()
+        self.assertIsNone(cache.get(os.path.join(self.tmp.name, 'missing')))
+        self.assertIsNone(cache.get(self.tmp.name))  # directories are never cached
+        self.assertIsNone(cache.get(path + '\0'))
+        self.assertEqual(cache.stats()['misses'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Per-thread request metrics in server.py"""
+
+import threading
+import unittest
+
+from server import Metrics
+
+
+class MetricsTest(unittest.TestCase):
+    def serve(self, metrics, path_class='html', status=200):
+        metrics.connection_opened()
+        metrics.request_started()
+        metrics.request_finished(path_class, status, 0.002, 100)
+        metrics.connection_closed()
+
+    def test_finished_threads_are_retired_without_losing_counts(self):
+        metrics = Metrics()
+        for _ in range(5):
+            thread = threading.Thread(target=self.serve, args=(metrics,))
+            thread.start()
+            thread.join()
+        self.serve(metrics, 'css')
+
+        body = metrics.render().decode('utf-8')
+        self.assertEqual(list(metrics._shards), [threading.current_thread()])
+        self.assertIn('portfolio_http_requests_total{status="200",path_class="html"} 5', body)
+        self.assertIn('portfolio_http_requests_total{status="200",path_class="css"} 1', body)
+        self.assertIn('portfolio_http_response_bytes_total 600', body)
+        self.assertIn('portfolio_http_connections_total 6', body)
+        self.assertIn('portfolio_http_connections_open 0', body)
+        self.assertIn('portfolio_http_request_duration_seconds_count{path_class="html"} 5', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
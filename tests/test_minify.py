@@ -0,0 +1,61 @@
+"""The builtin JavaScript minifier in minify.py (rjsmin is patched out)"""
+
+import unittest
+from unittest import mock
+
+import minify
+
+
+def minify_js(source):
+    with mock.patch.object(minify, 'rjsmin', None):
+        return minify.minify_js(source)
+
+
+class MinifyJsTest(unittest.TestCase):
+    def assertMinifies(self, source, expected):
+        self.assertEqual(minify_js(source), expected + '\n')
+
+    def test_comments_and_whitespace(self):
+        self.assertMinifies('s = "a // b" /* c */ + d // e\n+ f', 's="a // b"+d\n+f')
+        self.assertMinifies("if (a) {\n    return 'x  y';\n}", "if(a){return'x  y';}")
+
+    def test_division(self):
+        self.assertMinifies('a = b / c / d;', 'a=b/c/d;')
+        self.assertMinifies('q = a[0] / 2 / (x) / 1;', 'q=a[0]/2/(x)/1;')
+
+    def test_regex_literals(self):
+        self.assertMinifies('x = /ab  +c/g.test(s);', 'x=/ab  +c/g.test(s);')
+        self.assertMinifies('return /a b/.test(x);', 'return/a b/.test(x);')
+        self.assertMinifies('r = /[/ ]+/; f(/\\/ \\//)', 'r=/[/ ]+/;f(/\\/ \\//)')
+        self.assertMinifies('x = /x/ in o', 'x=/x/ in o')
+
+    def test_template_literals(self):
+        self.assertMinifies('s = `a  ${ b  +  c }  d`;', 's=`a  ${b+c}  d`;')
+        self.assertMinifies('s = `o ${ `i ${ x }` } // ${ {a: 1}.a } /* */`;',
+                            's=`o ${`i ${x}`} // ${{a:1}.a} /* */`;')
+        self.assertMinifies('s = `line\n   kept`', 's=`line\n   kept`')
+
+    def test_newlines_that_end_statements_are_kept(self):
+        self.assertMinifies('a = b\n++c', 'a=b\n++c')
+        self.assertMinifies('a = b++\nc', 'a=b++\nc')
+        self.assertMinifies('return\nx', 'return\nx')
+        self.assertMinifies('let a = 1\nlet b = 2', 'let a=1\nlet b=2')
+        self.assertMinifies('const f = () => {}\n[1, 2].forEach(g)',
+                            'const f=()=>{}\n[1,2].forEach(g)')
+
+    def test_newlines_inside_expressions_are_dropped(self):
+        self.assertMinifies('f(a,\n  b)', 'f(a,b)')
+        self.assertMinifies('x = a\n  .b\n  .c()', 'x=a.b.c()')
+
+    def test_operators_that_would_merge(self):
+        self.assertMinifies('a + +b; a - -b; a+ ++b', 'a+ +b;a- -b;a+ ++b')
+
+    def test_member_access_on_integer_literals(self):
+        self.assertMinifies('n = 1 .toString();', 'n=1 .toString();')
+        self.assertMinifies('n = 1_000 .toFixed(2);', 'n=1_000 .toFixed(2);')
+        self.assertMinifies('m = 1.5 .toFixed(); h = 0x1F .toString(16); o = a . b;',
+                            'm=1.5.toFixed();h=0x1F.toString(16);o=a.b;')
+
+
+if __name__ == '__main__':
+    unittest.main()
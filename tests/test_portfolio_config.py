@@ -0,0 +1,126 @@
+"""ObjectLiteralParser, parse_config and config snapshots in portfolio_config.py"""
+
+import os
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from portfolio_config import (ConfigSyntaxError, ObjectLiteralParser, load_config, parse_config,
+                              snapshot_paths)
+
+
+def parse(text):
+    return ObjectLiteralParser(text).parse_value()
+
+
+class StringTest(unittest.TestCase):
+    def test_quotes(self):
+        self.assertEqual(parse('"double"'), 'double')
+        self.assertEqual(parse("'single'"), 'single')
+        self.assertEqual(parse('`back\ntick`'), 'back\ntick')
+
+    def test_escaped_quotes_and_backslashes(self):
+        self.assertEqual(parse(r"'it\'s'"), "it's")
+        self.assertEqual(parse(r'"say \"hi\""'), 'say "hi"')
+        self.assertEqual(parse(r'"C:\\path\\file"'), 'C:\\path\\file')
+        self.assertEqual(parse(r'`a \` b`'), 'a ` b')
+
+    def test_character_escapes(self):
+        self.assertEqual(parse(r'"\n\t\r\b\f\v\0"'), '\n\t\r\b\f\v\0')
+        self.assertEqual(parse(r'"\q\/"'), 'q/')
+
+    def test_hex_and_unicode_escapes(self):
+        self.assertEqual(parse(r'"\x41\u0042\u{43}"'), 'ABC')
+        self.assertEqual(parse(r'"\u{1F600}"'), '\U0001F600')
+
+    def test_surrogate_pair(self):
+        self.assertEqual(parse(r'"\uD83D\uDE00"'), '\U0001F600')
+
+    def test_line_continuation(self):
+        self.assertEqual(parse('"a\\\nb"'), 'ab')
+        self.assertEqual(parse('"a\\\r\nb"'), 'ab')
+
+    def test_comment_markers_inside_strings(self):
+        self.assertEqual(parse('"https://example.com/*x*/"'), 'https://example.com/*x*/')
+
+    def test_errors(self):
+        for text, message in (('"open', 'Unterminated string'),
+                              ('"line\nbreak"', 'Unterminated string'),
+                              ('`${name}`', 'Template interpolation'),
+                              (r'"\x4"', r'Invalid \x escape'),
+                              (r'"\u12"', r'Invalid \u escape'),
+                              (r'"\u{41"', r'Invalid \u escape')):
+            with self.subTest(text=text):
+                with self.assertRaisesRegex(ConfigSyntaxError, re.escape(message)):
+                    parse(text)
+
+
+class ValueTest(unittest.TestCase):
+    def test_numbers(self):
+        self.assertEqual(parse('42'), 42)
+        self.assertIsInstance(parse('42'), int)
+        self.assertEqual(parse('-1.5'), -1.5)
+        self.assertEqual(parse('1e3'), 1000.0)
+        self.assertIsInstance(parse('1.0'), float)
+        self.assertEqual(parse('0x1F'), 31)
+
+    def test_keywords(self):
+        self.assertEqual(parse('[true, false, null, undefined]'), [True, False, None, None])
+
+    def test_objects(self):
+        text = """{
+            // a comment
+            name: 'x', "quoted key": 1, 'single': [1, 2,], /* block */ 3: {nested: true},
+        }"""
+        self.assertEqual(parse(text), {'name': 'x', 'quoted key': 1, 'single': [1, 2],
+                                       '3': {'nested': True}})
+
+    def test_expressions_are_rejected_with_a_position(self):
+        with self.assertRaises(ConfigSyntaxError) as raised:
+            parse('{\n  a: 1,\n  b: someVariable\n}')
+        self.assertEqual((raised.exception.line, raised.exception.column), (3, 6))
+
+
+class ParseConfigTest(unittest.TestCase):
+    def test_finds_the_assignment(self):
+        text = "// header\nconst portfolioConfig = { title: 'x' };\nwindow.x = 1;\n"
+        self.assertEqual(parse_config(text), {'title': 'x'})
+
+    def test_missing_assignment(self):
+        with self.assertRaises(ConfigSyntaxError):
+            parse_config('const other = {};')
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.site = Path(tmp.name, 'site')
+        self.site.mkdir()
+        self.cache = Path(tmp.name, 'cache')
+        patcher = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': str(self.cache)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config = self.site / 'portfolio-config.js'
+        self.config.write_text("const portfolioConfig = { title: 'x' };\n", encoding='utf-8')
+
+    def test_snapshots_are_written_outside_the_served_directory(self):
+        self.assertEqual(load_config(self.config), {'title': 'x'})
+        self.assertEqual(os.listdir(self.site), ['portfolio-config.js'])
+        for snapshot in snapshot_paths(self.config):
+            self.assertTrue(snapshot.is_file())
+            self.assertEqual(snapshot.parent, self.cache / 'portfolio')
+
+    def test_snapshot_is_used_until_the_config_changes(self):
+        load_config(self.config)
+        with mock.patch('portfolio_config.parse_config') as parse_config_mock:
+            self.assertEqual(load_config(self.config), {'title': 'x'})
+        parse_config_mock.assert_not_called()
+        self.config.write_text("const portfolioConfig = { title: 'y' };\n", encoding='utf-8')
+        self.assertEqual(load_config(self.config), {'title': 'y'})
+
+
+if __name__ == '__main__':
+    unittest.main()
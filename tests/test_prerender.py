@@ -0,0 +1,41 @@
+"""Escaping of config values in the markup prerender.py generates"""
+
+import html
+import json
+import re
+import unittest
+
+from prerender import render_projects, render_references, render_youtube_videos
+
+HOSTILE = '</p><script>alert("x")</script> & it\'s'
+
+
+class PrerenderEscapingTest(unittest.TestCase):
+    def test_project_text_and_attributes_are_escaped(self):
+        markup = render_projects({'projects': {'list': [{
+            'name': HOSTILE, 'description': HOSTILE, 'image': '/images/r&d.png"x',
+            'link': 'https://example.com/?a=1&b=2', 'technologies': ['C & C++'],
+        }]}})
+        self.assertNotIn('<script>', markup)
+        self.assertIn('src="/images/r&amp;d.png&quot;x"', markup)
+        self.assertIn('href="https://example.com/?a=1&amp;b=2"', markup)
+        self.assertIn('<span class="tech-tag">C &amp; C++</span>', markup)
+
+    def test_references_are_escaped(self):
+        markup = render_references([dict.fromkeys(
+            ('name', 'title', 'relationship', 'email', 'phone', 'image'), HOSTILE)])
+        self.assertNotIn('<script>', markup)
+        self.assertEqual(markup.count(html.escape(HOSTILE)), 7)
+
+    def test_video_modal_arguments_are_javascript_strings(self):
+        video = {'platform': 'youtube', 'videoId': 'abc', 'title': HOSTILE,
+                 'description': "line one\nline 'two'"}
+        markup = render_youtube_videos([video])
+        self.assertNotIn('<script>', markup)
+        onclick = html.unescape(re.search(r'onclick="([^"]*)"', markup).group(1))
+        arguments = json.loads('[' + onclick[len('openYouTubeModal('):-1] + ']')
+        self.assertEqual(arguments, [HOSTILE, video['description'], 'abc'])
+
+
+if __name__ == '__main__':
+    unittest.main()
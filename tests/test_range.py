@@ -0,0 +1,72 @@
+"""Range header parsing and 206 body layout in server.py"""
+
+import unittest
+
+from server import MAX_RANGES, RangeBody, StaticFile, parse_range_header
+
+
+class ParseRangeHeaderTest(unittest.TestCase):
+    def test_single_range(self):
+        self.assertEqual(parse_range_header('bytes=0-99', 1000), [(0, 99)])
+
+    def test_open_ended_range(self):
+        self.assertEqual(parse_range_header('bytes=900-', 1000), [(900, 999)])
+
+    def test_end_past_length_is_clamped(self):
+        self.assertEqual(parse_range_header('bytes=990-2000', 1000), [(990, 999)])
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range_header('bytes=-100', 1000), [(900, 999)])
+
+    def test_suffix_longer_than_file(self):
+        self.assertEqual(parse_range_header('bytes=-5000', 1000), [(0, 999)])
+
+    def test_zero_suffix_is_unsatisfiable(self):
+        self.assertEqual(parse_range_header('bytes=-0', 1000), [])
+
+    def test_multiple_ranges_keep_their_order(self):
+        self.assertEqual(parse_range_header('bytes=500-599, 0-0,-10', 1000),
+                         [(500, 599), (0, 0), (990, 999)])
+
+    def test_overlapping_ranges_are_not_merged(self):
+        self.assertEqual(parse_range_header('bytes=0-50,40-100', 1000), [(0, 50), (40, 100)])
+
+    def test_unsatisfiable_ranges_are_dropped(self):
+        self.assertEqual(parse_range_header('bytes=2000-3000,0-9', 1000), [(0, 9)])
+        self.assertEqual(parse_range_header('bytes=1000-', 1000), [])
+
+    def test_invalid_headers_are_ignored(self):
+        for header in ('items=0-9', 'bytes=', 'bytes=abc', 'bytes=9-0', 'bytes=0-9,x-y',
+                       'bytes=5', 'bytes=-', 'bytes=--5', 'bytes=+5-9', 'bytes=1_0-20'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range_header(header, 1000))
+
+    def test_too_many_ranges_are_ignored(self):
+        header = 'bytes=' + ','.join(f'{i}-{i}' for i in range(MAX_RANGES + 1))
+        self.assertIsNone(parse_range_header(header, 1000))
+
+
+class RangeBodyTest(unittest.TestCase):
+    def static_file(self, length):
+        return StaticFile(path='a.txt', mimetype='text/plain', length=length, mtime=0,
+                          mtime_ns=0, inode=0, last_modified='', etag='"x"', data=b'x' * length)
+
+    def test_single_range_is_not_multipart(self):
+        body = RangeBody(self.static_file(1000), None, [(10, 19)])
+        self.assertEqual(body.content_type, 'text/plain')
+        self.assertEqual(body.content_range, 'bytes 10-19/1000')
+        self.assertEqual(body.parts, [(10, 10)])
+        self.assertEqual(body.length, 10)
+
+    def test_multipart_length_counts_every_part(self):
+        body = RangeBody(self.static_file(1000), None, [(0, 50), (40, 100)])
+        self.assertTrue(body.content_type.startswith('multipart/byteranges; boundary='))
+        self.assertIsNone(body.content_range)
+        self.assertEqual([part for part in body.parts if isinstance(part, tuple)],
+                         [(0, 51), (40, 61)])
+        self.assertEqual(body.length, sum(len(part) if isinstance(part, bytes) else part[1]
+                                          for part in body.parts))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""`git status --porcelain=v2 --branch -z` parsing in repo_state.py"""
+
+import unittest
+
+from repo_state import RepoState, parse_status
+
+OID = '509497034ba531e81de34b9251d381091d5c4084'
+MODES = '100644 100644 100644'
+
+
+def status(*records):
+    return ('\0'.join(records) + '\0').encode('utf-8')
+
+
+class ParseStatusTest(unittest.TestCase):
+    def test_branch_headers(self):
+        state = parse_status(status(f'# branch.oid {OID}', '# branch.head main',
+                                    '# branch.upstream origin/main', '# branch.ab +2 -3'))
+        self.assertEqual((state.branch, state.head, state.upstream), ('main', OID, 'origin/main'))
+        self.assertEqual((state.ahead, state.behind), (2, 3))
+        self.assertFalse(state.has_changes)
+        self.assertEqual(state.describe(), 'main...origin/main [ahead 2, behind 3]')
+
+    def test_detached_and_initial(self):
+        detached = parse_status(status(f'# branch.oid {OID}', '# branch.head (detached)'))
+        self.assertIsNone(detached.branch)
+        self.assertEqual(detached.describe(), f'HEAD (detached at {OID[:7]})')
+        initial = parse_status(status('# branch.oid (initial)', '# branch.head main'))
+        self.assertIsNone(initial.head)
+        self.assertEqual(initial.branch, 'main')
+        self.assertEqual(RepoState().describe(), '(unknown)')
+
+    def test_changed_entries(self):
+        state = parse_status(status(f'1 .M N... {MODES} {OID} {OID} mod.txt',
+                                    f'1 A. N... 000000 100644 100644 {"0" * 40} {OID} new file.txt'))
+        modified, added = state.entries
+        self.assertEqual((modified.path, modified.index, modified.worktree), ('mod.txt', ' ', 'M'))
+        self.assertTrue(modified.unstaged)
+        self.assertFalse(modified.staged)
+        self.assertEqual(added.path, 'new file.txt')
+        self.assertEqual(added.porcelain(), 'A  new file.txt')
+        self.assertEqual(state.staged, [added])
+
+    def test_rename_takes_the_original_path_from_the_next_record(self):
+        state = parse_status(status(f'2 R. N... {MODES} {OID} {OID} R100 new name.txt',
+                                    'old name.txt', '? after.txt'))
+        renamed, untracked = state.entries
+        self.assertEqual(renamed.kind, 'renamed')
+        self.assertEqual((renamed.path, renamed.orig_path), ('new name.txt', 'old name.txt'))
+        self.assertEqual(renamed.porcelain(), 'R  old name.txt -> new name.txt')
+        self.assertTrue(renamed.staged)
+        self.assertEqual(untracked.path, 'after.txt')
+
+    def test_copy_with_worktree_change(self):
+        state = parse_status(status(f'2 CM N... {MODES} {OID} {OID} C75 copy.txt', 'source.txt'))
+        (copied,) = state.entries
+        self.assertEqual((copied.index, copied.worktree), ('C', 'M'))
+        self.assertTrue(copied.staged and copied.unstaged)
+
+    def test_unmerged_untracked_and_ignored(self):
+        state = parse_status(status(f'u UU N... {MODES} 100644 {OID} {OID} {OID} both.txt',
+                                    '? new dir/file.txt', '! build/'))
+        self.assertEqual([entry.path for entry in state.conflicted], ['both.txt'])
+        self.assertEqual(state.conflicted[0].porcelain(), 'UU both.txt')
+        self.assertEqual([entry.path for entry in state.untracked], ['new dir/file.txt'])
+        self.assertTrue(state.has_changes)
+        ignored_only = parse_status(status('! build/'))
+        self.assertFalse(ignored_only.has_changes)
+
+    def test_text_and_undecodable_bytes(self):
+        self.assertEqual(parse_status('? a.txt\0').untracked[0].path, 'a.txt')
+        state = parse_status(b'? caf\xe9.txt\0')
+        self.assertEqual(state.untracked[0].path, 'caf\udce9.txt')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Choosing precompressed siblings and on-the-fly compression in server.py"""
+
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import server
+from server import FileCache, open_static_file, select_representation
+
+
+class SelectRepresentationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'styles.css')
+        self.source = b'body { color: red; }\n' * 20000  # ~420 KiB, over cacheMaxFile
+        with open(self.path, 'wb') as f:
+            f.write(self.source)
+        self.compressed = gzip.compress(self.source, mtime=0)
+        with open(self.path + '.gz', 'wb') as f:
+            f.write(self.compressed)
+
+    def select(self, accept_encoding='gzip'):
+        static_file, f = open_static_file(self.path)
+        representation, body_f = select_representation(static_file, accept_encoding, f)
+        if body_f is not None:
+            self.addCleanup(body_f.close)
+        if f is not None and f is not body_f:
+            self.assertTrue(f.closed)
+        return representation, body_f
+
+    def body(self, representation, body_f):
+        return representation.data if body_f is None else body_f.read()
+
+    def test_precompressed_sibling_with_the_cache_disabled(self):
+        with mock.patch.object(server, 'file_cache', FileCache(max_bytes=0)):
+            representation, body_f = self.select()
+        self.assertEqual(representation.encoding, 'gzip')
+        self.assertEqual(representation.mimetype, 'text/css')
+        self.assertEqual(representation.length, len(self.compressed))
+        self.assertEqual(self.body(representation, body_f), self.compressed)
+
+    def test_precompressed_sibling_over_the_cache_size_cap(self):
+        with mock.patch.object(server, 'file_cache', FileCache(max_file_bytes=1024)):
+            representation, body_f = self.select()
+        self.assertEqual(representation.encoding, 'gzip')
+        self.assertEqual(self.body(representation, body_f), self.compressed)
+
+    def test_stale_sibling_is_ignored(self):
+        st = os.stat(self.path)
+        os.utime(self.path + '.gz', ns=(st.st_atime_ns, st.st_mtime_ns - 10 ** 9))
+        with mock.patch.object(server, 'file_cache', FileCache(max_bytes=0)), \
+                mock.patch.object(server, 'compressed_cache', server.CompressedCache()):
+            representation, body_f = self.select()
+        self.assertEqual(representation.encoding, 'gzip')
+        self.assertIsNone(body_f)  # compressed in memory from the current source
+        self.assertEqual(gzip.decompress(representation.data), self.source)
+
+    def test_identity_when_not_accepted(self):
+        with mock.patch.object(server, 'file_cache', FileCache(max_bytes=0)):
+            representation, body_f = self.select('identity')
+        self.assertIsNone(representation.encoding)
+        self.assertEqual(self.body(representation, body_f), self.source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+"""Choosing the branch sync.py pulls from and update.py pushes to (repo_state.target_branch)"""
+
+import unittest
+
+from git_runner import RemoteBranches
+from repo_state import RepoState, target_branch
+
+OID = '509497034ba531e81de34b9251d381091d5c4084'
+
+
+class TargetBranchTest(unittest.TestCase):
+    remote = RemoteBranches('origin', frozenset({'main', 'develop'}), default='main')
+
+    def test_upstream_wins_over_the_local_name(self):
+        state = RepoState(branch='master', head=OID, upstream='origin/main')
+        self.assertEqual(target_branch(state, self.remote), 'main')
+        self.assertEqual(target_branch(state, self.remote, create=True), 'main')
+        self.assertEqual(target_branch(state, None), 'main')
+
+    def test_upstream_on_another_remote_is_ignored(self):
+        state = RepoState(branch='develop', head=OID, upstream='fork/topic')
+        self.assertEqual(target_branch(state, self.remote), 'develop')
+
+    def test_new_branch(self):
+        state = RepoState(branch='feature', head=OID)
+        self.assertEqual(target_branch(state, self.remote), 'main')
+        self.assertEqual(target_branch(state, self.remote, create=True), 'feature')
+
+    def test_detached_head_uses_the_default_branch(self):
+        state = RepoState(head=OID)
+        self.assertEqual(target_branch(state, self.remote, create=True), 'main')
+        self.assertEqual(target_branch(state, None), 'main')
+        self.assertIsNone(target_branch(state, RemoteBranches('origin', frozenset())))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,64 +4,60 @@
 The Swiss Army Knife of Git Operations - Handles Everything Automatically!
 """
 
-import subprocess
+import argparse
 import sys
 import os
 import json
 from datetime import datetime
 import time
 
+from git_runner import (GitRunner, RetryPolicy, add_retry_arguments, is_auth_error,
+                        is_network_error, write_report)
+from repo_state import RepoState, RepoStateError, read_repo_state, target_branch
+
 class GitPushMaster:
-    def __init__(self):
-        self.current_dir = os.getcwd()
+    def __init__(self, repo_dir=None, retry=None):
+        self.current_dir = repo_dir or os.getcwd()
+        self.retry = retry or RetryPolicy()
+        self.remote = None
+        self.push_head = False  # push HEAD itself: detached, or the target has another name
+        self.outcome = None
         self.repo_name = "Portfolio-Project"
         self.current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    def run_command(self, command, capture_output=False, encoding='utf-8'):
-        """Enhanced command runner with error handling"""
-        try:
-            if capture_output:
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    encoding=encoding,
-                    cwd=self.current_dir
-                )
-                return result.returncode, result.stdout.strip(), result.stderr.strip()
-            else:
-                result = subprocess.run(command, shell=True, cwd=self.current_dir)
-                return result.returncode, "", ""
-        except Exception as e:
-            print(f"❌ Command failed: {e}")
-            return 1, "", str(e)
+        self.state = None
+        self.git = GitRunner(self.current_dir)
+
+    def repo_state(self, refresh=False):
+        """Snapshot of the repository from one `git status` call, reused until `refresh`"""
+        if self.state is None or refresh:
+            try:
+                self.state = read_repo_state(self.current_dir, self.git)
+            except RepoStateError as e:
+                print(f"⚠️  Could not read git status: {e}")
+                self.state = RepoState()
+        return self.state
 
     def check_git_status(self):
         """Check current git status and return detailed info"""
         print("🔍 Analyzing git status...")
 
-        # Check if repo is clean
-        code, stdout, stderr = self.run_command("git status --porcelain", capture_output=True)
-        has_changes = len(stdout.strip()) > 0
-
-        # Check if ahead/behind
-        code, stdout, stderr = self.run_command("git status -b --porcelain", capture_output=True)
-        status_lines = stdout.split('\n')
-        ahead_behind = status_lines[0] if status_lines else ""
-
-        # Get current branch
-        code, stdout, stderr = self.run_command("git branch --show-current", capture_output=True)
-        current_branch = stdout.strip() or "main"
+        state = self.repo_state()
+        has_changes = state.has_changes
+        current_branch = state.branch or "main"
+        ahead_behind = state.describe()
 
         print(f"📋 Current branch: {current_branch}")
         print(f"📝 Uncommitted changes: {'Yes' if has_changes else 'No'}")
+        if has_changes:
+            print(f"   {len(state.staged)} staged, {len(state.unstaged)} unstaged, "
+                  f"{len(state.untracked)} untracked, {len(state.conflicted)} conflicted")
         print(f"🔄 Branch status: {ahead_behind}")
 
         return {
             'has_changes': has_changes,
             'current_branch': current_branch,
-            'ahead_behind': ahead_behind
+            'ahead_behind': ahead_behind,
+            'state': state
         }
 
     def stage_and_commit(self, commit_message=None):
@@ -70,64 +66,94 @@ class GitPushMaster:
             commit_message = f"🚀 Portfolio Auto-Update {self.current_time}"
 
         print(f"📋 Staging files...")
-        self.run_command("git add .")
+        self.git.run("add", ".")
 
         print(f"💾 Committing with message: '{commit_message}'")
-        code, stdout, stderr = self.run_command(f'git commit -m "{commit_message}"', capture_output=True)
+        code, stdout, stderr = self.git.run("commit", "-m", commit_message, capture_output=True)
+        self.state = None  # the snapshot no longer matches the tree
 
         if code == 0:
             print("✅ Files committed successfully!")
             return True
         else:
-            if "nothing to commit" in stderr.lower():
+            if "nothing to commit" in (stdout + stderr).lower():
                 print("ℹ️  No changes to commit")
                 return True
             else:
                 print(f"❌ Commit failed: {stderr}")
                 return False
 
-    def intelligent_push(self, branch="main", max_attempts=3):
-        """Intelligent push with conflict resolution"""
+    def intelligent_push(self, branch="main"):
+        """Intelligent push with conflict resolution; retries follow self.retry"""
         attempt = 0
-        while attempt < max_attempts:
+        while attempt < self.retry.max_attempts:
+            if self.retry.expired():
+                print("⏰ Push deadline reached.")
+                return False, "deadline_exceeded"
             attempt += 1
             print(f"\n🚀 Push Attempt #{attempt} (Branch: {branch})")
 
-            # Try pushing
-            code, stdout, stderr = self.run_command(f"git push origin {branch}", capture_output=True)
+            # Try pushing; a branch the remote does not have yet is created with its upstream
+            new_branch = self.remote is not None and branch not in self.remote.heads
+            if new_branch:
+                print(f"📝 Creating remote branch '{branch}'...")
+            started = time.perf_counter()
+            code, stdout, stderr = self.git.run("push", *self.push_args(branch, new_branch),
+                                                capture_output=True, timeout=self.retry.remaining())
+            error_type = "success" if code == 0 else self.analyze_push_error(stderr)['type']
+            self.retry.record("push", branch, attempt, time.perf_counter() - started, error_type)
 
             if code == 0:
                 print("✅ Successfully pushed to GitHub!")
                 return True, "success"
 
             # Analyze error and handle intelligently
-            error_analysis = self.analyze_push_error(stderr)
-
-            if error_analysis['type'] == 'ahead_behind':
+            if error_type == 'ahead_behind':
                 print("🔄 Repository diverged. Attempting auto-sync...")
-                if self.auto_sync_conflict():
+                if self.auto_sync_conflict(branch):
                     continue  # Try push again
+                return False, "diverged"
 
-            elif error_analysis['type'] == 'no_remote_branch':
+            elif error_type == 'no_remote_branch':
                 print(f"📝 Creating remote branch '{branch}'...")
-                self.run_command(f"git push -u origin {branch}")
+                self.git.run("push", *self.push_args(branch, True), timeout=self.retry.remaining())
                 continue
 
-            elif error_analysis['type'] == 'major_conflict':
+            elif error_type == 'major_conflict':
                 print("💥 Major conflict detected! Creating recovery branch...")
                 recovery_branch = self.create_recovery_branch(branch)
                 return False, f"major_conflict:{recovery_branch}"
 
+            elif error_type == 'branch_not_found':
+                print(f"📝 There is no local branch '{branch}' to push.")
+                return False, "branch_not_found"
+
+            elif error_type == 'auth_error':
+                print("🔐 Authentication failed. Please check your GitHub credentials.")
+                return False, "auth_error"
+
+            elif error_type == 'network':
+                print(f"📡 Network error: {stderr}")
+
             else:
                 print(f"⚠️  Unknown error type. Full error: {stderr}")
 
-                # Wait a bit before retry
-                if attempt < max_attempts:
-                    print(f"⏳ Retrying in 2 seconds... ({max_attempts - attempt} attempts left)")
-                    time.sleep(2)
+            # Wait a bit before retry
+            delay = self.retry.next_delay(attempt, error_type)
+            if delay is None:
+                return False, self.retry.give_up_reason(attempt, error_type)
+            print(f"⏳ Retrying in {delay:.1f} seconds... ({self.retry.max_attempts - attempt} attempts left)")
+            time.sleep(delay)
 
         return False, "max_attempts_exceeded"
 
+    def push_args(self, branch, new_branch=False):
+        """`git push` arguments for `branch`; see resolve_target_branch for HEAD:refs/heads/<branch>"""
+        if self.push_head:
+            # The full ref lets git create the branch from a detached HEAD too
+            return ["origin", f"HEAD:refs/heads/{branch}"]
+        return [*(["-u"] if new_branch else []), "origin", branch]
+
     def analyze_push_error(self, stderr):
         """Analyze push error and categorize it"""
         error_lower = stderr.lower()
@@ -135,30 +161,37 @@ class GitPushMaster:
         if any(keyword in error_lower for keyword in ['non-fast-forward', 'updates were rejected because', 'diverged']):
             return {'type': 'ahead_behind', 'severity': 'minor'}
 
-        elif any(keyword in error_lower for keyword in ['does not exist', 'remote branch'] and 'origin' in error_lower):
+        elif any(keyword in error_lower for keyword in ['does not exist', 'remote branch']) and 'origin' in error_lower:
             return {'type': 'no_remote_branch', 'severity': 'minor'}
 
         elif any(keyword in error_lower for keyword in ['merge conflict', 'automatic merge failed', 'conflicts']):
             return {'type': 'major_conflict', 'severity': 'critical'}
 
-        elif 'permission denied' in error_lower or 'authentication failed' in error_lower:
+        elif is_auth_error(error_lower):
             return {'type': 'auth_error', 'severity': 'critical'}
 
+        elif is_network_error(error_lower):
+            return {'type': 'network', 'severity': 'minor'}
+
+        elif 'src refspec' in error_lower and 'does not match any' in error_lower:
+            return {'type': 'branch_not_found', 'severity': 'moderate'}
+
         else:
             return {'type': 'unknown', 'severity': 'moderate'}
 
-    def auto_sync_conflict(self):
+    def auto_sync_conflict(self, branch="main"):
         """Auto-resolve diverged branches by pulling and merging"""
         print("🔄 Attempting to sync diverged branches...")
 
         # Fetch latest
-        code, stdout, stderr = self.run_command("git fetch origin")
+        code, stdout, stderr = self.git.run("fetch", "origin", timeout=self.retry.remaining())
         if code != 0:
             print("❌ Failed to fetch remote changes")
             return False
 
         # Try to rebase (less messy than merge)
-        code, stdout, stderr = self.run_command("git pull --rebase origin main", capture_output=True)
+        code, stdout, stderr = self.git.run("pull", "--rebase", "origin", branch, capture_output=True,
+                                            timeout=self.retry.remaining())
 
         if code == 0:
             print("✅ Branches successfully synced!")
@@ -175,13 +208,13 @@ class GitPushMaster:
         print(f"🛒 Creating recovery branch: {recovery_branch}")
 
         # Create and switch to recovery branch
-        code, stdout, stderr = self.run_command(f"git checkout -b {recovery_branch}")
+        code, stdout, stderr = self.git.run("checkout", "-b", recovery_branch)
         if code != 0:
             print(f"❌ Failed to create recovery branch: {stderr}")
             return None
 
         # Force push to create remote branch
-        code, stdout, stderr = self.run_command(f"git push -u origin {recovery_branch}")
+        code, stdout, stderr = self.git.run("push", "-u", "origin", recovery_branch)
         if code != 0:
             print(f"⚠️  Remote recovery branch creation failed: {stderr}")
 
@@ -214,37 +247,39 @@ class GitPushMaster:
             f.write("OPTION 1 - USE YOUR LOCAL CHANGES (Force Push):\n")
             f.write(f"   git checkout {recovery_branch}\n")
             f.write(f"   git push --force origin {recovery_branch}\n")
-            f.write(f"   git checkout main && git merge {recovery_branch}\n\n")
+            f.write(f"   git checkout {original_branch} && git merge {recovery_branch}\n\n")
 
             f.write("OPTION 2 - MERGE REMOTE CHANGES INTO YOURS:\n")
             f.write(f"   git checkout {recovery_branch}\n")
-            f.write("   git pull --no-ff origin main  # Creates merge commit\n")
+            f.write(f"   git pull --no-ff origin {original_branch}  # Creates merge commit\n")
             f.write("   # Resolve any merge conflicts manually\n")
-            f.write("   git push origin HEAD:main\n\n")
+            f.write(f"   git push origin HEAD:{original_branch}\n\n")
 
             f.write("OPTION 3 - REBASE YOUR CHANGES ON REMOTE:\n")
             f.write(f"   git checkout {recovery_branch}\n")
-            f.write("   git rebase origin/main\n")
+            f.write(f"   git rebase origin/{original_branch}\n")
             f.write("   # Resolve any rebase conflicts manually\n")
-            f.write("   git push origin HEAD:main\n\n")
+            f.write(f"   git push origin HEAD:{original_branch}\n\n")
 
             f.write("CURRENT STATUS:\n")
             f.write("---------------\n")
 
+            # Both directions from one rev-list; subjects come from the cat-file process
+            remote_ref = f"origin/{original_branch}"
+            local_commits, remote_commits = self.git.divergence(remote_ref, "HEAD")
+
             # Get detailed diff
             f.write("\nLOCAL CHANGES (Your work):\n")
             f.write("-" * 30 + "\n")
-            code, stdout, stderr = self.run_command("git log --oneline origin/main..HEAD -10", capture_output=True)
-            if code == 0 and stdout.strip():
-                f.write(stdout + "\n")
+            if local_commits:
+                f.write("\n".join(self.git.oneline(oid) for oid in local_commits[:10]) + "\n")
             else:
                 f.write("No specific local commits found.\n")
 
             f.write("\nREMOTE CHANGES (Repository):\n")
             f.write("-" * 30 + "\n")
-            code, stdout, stderr = self.run_command("git log --oneline HEAD..origin/main -10", capture_output=True)
-            if code == 0 and stdout.strip():
-                f.write(stdout + "\n")
+            if remote_commits:
+                f.write("\n".join(self.git.oneline(oid) for oid in remote_commits[:10]) + "\n")
             else:
                 f.write("No remote commits found.\n")
 
@@ -253,14 +288,18 @@ class GitPushMaster:
 
             # Get file differences
             f.write("\nModified Files:\n")
-            code, stdout, stderr = self.run_command("git diff --name-status origin/main", capture_output=True)
+            code, stdout, stderr = self.git.run("diff", "--name-status", remote_ref, capture_output=True)
             if code == 0 and stdout.strip():
                 f.write(stdout + "\n")
             else:
                 f.write("No file differences found.\n")
 
             f.write("\nUnpushed Commits:\n")
-            code, stdout, stderr = self.run_command("git log --oneline origin/main..HEAD --stat", capture_output=True)
+            if local_commits:
+                code, stdout, stderr = self.git.run("log", "--oneline", "--stat", f"{remote_ref}..HEAD",
+                                                    capture_output=True)
+            else:
+                code, stdout = 1, ""
             if code == 0 and stdout.strip():
                 f.write(stdout + "\n")
             else:
@@ -275,24 +314,28 @@ class GitPushMaster:
 
         return conflict_file
 
-    def try_alternative_branches(self, base_message=None):
-        """Try alternative branch names if main fails"""
-        print("\n🔄 Trying alternative branch names...")
-
-        branches_to_try = ['master', 'develop', 'staging']
-
-        for branch in branches_to_try:
-            print(f"🚀 Attempting to push to '{branch}' branch...")
-
-            success, result_type = self.intelligent_push(branch)
-            if success:
-                return True, branch
-
-            if result_type.startswith("major_conflict:"):
-                recovery = result_type.split(":")[1]
-                return False, f"conflict_{branch}:{recovery}"
-
-        return False, "all_branches_failed"
+    def resolve_target_branch(self, state):
+        """The branch to push, with the remote's branches listed once for the run.
+
+        That is the upstream, then the current branch, then (on a detached
+        HEAD) the remote's default branch, in the same order sync.py pulls
+        from. When it is not the current branch's own name, HEAD is pushed
+        to it as HEAD:refs/heads/<branch>.
+        """
+        self.remote = self.git.remote_branches("origin", timeout=self.retry.remaining())
+        branch = target_branch(state, self.remote, create=True)
+        self.push_head = state.head is not None and branch != state.branch
+        if state.branch is None and state.head is not None:
+            print(f"🔗 Detached HEAD at {state.head[:7]}: pushing it to '{branch}'")
+        elif self.push_head:
+            print(f"🔗 '{state.branch}' tracks '{state.upstream}': pushing it to '{branch}'")
+        if self.remote is None:
+            print(f"⚠️  Could not list the remote's branches; pushing '{branch}'")
+        elif branch in self.remote.heads:
+            print(f"🎯 Target branch: '{branch}' (exists on remote)")
+        else:
+            print(f"🎯 Target branch: '{branch}' (new on remote, default is {self.remote.default or 'unknown'})")
+        return branch
 
     def main_workflow(self, commit_message=None):
         """Main intelligent update workflow"""
@@ -301,62 +344,80 @@ class GitPushMaster:
         print(f"🔗 Directory: {self.current_dir}")
         print(f"⏰ Started at: {self.current_time}")
 
-        # Step 1: Check status
+        # Step 1: Check status and pick the branch once
         status = self.check_git_status()
+        branch = self.resolve_target_branch(status['state'])
 
         if not status['has_changes']:
             print("ℹ️  No changes to commit. Checking if push needed...")
             # Still try to push in case we had commits but repo is out of sync
-            success, result = self.intelligent_push(status['current_branch'])
+            success, result = self.intelligent_push(branch)
+            self.outcome = result
             if success:
                 print("✅ Repository already up to date!")
                 return True
-            else:
-                # Handle conflict resolution even with no new changes
-                pass  # Fall through to error handling
+            # Nothing to commit, so committing and pushing again cannot help
+            self.report_push_failure(branch, result)
+            return False
 
         # Step 2: Stage and commit
         if not self.stage_and_commit(commit_message):
             print("❌ Failed to stage/commit changes")
+            self.outcome = "commit_failed"
             return False
 
         # Step 3: Intelligent push
-        success, result = self.intelligent_push(status['current_branch'])
+        success, result = self.intelligent_push(branch)
+        self.outcome = result
 
         if success:
             print("\n🎉 SUCCESS! Portfolio updated and pushed to GitHub!")
             print(f"🌐 Changes are live at: https://github.com/djdark08/online-portfolio")
             return True
         else:
-            # Step 4: Try alternative approaches
-            if result.startswith("major_conflict:"):
-                recovery_branch = result.split(":")[1]
-                print(f"\n💥 MAJOR CONFLICT CREATED RECOVERY BRANCH: {recovery_branch}")
-                print("📖 Check the conflict resolution file for options!")
-            elif result == "max_attempts_exceeded":
-                print("\n🔄 Max push attempts exceeded. Trying alternative branches...")
-                alt_success, alt_result = self.try_alternative_branches(commit_message)
-
-                if alt_success:
-                    print(f"✅ Successfully pushed to alternative branch: {alt_result}")
-                    return True
-                elif alt_result.startswith("conflict_"):
-                    branch, recovery = alt_result.split(":")
-                    print(f"💥 Conflict on alternative branch. Recovery: {recovery}")
-                else:
-                    print("❌ All push attempts failed. Manual intervention required.")
-
+            self.report_push_failure(branch, result)
             return False
 
+    def report_push_failure(self, branch, result):
+        """Explain why intelligent_push gave up"""
+        if result.startswith("major_conflict:"):
+            recovery_branch = result.split(":")[1]
+            print(f"\n💥 MAJOR CONFLICT CREATED RECOVERY BRANCH: {recovery_branch}")
+            print("📖 Check the conflict resolution file for options!")
+        elif result == "max_attempts_exceeded":
+            print(f"\n❌ Push to '{branch}' failed after {self.retry.max_attempts} attempts.")
+            print("💡 Check your internet connection and try again.")
+        elif result == "auth_error":
+            print("\n🔐 Authentication issue. Please check your credentials.")
+        elif result == "deadline_exceeded":
+            print(f"\n⏰ Gave up after the {self.retry.deadline:g}s deadline.")
+        else:
+            print(f"\n❌ Push failed ({result}). Manual intervention required.")
+
 def main():
     """Main entry point"""
-    if len(sys.argv) > 1:
-        commit_message = " ".join(sys.argv[1:])
-    else:
-        commit_message = None
-
-    updater = GitPushMaster()
-    success = updater.main_workflow(commit_message)
+    # Every argument that is not an option is part of the commit message, even one that
+    # starts with '-' (`update.py -fix typo`); put the message after `--` if it contains
+    # one of the options below
+    parser = argparse.ArgumentParser(description='Commit local changes and push them to GitHub',
+                                     usage='%(prog)s [options] [--] [message ...]',
+                                     epilog='message: commit message words (default: timestamped)',
+                                     allow_abbrev=False)
+    parser.add_argument('--report', metavar='PATH', help='write the outcome and git timings as JSON')
+    add_retry_arguments(parser)
+    args, message = parser.parse_known_args()
+    if message[:1] == ['--']:
+        message = message[1:]
+    commit_message = " ".join(message) or None
+
+    updater = GitPushMaster(retry=RetryPolicy.from_args(args))
+    try:
+        success = updater.main_workflow(commit_message)
+    finally:
+        updater.git.close()
+    print(updater.git.summary())
+    if args.report:
+        write_report(args.report, success, updater.outcome, updater.git, updater.retry)
 
     sys.exit(0 if success else 1)
 